@@ -0,0 +1,128 @@
+from collections import Counter
+
+###
+# Static key-gating analysis of a scenario's region graph.
+#
+# For every region and location, works out the minimal sets of items that gate access to it (any one set is enough),
+#   following the same graph the world builds: directed connections, with one-sided doors skipped.
+# From those, works out a dominance order of key items: item A dominates item B if every way to need B also needs A,
+#   so A always has to be found first.
+#
+# Item sets are stored as frozensets of (item name, copy number) tokens, so "2x Old Key" is {('Old Key', 1), ('Old Key', 2)}
+#   and needing more copies of an item is just a bigger set.
+###
+
+max_sets_per_spot = 128 # keeps pathological data from blowing up. the real data never gets close to this.
+
+def condition_to_sets(item_names) -> list:
+    if len(item_names) == 0:
+        return [frozenset()]
+
+    # same shape rules as everywhere else: a list of names, or a list of lists of names for alternatives
+    if type(item_names[0]) is not list:
+        item_names = [item_names]
+
+    return minimize([
+        frozenset((item_name, copy) for item_name, count in Counter(alternative).items() for copy in range(1, count + 1))
+            for alternative in item_names
+    ])
+
+def minimize(item_sets) -> list:
+    # drops any set that has a smaller set inside it, since the smaller set is always enough
+    minimal = []
+
+    # ties are broken by the sorted tokens, so the result (and the compiled artifact) doesn't depend on set order
+    for item_set in sorted(set(item_sets), key=lambda item_set: (len(item_set), sorted(item_set))):
+        if not any(smaller <= item_set for smaller in minimal):
+            minimal.append(item_set)
+
+    return minimal[:max_sets_per_spot]
+
+def combine(first_sets, second_sets) -> list:
+    return minimize([first | second for first in first_sets for second in second_sets])
+
+def get_condition_items(record) -> list:
+    return record.get('condition', {}).get('items', []) if record.get('condition') else []
+
+def stack_location_name(loc) -> str:
+    # matches the location names the world creates, where Victory is just "Victory"
+    return loc['name'] if loc['name'] == 'Victory' else ' - '.join([loc['region'], loc['name']])
+
+def analyze_scenario(catalog) -> dict:
+    region_sets = { 'Menu': [frozenset()] }
+    outgoing = {}
+
+    for connect in catalog['connections']:
+        if connect.get('limitation') in ['ONE_SIDED_DOOR']:
+            continue
+
+        from_name = connect['from'] if 'Menu' not in connect['from'] else 'Menu'
+        to_name = connect['to'] if 'Menu' not in connect['to'] else 'Menu'
+        outgoing.setdefault(from_name, []).append((to_name, condition_to_sets(get_condition_items(connect))))
+
+    # worklist fixpoint. a region's sets only ever get smaller or more numerous, so this settles quickly.
+    pending = ['Menu']
+
+    while len(pending) > 0:
+        from_name = pending.pop()
+
+        for to_name, connection_sets in outgoing.get(from_name, []):
+            through_here = combine(region_sets[from_name], connection_sets)
+            current = region_sets.get(to_name, [])
+            updated = minimize(current + through_here)
+
+            if set(updated) != set(current):
+                region_sets[to_name] = updated
+                pending.append(to_name)
+
+    location_sets = {}
+
+    for loc in catalog['locations'].values():
+        if loc['region'] not in region_sets:
+            continue # unreachable, or in a region the world doesn't create
+
+        location_sets[stack_location_name(loc)] = combine(region_sets[loc['region']], condition_to_sets(get_condition_items(loc)))
+
+    dominance = get_dominance(location_sets)
+
+    return {
+        'regions': { name: serialize_sets(item_sets) for name, item_sets in region_sets.items() },
+        'locations': { name: serialize_sets(item_sets) for name, item_sets in location_sets.items() },
+        'unreachable_regions': sorted(set(catalog['regions']) - set(region_sets)),
+        'dominance': dominance,
+        'key_item_order': sorted(dominance, key=lambda item_name: (len(dominance[item_name]), item_name))
+    }
+
+def get_dominance(location_sets) -> dict:
+    # for each item, the items that show up in every minimal set that needs it
+    always_with = {}
+
+    for item_sets in location_sets.values():
+        for item_set in item_sets:
+            names = set(item_name for item_name, _ in item_set)
+
+            for item_name in names:
+                if item_name in always_with:
+                    always_with[item_name] &= names
+                else:
+                    always_with[item_name] = set(names)
+
+    return { item_name: sorted(always_with[item_name] - {item_name}) for item_name in sorted(always_with) }
+
+def serialize_sets(item_sets) -> list:
+    # plain sorted lists of item names (with repeats for counts), which marshal and print nicely
+    return [
+        sorted(item_name for item_name, _ in item_set) for item_set in sorted(item_sets, key=lambda s: (len(s), sorted(s)))
+    ]
+
+def get_required_items(analysis, location_name) -> list:
+    if location_name not in analysis['locations']:
+        raise KeyError(f"'{location_name}' is not a reachable location in this scenario.")
+
+    return analysis['locations'][location_name]
+
+def get_always_required_items(analysis, location_name) -> set:
+    # the items that are in every minimal set, so there's no way to reach the location without them
+    item_sets = [set(item_set) for item_set in get_required_items(analysis, location_name)]
+
+    return set.intersection(*item_sets) if len(item_sets) > 0 else set()
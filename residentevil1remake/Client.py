@@ -0,0 +1,358 @@
+import asyncio
+import json
+import time
+
+from abc import ABC, abstractmethod
+
+from CommonClient import CommonContext, ClientCommandProcessor, server_loop, gui_enabled, get_base_parser, logger
+from NetUtils import ClientStatus
+
+from . import ResidentEvil1Remake
+from .Data import Data
+
+###
+# The RE1R client. It sits between a game-state source (see RE1RGameSource) and the Archipelago server:
+#   - locations the source reports as checked are batched and de-duplicated, then sent in as few LocationChecks as possible
+#   - received items are translated to the game's itemval / decimal codes through a table built from items.json, then given to the source
+#   - DeathLink goes both ways, if it's on in the slot data
+#
+# There's no memory reader for the game yet, so the only source that ships is ReplayGameSource, which plays back a recorded
+#   (or made up) replay file. Together with tools/StandInServer.py, that's enough to run the whole client on any machine.
+#   Until there's a source that talks to the game, the client isn't registered with the Launcher, and --replay is required.
+#
+#   python -m worlds.residentevil1remake.Client --connect localhost:38281 --replay my_run.jsonl
+###
+
+game_name = "Resident Evil 1 Remake"
+
+poll_interval = 0.1 # seconds between reads of the game state
+batch_window = 0.25 # seconds to hold new checks for, so the ones that come in together go out in one packet
+max_batch_size = 100 # checks to send right away, without waiting out the window
+
+
+###
+# Translation tables
+###
+
+def build_item_translation(character) -> dict:
+    # the world's item id: (itemval, decimal), for this character's items. the server sends the ids the world gave out,
+    #   and the world has one id per item name (the same name in both characters' items.json gets one of them), so this
+    #   goes by name to the world's id instead of by the character's own ids.
+    Data.ensure_loaded(character)
+
+    translation = {}
+
+    for item in Data.item_table:
+        if item['character'] != character or item['name'] not in ResidentEvil1Remake.item_name_to_id:
+            continue
+
+        itemval = item['itemval'] if item.get('itemval') is not None else -1
+        decimal = int(item['decimal'], 16) if item.get('decimal') else -1 # the game's item code, stored as hex in items.json
+
+        translation[ResidentEvil1Remake.item_name_to_id[item['name']]] = (itemval, decimal)
+
+    return translation
+
+def build_location_translation(character, difficulty) -> dict:
+    # sources can report a location by its locval (what's in the game's memory) or by its full name (handy for replays)
+    records = Data.get_scenario_records(character, 'a', difficulty)
+    catalog = Data.get_scenario_catalog(character, 'a', difficulty)
+
+    return {
+        'by_locval': { loc['locval']: id for id, loc in catalog['locations'].items() if loc.get('locval') is not None },
+        'by_name': { location.full_name: location.id for location in records.locations }
+    }
+
+
+###
+# Game-state sources
+###
+
+class RE1RGameState:
+    __slots__ = ('checked', 'deaths', 'victory')
+
+    def __init__(self, checked = (), deaths = 0, victory = False):
+        self.checked = checked # locvals or full location names, everything checked so far
+        self.deaths = deaths # how many times the player has died so far
+        self.victory = victory
+
+
+class RE1RGameSource(ABC):
+    # what the client needs from the game. a memory reader for the real game would subclass this, and set name.
+    name: str
+
+    @abstractmethod
+    async def connect(self) -> bool:
+        # whether the game is there to read. the client keeps retrying until it is.
+        ...
+
+    @abstractmethod
+    async def read_state(self) -> RE1RGameState:
+        ...
+
+    @abstractmethod
+    async def give_items(self, items: list):
+        # items is a list of (index in items received, item id, itemval, decimal), in order
+        ...
+
+    @abstractmethod
+    async def kill_player(self):
+        ...
+
+
+class ReplayGameSource(RE1RGameSource):
+    # plays back a replay file: one JSON object per line, like
+    #   {"time": 1.5, "checked": [0, "Main Hall (J) - MH - Barry"], "death": false, "victory": false}
+    # where time is seconds since the replay started, and every field but time is optional.
+    name = "replay"
+
+    def __init__(self, file_path, speed = 1.0):
+        self.file_path = file_path
+        self.speed = speed
+        self.events = []
+        self.start_time = None
+        self.next_event = 0
+        self.checked = []
+        self.deaths = 0
+        self.victory = False
+        self.seen_at = {} # location key: time it first showed up, for measuring latency
+        self.received_items = []
+        self.kills = 0
+
+    async def connect(self) -> bool:
+        with open(self.file_path) as f:
+            self.events = sorted((json.loads(line) for line in f if line.strip()), key=lambda event: event['time'])
+
+        self.start_time = time.perf_counter()
+
+        return True
+
+    async def read_state(self) -> RE1RGameState:
+        now = time.perf_counter()
+        elapsed = (now - self.start_time) * self.speed
+
+        while self.next_event < len(self.events) and self.events[self.next_event]['time'] <= elapsed:
+            event = self.events[self.next_event]
+            self.next_event += 1
+
+            for location_key in event.get('checked', []):
+                if location_key not in self.seen_at:
+                    self.seen_at[location_key] = now
+                    self.checked.append(location_key)
+
+            self.deaths += 1 if event.get('death') else 0
+            self.victory = self.victory or event.get('victory', False)
+
+        return RE1RGameState(tuple(self.checked), self.deaths, self.victory)
+
+    async def give_items(self, items: list):
+        self.received_items.extend(items)
+
+    async def kill_player(self):
+        self.kills += 1
+
+    def is_finished(self) -> bool:
+        return self.next_event >= len(self.events)
+
+
+###
+# Client
+###
+
+class RE1RCommandProcessor(ClientCommandProcessor):
+    def _cmd_source(self):
+        """Show which game-state source is in use, and how it's doing."""
+        source = self.ctx.source
+        logger.info(f"Source: {source.name}, {len(self.ctx.locations_checked)} locations checked, {self.ctx.items_given} items given.")
+
+
+class RE1RContext(CommonContext):
+    command_processor = RE1RCommandProcessor
+    game = game_name
+    items_handling = 0b111 # everything comes from the server, including our own items and starting inventory
+
+    def __init__(self, server_address, password, source: RE1RGameSource):
+        super().__init__(server_address, password)
+        self.source = source
+        self.source_connected = False
+        self.item_translation = None
+        self.location_translation = None
+        self.items_given = 0 # how many of items_received the source has been given, for given_slot
+        self.given_slot = None # (seed name, slot) items_given counts for
+        self.pending_checks = set()
+        self.pending_since = None
+        self.location_packets_sent = 0
+        self.deaths_seen = 0
+        self.deaths_to_ignore = 0 # deaths we caused from someone else's DeathLink, which shouldn't be sent back out
+        self.deaths_received = 0
+        self.goal_sent = False
+
+    async def server_auth(self, password_requested: bool = False):
+        if password_requested and not self.password:
+            await super().server_auth(password_requested)
+
+        await self.get_username()
+        await self.send_connect()
+
+    def on_package(self, cmd: str, args: dict):
+        if cmd == "Connected":
+            slot_data = args.get("slot_data", {})
+            character = slot_data.get("character", "jill")
+            difficulty = slot_data.get("difficulty", "normal")
+
+            self.item_translation = build_item_translation(character)
+            self.location_translation = build_location_translation(character, difficulty)
+
+            # the game keeps what it was given across a reconnect, and the server sends items_received again from index 0,
+            #   so only a different slot (or seed) starts giving items over from the first one
+            if self.given_slot != (self.seed_name, self.slot):
+                self.given_slot = (self.seed_name, self.slot)
+                self.items_given = 0
+
+            if slot_data.get("death_link"):
+                asyncio.create_task(self.update_death_link(True))
+
+    def on_deathlink(self, data: dict):
+        super().on_deathlink(data)
+        self.deaths_received += 1
+
+    def translate_location(self, location_key):
+        if isinstance(location_key, int):
+            return self.location_translation['by_locval'].get(location_key)
+
+        return self.location_translation['by_name'].get(location_key)
+
+    def translate_item(self, item_id) -> tuple:
+        return self.item_translation.get(item_id, (-1, -1))
+
+    def queue_checks(self, location_keys):
+        already_sent = self.locations_checked
+        new_checks = set()
+
+        for location_key in location_keys:
+            location_id = self.translate_location(location_key)
+
+            if location_id is not None and location_id not in already_sent and location_id not in self.pending_checks:
+                new_checks.add(location_id)
+
+        if new_checks:
+            self.pending_checks |= new_checks
+            self.pending_since = self.pending_since or time.perf_counter()
+
+    async def flush_checks(self, force = False):
+        if not self.pending_checks:
+            return
+
+        if not force and len(self.pending_checks) < max_batch_size and time.perf_counter() - self.pending_since < batch_window:
+            return
+
+        # send_msgs drops messages while there's no connection, so checks stay queued until there is one. checks only count
+        #   as sent (locations_checked) once they've gone out, and anything that didn't go out is sent with the next batch.
+        if not self.server or not self.server.socket or self.server.socket.closed:
+            return
+
+        locations = sorted(self.pending_checks)
+
+        try:
+            await self.send_msgs([{ "cmd": "LocationChecks", "locations": locations }])
+        except Exception as e:
+            logger.warning(f"Couldn't send {len(locations)} checks, they'll be sent again: {e}")
+            return
+
+        self.locations_checked |= set(locations)
+        self.pending_checks -= set(locations) # more might have come in while this was sending
+        self.pending_since = time.perf_counter() if self.pending_checks else None
+        self.location_packets_sent += 1
+
+    async def give_new_items(self):
+        if self.items_given >= len(self.items_received):
+            return
+
+        new_items = [
+            (index, network_item.item, *self.translate_item(network_item.item))
+                for index, network_item in enumerate(self.items_received[self.items_given:], self.items_given)
+        ]
+
+        await self.source.give_items(new_items)
+        self.items_given += len(new_items)
+
+    async def handle_deaths(self, state: RE1RGameState):
+        # deaths from the game go out, unless we caused them
+        while self.deaths_seen < state.deaths:
+            self.deaths_seen += 1
+
+            if self.deaths_to_ignore > 0:
+                self.deaths_to_ignore -= 1
+            elif "DeathLink" in self.tags:
+                await self.send_death(f"{self.player_names.get(self.slot, 'Someone')} became a Jill sandwich.")
+
+        # deaths from everyone else come in
+        while self.deaths_received > 0:
+            self.deaths_received -= 1
+            self.deaths_to_ignore += 1
+            await self.source.kill_player()
+
+    async def disconnect(self, allow_autoreconnect: bool = False):
+        await self.flush_checks(force=True)
+        await super().disconnect(allow_autoreconnect)
+
+
+async def game_watcher(ctx: RE1RContext):
+    while not ctx.exit_event.is_set():
+        if not ctx.source_connected:
+            ctx.source_connected = await ctx.source.connect()
+
+            if not ctx.source_connected:
+                await asyncio.sleep(1)
+                continue
+
+        # nothing to translate against until the server says who we are
+        if ctx.server and ctx.slot and ctx.location_translation:
+            state = await ctx.source.read_state()
+
+            ctx.queue_checks(state.checked)
+            await ctx.flush_checks()
+            await ctx.give_new_items()
+            await ctx.handle_deaths(state)
+
+            if state.victory and not ctx.goal_sent:
+                await ctx.flush_checks(force=True)
+                await ctx.send_msgs([{ "cmd": "StatusUpdate", "status": ClientStatus.CLIENT_GOAL }])
+                ctx.goal_sent = True
+
+        await asyncio.sleep(poll_interval)
+
+def get_source(args) -> RE1RGameSource:
+    # the only source so far, see the top of this file
+    return ReplayGameSource(args.replay, args.replay_speed)
+
+def launch(*launch_args):
+    async def main(args):
+        ctx = RE1RContext(args.connect, args.password, get_source(args))
+        ctx.server_task = asyncio.create_task(server_loop(ctx), name="ServerLoop")
+
+        if gui_enabled:
+            ctx.run_gui()
+
+        ctx.run_cli()
+        watcher_task = asyncio.create_task(game_watcher(ctx), name="RE1RGameWatcher")
+
+        await ctx.exit_event.wait()
+        ctx.server_address = None
+        await watcher_task
+        await ctx.shutdown()
+
+    parser = get_base_parser(description="Resident Evil 1 Remake Archipelago client.")
+    parser.add_argument("--replay", required=True, help="play back this replay file (there's no reader for the game itself yet)")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="how fast to play the replay back, 2.0 is twice as fast")
+    args = parser.parse_args(launch_args)
+
+    import colorama
+    colorama.init()
+    asyncio.run(main(args))
+    colorama.deinit()
+
+
+if __name__ == "__main__":
+    import sys
+    launch(*sys.argv[1:])
@@ -0,0 +1,547 @@
+import hashlib
+import json
+import logging
+import marshal
+import os
+import pkgutil
+
+from .Analysis import analyze_scenario
+from .Exceptions import RE1RDataError
+
+###
+# Compiles the raw data/<character>/*.json files into a single pre-built artifact (data/compiled.bin) that ships with the world.
+# Data loads the artifact directly, and only falls back to compiling the JSON at runtime if the artifact is missing or out of date.
+#
+# After editing anything in data/, rebuild the artifact from the Archipelago folder with:
+#   python -m worlds.residentevil1remake.Compiler
+###
+
+compiled_format_version = 3 # bump this whenever the shape of the compiled tables changes
+compiled_file_name = 'compiled.bin'
+
+characters = ['chris', 'jill']
+scenarios = ['a']
+
+# every difficulty, as an overlay on the standard (normal) data. an overlay's locations file lists the locations that are
+#   different on that difficulty: each one replaces the standard location with the same region and name (or just takes it
+#   out, if it's marked 'remove'). the regions those locations are in get a copy with the overlay's suffix, connected the
+#   same way as the standard ones. 'same_as' plays a difficulty on another difficulty's data, per Options.Difficulty.
+difficulty_overlays = {
+    'normal': {},
+    'hard': { 'locations_file': 'locations_hardcore.json', 'region_suffix': 'H', 'location_offset': 400 },
+    'easy': { 'locations_file': 'locations_easy.json', 'region_suffix': 'E', 'location_offset': 600 },
+    'real_survival': { 'same_as': 'hard' }
+}
+difficulties = [difficulty for difficulty, overlay in difficulty_overlays.items() if 'same_as' not in overlay]
+
+optional_data_files = [overlay['locations_file'] for overlay in difficulty_overlays.values() if overlay.get('locations_file')]
+data_files = ['items.json', 'locations.json', 'regions.json', 'region_connections.json', 'zones.json'] + optional_data_files
+
+
+# blatantly copied from the minecraft ap world because why not
+def load_data_file(*args) -> dict:
+    fname = os.path.join("data", *args)
+    raw = load_raw_data_file(*args)
+
+    if raw is None:
+        if args[-1] in optional_data_files:
+            return []
+
+        raise RE1RDataError(f"Missing data file '{fname}'.")
+
+    try:
+        filedata = json.loads(raw.decode())
+    except ValueError as e:
+        raise RE1RDataError(f"Could not parse '{fname}': {e}")
+
+    return filedata
+
+def load_raw_data_file(*args) -> bytes:
+    try:
+        return pkgutil.get_data(__name__, os.path.join("data", *args))
+    except OSError: # includes FileNotFoundError, and missing members of a zipped .apworld
+        return None
+
+def source_hash() -> str:
+    sha = hashlib.sha256(str(compiled_format_version).encode())
+
+    for character in characters:
+        for file_name in data_files:
+            raw = load_raw_data_file(character, file_name)
+
+            sha.update(f"{character}/{file_name}:".encode())
+            sha.update(raw if raw is not None else b"<missing>")
+
+    return sha.hexdigest()
+
+
+###
+# Schema
+###
+
+# every record type's fields, as field name: (required, allowed types)
+record_schemas = {
+    'items.json': {
+        'name': (True, (str,)),
+        'type': (False, (str,)),
+        'decimal': (False, (str, type(None))),
+        'itemval': (False, (int, type(None))),
+        'count': (False, (int, type(None))),
+        'progression': (False, (int, bool)),
+        'groups': (False, (list,)),
+        'ammo': (False, (str, type(None))),
+        'id': (False, (int, type(None)))
+    },
+    'locations.json': {
+        'name': (True, (str,)),
+        'region': (True, (str,)),
+        'original_item': (False, (str, type(None))),
+        'condition': (False, (dict,)),
+        'locval': (False, (int,)),
+        'item_object': (False, (str,)),
+        'parent_object': (False, (str,)),
+        'folder_path': (False, (str,)),
+        'forbid_item': (False, (list, dict, type(None))),
+        'randomized': (False, (int, bool)),
+        'force_item': (False, (str, type(None))),
+        'victory': (False, (bool,)),
+        'remove': (False, (bool, int)),
+        'id': (False, (int, type(None)))
+    },
+    'regions.json': {
+        'name': (True, (str,)),
+        'zone_id': (True, (int,))
+    },
+    'region_connections.json': {
+        'from': (True, (str,)),
+        'to': (True, (str,)),
+        'condition': (False, (dict,)),
+        'limitation': (False, (str,)),
+        'doorval': (False, (int, type(None)))
+    },
+    'zones.json': {
+        'id': (True, (int,)),
+        'name': (True, (str,))
+    }
+}
+
+for file_name in optional_data_files:
+    record_schemas[file_name] = record_schemas['locations.json']
+
+# indexes limits the check to those records, for re-checking only what changed (see tools/DevMode.py)
+def validate_file(character, file_name, records, indexes = None) -> list:
+    errors = []
+    schema = record_schemas[file_name]
+    where = f"data/{character}/{file_name}"
+
+    if not isinstance(records, list):
+        return [f"{where}: expected a list of records."]
+
+    for index in range(len(records)) if indexes is None else indexes:
+        record = records[index]
+
+        if not isinstance(record, dict):
+            errors.append(f"{where} #{index}: expected an object.")
+            continue
+
+        label = f"{where} #{index} ({record.get('name', record.get('from', '?'))})"
+
+        for field, (required, types) in schema.items():
+            if field not in record:
+                if required:
+                    errors.append(f"{label}: missing required field '{field}'.")
+
+                continue
+
+            if not isinstance(record[field], types):
+                errors.append(f"{label}: field '{field}' should be {' or '.join(t.__name__ for t in types)}, not {type(record[field]).__name__}.")
+
+        for field in record.keys() - schema.keys():
+            errors.append(f"{label}: unknown field '{field}'.")
+
+        if isinstance(record.get('condition'), dict):
+            errors.extend(validate_condition(label, record['condition']))
+
+    return errors
+
+def validate_condition(label, condition) -> list:
+    errors = []
+
+    for field in condition.keys() - {'items', 'locations'}:
+        errors.append(f"{label}: unknown condition field '{field}'.")
+
+    items = condition.get('items', [])
+
+    # items is either a list of names (all required) or a list of lists of names (any one list required)
+    if not isinstance(items, list):
+        errors.append(f"{label}: condition items should be a list.")
+    elif len(items) > 0 and isinstance(items[0], list):
+        if not all(isinstance(option, list) and all(isinstance(name, str) for name in option) for option in items):
+            errors.append(f"{label}: condition items mixes names and lists of names.")
+    elif not all(isinstance(name, str) for name in items):
+        errors.append(f"{label}: condition items should all be item names.")
+
+    if not isinstance(condition.get('locations', []), list):
+        errors.append(f"{label}: condition locations should be a list.")
+
+    return errors
+
+# references that don't resolve within a character's own files. the current data has a handful of these on purpose
+#   (they resolve against the other character's items), so they're reported as warnings instead of errors.
+def check_references(character, raw) -> list:
+    warnings = []
+    item_names = set(item['name'] for item in raw['items.json'])
+    region_names = set(region['name'] for region in raw['regions.json'])
+    zone_ids = set(zone['id'] for zone in raw['zones.json'])
+
+    for file_name in ['locations.json'] + optional_data_files:
+        for loc in raw[file_name]:
+            if loc['region'] not in region_names:
+                warnings.append(f"data/{character}/{file_name}: '{loc['name']}' is in unknown region '{loc['region']}'.")
+
+            for field in ['original_item', 'force_item']:
+                if loc.get(field) and loc[field] not in item_names:
+                    warnings.append(f"data/{character}/{file_name}: '{loc['name']}' {field} '{loc[field]}' is not in items.json.")
+
+    for conn in raw['region_connections.json']:
+        for field in ['from', 'to']:
+            if conn[field] not in region_names:
+                warnings.append(f"data/{character}/region_connections.json: '{conn['from']} to {conn['to']}' has unknown region '{conn[field]}'.")
+
+    for region in raw['regions.json']:
+        if region['zone_id'] not in zone_ids:
+            warnings.append(f"data/{character}/regions.json: '{region['name']}' has unknown zone id {region['zone_id']}.")
+
+    for record in raw['locations.json'] + raw['region_connections.json']:
+        for name in flatten_condition_items(record.get('condition', {}).get('items', [])):
+            if name not in item_names:
+                warnings.append(f"data/{character}: condition item '{name}' is not in items.json.")
+
+    return sorted(set(warnings))
+
+def flatten_condition_items(items) -> list:
+    if len(items) > 0 and isinstance(items[0], list):
+        return [name for option in items for name in option]
+
+    return list(items)
+
+
+###
+# Compile
+###
+
+def load_character_files(character) -> dict:
+    raw = { file_name: load_data_file(character, file_name) for file_name in data_files }
+    errors = []
+
+    for file_name, records in raw.items():
+        errors.extend(validate_file(character, file_name, records))
+
+    if len(errors) > 0:
+        raise RE1RDataError("\n  " + "\n  ".join(errors))
+
+    return raw
+
+def compile_character(character, raw = None) -> dict:
+    if raw is None:
+        raw = load_character_files(character)
+
+    character_offsets = { 'chris': 0, 'jill': 1000 }
+    scenario = "a"
+    scenario_offsets = { 'a': 0 }
+    scenario_suffix = ' ({})'.format(character[0].upper())
+
+    location_start = item_start = 3000000000 + character_offsets[character] + scenario_offsets[scenario]
+
+    ###
+    # Add standard regions
+    ###
+
+    new_region_table = raw['regions.json']
+    region_table = [
+        {
+            **reg,
+            'name': reg['name'] + scenario_suffix if reg['name'] != 'Menu' else reg['name'], # add the scenario abbreviation so they're unique
+            'character': character,
+            'scenario': scenario,
+            'difficulty': None
+        }
+        for reg in new_region_table
+    ]
+
+    ###
+    # Add standard region connections
+    ###
+
+    added_connections = set()
+    region_connections_table = []
+    new_region_connections_table = raw['region_connections.json']
+
+    for conn in new_region_connections_table:
+        connection_path = (conn['from'] + scenario_suffix, conn['to'] + scenario_suffix)
+
+        if connection_path in added_connections:
+            continue
+
+        added_connections.add(connection_path)
+
+        region_connections_table.append(
+            {
+                **conn,
+                'from': conn['from'] + scenario_suffix if conn['from'] != 'Menu' else conn['from'], # add the scenario abbreviation so they're unique
+                'to': conn['to'] + scenario_suffix if conn['to'] != 'Menu' else conn['to'], # add the scenario abbreviation so they're unique
+                'character': character,
+                'scenario': scenario,
+                'difficulty': None
+            }
+        )
+
+    ###
+    # Add item table for all difficulties
+    ###
+
+    new_item_table = raw['items.json']
+    item_table = [
+        {
+            **item,
+            'id': item['id'] if item.get('id') else item_start + key,
+            'character': character
+        }
+        for key, item in enumerate(new_item_table)
+    ]
+
+    # For the items that have groups, add them to the item group names
+    item_name_groups = {}
+
+    for item in new_item_table:
+        for group_name in item.get('groups', []):
+            item_name_groups.setdefault(group_name, []).append(item['name'])
+
+    ###
+    # Add standard location table
+    ###
+
+    location_table = [
+        {
+            **loc,
+            'id': loc['id'] if loc.get('id') else location_start + key,
+            'region': loc['region'] + scenario_suffix, # add the scenario abbreviation so they're unique
+            'character': character,
+            'scenario': scenario,
+            'difficulty': None
+        }
+        for key, loc in enumerate(raw['locations.json'])
+    ]
+
+    standard_location_ids = { (loc['region'], loc['name']): loc['id'] for loc in location_table }
+    zone_ids = { reg['name']: reg['zone_id'] for reg in new_region_table }
+
+    ###
+    # Add difficulty overlays
+    ###
+
+    for difficulty, overlay in difficulty_overlays.items():
+        if not overlay.get('locations_file'):
+            continue
+
+        overlay_location_table = raw[overlay['locations_file']]
+        overlay_suffix = ' ({}{})'.format(character[0].upper(), overlay['region_suffix']) # makes this difficulty's region variations unique
+        overlay_regions = []
+
+        for loc in overlay_location_table: # keeps the order the regions first show up in, so the compiled output is stable
+            if loc['region'] not in overlay_regions:
+                overlay_regions.append(loc['region'])
+
+        # instead of using region definitions, we're using the overlay region additions from the locations themselves
+        region_table.extend([
+            {
+                'name': reg + overlay_suffix,
+                'character': character,
+                'scenario': scenario,
+                'zone_id': zone_ids[reg],
+                'difficulty': difficulty
+            }
+            for reg in overlay_regions
+        ])
+
+        # overlay regions get every connection their standard region has, to the overlay version of any neighbor that has one
+        for conn in new_region_connections_table:
+            if conn['from'] in overlay_regions or conn['to'] in overlay_regions:
+                connection_from_name = conn['from'] + (overlay_suffix if conn['from'] in overlay_regions else scenario_suffix)
+                connection_to_name = conn['to'] + (overlay_suffix if conn['to'] in overlay_regions else scenario_suffix)
+                connection_path = (connection_from_name, connection_to_name)
+
+                if connection_path in added_connections:
+                    continue
+
+                added_connections.add(connection_path)
+
+                region_connections_table.append({
+                    **conn,
+                    'from': connection_from_name,
+                    'to': connection_to_name,
+                    'character': character,
+                    'scenario': scenario,
+                    'difficulty': difficulty
+                })
+
+        # 'replaces' is the standard location this one stands in for on this difficulty, worked out here once so
+        #   building a scenario never has to match them up
+        location_table.extend([
+            {
+                **loc,
+                'id': loc['id'] if loc.get('id') else location_start + key + overlay['location_offset'],
+                'region': loc['region'] + overlay_suffix,
+                'character': character,
+                'scenario': scenario,
+                'difficulty': difficulty,
+                'replaces': standard_location_ids.get((loc['region'] + scenario_suffix, loc['name']))
+            }
+            for key, loc in enumerate(overlay_location_table)
+        ])
+
+    return {
+        'item_table': item_table,
+        'location_table': location_table,
+        'region_table': region_table,
+        'region_connections_table': region_connections_table,
+        'item_name_groups': item_name_groups,
+        'zones': raw['zones.json']
+    }
+
+def resolve_difficulty(difficulty) -> str:
+    # accepts the option's text too, e.g. "Real Survival"
+    difficulty = difficulty.lower().replace(' ', '_')
+
+    if difficulty not in difficulty_overlays:
+        raise RE1RDataError(f"Unknown difficulty '{difficulty}'.")
+
+    return difficulty_overlays[difficulty].get('same_as', difficulty)
+
+# filters the (possibly multi-character) tables down to one playable scenario, indexed for world construction
+def build_scenario_catalog(tables, character, scenario, difficulty) -> dict:
+    difficulty = resolve_difficulty(difficulty)
+
+    # standard records are in every difficulty, overlay records only in their own
+    def in_scenario(record) -> bool:
+        return record['character'] == character and record['scenario'] == scenario and record.get('difficulty') in [None, difficulty]
+
+    locations_pool = { loc['id']: loc for loc in tables['location_table'] if in_scenario(loc) }
+
+    # take out the standard locations this difficulty replaces, then any overlay locations that were only there to remove one
+    replaced_ids = set(loc['replaces'] for loc in locations_pool.values() if loc.get('replaces') is not None)
+    locations_pool = { id: loc for id, loc in locations_pool.items() if id not in replaced_ids and 'remove' not in loc }
+
+    regions = { region['name']: region for region in tables['region_table'] if in_scenario(region) }
+
+    # one pass over the locations and connections, so world construction never has to search for them
+    region_locations = { region_name: [] for region_name in regions }
+
+    for id, loc in locations_pool.items():
+        if loc['region'] in region_locations:
+            region_locations[loc['region']].append(loc)
+
+    connections = [conn for conn in tables['region_connections_table'] if in_scenario(conn)]
+
+    return {
+        'locations': locations_pool, # id: loc
+        'regions': regions, # name: region
+        'region_locations': region_locations, # region name: [loc, ...]
+        'connections': connections # every connection, in data order
+    }
+
+def build_name_table(compiled_characters) -> dict:
+    items = []
+    locations = []
+    item_name_groups = {}
+
+    for character in characters:
+        tables = compiled_characters[character]
+
+        items.extend([
+            [item['id'], item['name'], item.get('type'), item.get('progression')] for item in tables['item_table']
+        ])
+        locations.extend([
+            [loc['id'], ' - '.join([loc['region'], loc['name']])] for loc in tables['location_table']
+        ])
+
+        for group_name, item_names in tables['item_name_groups'].items():
+            item_name_groups.setdefault(group_name, set()).update(item_names)
+
+    return {
+        'items': items,
+        'locations': locations,
+        'item_name_groups': { group_name: sorted(item_names) for group_name, item_names in item_name_groups.items() }
+    }
+
+def compile_all() -> dict:
+    compiled_characters = {}
+    warnings = []
+
+    for character in characters:
+        raw = load_character_files(character)
+        warnings.extend(check_references(character, raw))
+        compiled_characters[character] = compile_character(character, raw)
+
+    # the key-gating analysis for every playable scenario, see Analysis
+    analysis = {}
+
+    for character, tables in compiled_characters.items():
+        for scenario in scenarios:
+            for difficulty in difficulties:
+                catalog = build_scenario_catalog(tables, character, scenario, difficulty)
+                analysis[(character, scenario, difficulty)] = marshal.dumps(analyze_scenario(catalog), 4)
+
+    return {
+        'format': compiled_format_version,
+        'source_hash': source_hash(),
+        'names': build_name_table(compiled_characters),
+        # each character is marshalled separately so loading one character doesn't decode the other
+        'characters': { character: marshal.dumps(tables, 4) for character, tables in compiled_characters.items() },
+        'analysis': analysis,
+        'warnings': warnings
+    }
+
+
+###
+# Artifact
+###
+
+def load_artifact() -> dict:
+    raw = load_raw_data_file(compiled_file_name)
+
+    if raw is None:
+        logging.warning(f"RE1R: data/{compiled_file_name} is missing, loading data from the JSON files instead.")
+        return None
+
+    try:
+        artifact = marshal.loads(raw)
+    except (EOFError, ValueError, TypeError):
+        logging.warning(f"RE1R: data/{compiled_file_name} could not be read, loading data from the JSON files instead.")
+        return None
+
+    if not isinstance(artifact, dict) or artifact.get('format') != compiled_format_version or artifact.get('source_hash') != source_hash():
+        logging.warning(f"RE1R: data/{compiled_file_name} is out of date with the JSON files, loading data from the JSON files instead.")
+        return None
+
+    return artifact
+
+def write_artifact(output_path = None) -> dict:
+    artifact = compile_all()
+
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(__file__), "data", compiled_file_name)
+
+    with open(output_path, "wb") as f:
+        f.write(marshal.dumps(artifact, 4))
+
+    return artifact
+
+
+if __name__ == "__main__":
+    artifact = write_artifact()
+
+    for warning in artifact['warnings']:
+        print(f"warning: {warning}")
+
+    print(f"Wrote data/{compiled_file_name} ({artifact['source_hash'][:12]}).")
@@ -1,183 +1,183 @@
-import json
-import os
-import pkgutil
-
-# blatantly copied from the minecraft ap world because why not
-def load_data_file(*args) -> dict:
-    data_directory = "data"
-    fname = os.path.join(data_directory, *args)
-
-    try:
-        filedata = json.loads(pkgutil.get_data(__name__, fname).decode())
-    except:
-        filedata = []
-
-    return filedata
-
-class Data:
-    item_table = []
-    location_table = []
-    region_table = []
-    region_connections_table = []
-
-    item_name_groups = {}
-
-    def load_data(character):
-        character_offsets = { 'chris': 0, 'jill': 1000 }        
-        scenario = "a"
-        scenario_offsets = { 'a': 0 }
-        hardcore_offset = 400 # put all hardcore-only locations in the last 100 location spots for each scenario
-        scenario_suffix = ' ({})'.format(character[0].upper())
-        scenario_suffix_hardcore = ' ({}H)'.format(character[0].upper()) # makes hardcore location variations unique
-
-        location_start = item_start = 3000000000 + character_offsets[character] + scenario_offsets[scenario]
-
-        ###
-        # Add standard regions
-        ###
-
-        new_region_table = load_data_file(character, 'regions.json')
-        Data.region_table.extend([
-            {
-                **reg,
-                'name': reg['name'] + scenario_suffix if reg['name'] != 'Menu' else reg['name'], # add the scenario abbreviation so they're unique
-                'character': character,
-                'scenario': scenario
-            }
-            for reg in new_region_table
-        ])
-
-        ###
-        # Add hardcore regions, if applicable
-        ###
-
-        hardcore_locations_table = load_data_file(character, 'locations_hardcore.json')
-        hardcore_regions = set([loc['region'] for loc in hardcore_locations_table])
-
-        if len(hardcore_regions) > 0:
-            Data.region_table.extend([
-                {
-                    'name': reg + scenario_suffix_hardcore, # add the scenario abbreviation so they're unique
-                    'character': character,
-                    'scenario': scenario,
-                    'zone_id': [regular['zone_id'] for regular in new_region_table if regular['name'] == reg][0]
-                }
-                for reg in hardcore_regions # instead of using region definitions, we're using the hardcore region additions from the locations themselves
-            ])
-
-        ###
-        # Add standard region connections
-        ###
-
-        added_connections = []
-        new_region_connections_table = load_data_file(character, 'region_connections.json')
-
-        for conn in new_region_connections_table:
-            connection_path = f"{conn['from'] + scenario_suffix} to {conn['to'] + scenario_suffix}"
-
-            if connection_path in added_connections:
-                continue
-
-            added_connections.append(connection_path)
-
-            Data.region_connections_table.append(
-                {
-                    **conn,
-                    'from': conn['from'] + scenario_suffix if conn['from'] != 'Menu' else conn['from'], # add the scenario abbreviation so they're unique
-                    'to': conn['to'] + scenario_suffix if conn['to'] != 'Menu' else conn['to'], # add the scenario abbreviation so they're unique
-                    'character': character,
-                    'scenario': scenario
-                }
-            )
-
-        ###
-        # Add hardcore region connections
-        ###
-
-        # not a typo. if we loaded hardcore regions, we need to generate hardcore region connections as well
-        if len(hardcore_regions) > 0:
-            for conn in new_region_connections_table:
-                if conn['from'] in hardcore_regions or conn['to'] in hardcore_regions:
-                    suffix_from = scenario_suffix_hardcore if conn['from'] in hardcore_regions else scenario_suffix
-                    suffix_to = scenario_suffix_hardcore if conn['to'] in hardcore_regions else scenario_suffix
-
-                    connection_from_name = conn['from'] + suffix_from
-                    connection_to_name = conn['to'] + suffix_to
-                    connection_path = f"{connection_from_name} to {connection_to_name}"
-
-                    if connection_path in added_connections:
-                        continue
-
-                    added_connections.append(connection_path)
-
-                    new_region_connection = {
-                        **conn,
-                        'from': connection_from_name, 
-                        'to': connection_to_name, 
-                        'character': character,
-                        'scenario': scenario    
-                    }
-
-                    Data.region_connections_table.append(new_region_connection)
-
-        ###
-        # Add item table for all difficulties
-        ###
-        
-        new_item_table = load_data_file(character, 'items.json')
-        Data.item_table.extend([
-            { 
-                **item, 
-                'id': item['id'] if item.get('id') else item_start + key
-            } 
-            for key, item in enumerate(new_item_table)
-        ])
-
-        # For the items that have groups, add them to the item group names
-        new_items_with_groups = [item for _, item in enumerate(new_item_table) if "groups" in item.keys()]
-
-        for item_with_group in new_items_with_groups:
-            item_name = item_with_group["name"]
-            group_names = item_with_group["groups"]
-
-            for group_name in group_names:
-                if group_name not in Data.item_name_groups.keys():
-                    Data.item_name_groups[group_name] = []
-
-                Data.item_name_groups[group_name].append(item_name)
-
-        ###
-        # Add standard location table
-        ###
-
-        new_location_table = load_data_file(character, 'locations.json')
-        Data.location_table.extend([
-            { 
-                **loc, 
-                'id': loc['id'] if loc.get('id') else location_start + key,
-                'region': loc['region'] + scenario_suffix, # add the scenario abbreviation so they're unique
-                'character': character,
-                'scenario': scenario,
-                'difficulty': None
-            }
-            for key, loc in enumerate(new_location_table)
-        ])
-
-        ###
-        # Add hardcore locations
-        ###
-
-        hardcore_location_table = load_data_file(character, 'locations_hardcore.json')
-
-        if len(hardcore_location_table) > 0:
-            Data.location_table.extend([
-                { 
-                    **loc, 
-                    'id': loc['id'] if loc.get('id') else location_start + key + hardcore_offset,
-                    'region': loc['region'] + scenario_suffix_hardcore, # add the scenario abbreviation so they're unique
-                    'character': character,
-                    'scenario': scenario,
-                    'difficulty': 'hardcore'
-                }
-                for key, loc in enumerate(hardcore_location_table)
-            ])
+import marshal
+
+from . import Compiler
+from .Analysis import analyze_scenario
+from .Exceptions import RE1RDataError
+from .Instrumentation import timed_data
+from .Records import build_scenario_records
+
+
+class Data:
+    item_table = []
+    location_table = []
+    region_table = []
+    region_connections_table = []
+
+    item_name_groups = {}
+    character_item_name_groups = {} # each character's own groups, so one character can be reloaded without the other
+
+    compiled = None # the data/compiled.bin artifact, see Compiler. stays None if it's out of date and the JSON is used instead
+    name_table = None # compact id/name table, the only data needed when the world class is defined
+    loaded_characters = set()
+    scenario_catalog = {} # indexed by (character, scenario, difficulty), built on first use by get_scenario_catalog
+    scenario_analysis = {} # key-gating analysis, indexed the same way as scenario_catalog
+    scenario_records = {} # shared read-only records for the world, indexed the same way as scenario_catalog
+
+    ###
+    # Id / name table
+    ###
+
+    def load_name_table() -> dict:
+        if Data.name_table is None:
+            Data.compiled = Compiler.load_artifact()
+
+            if Data.compiled:
+                Data.name_table = Data.compiled['names']
+            # the artifact is missing or stale, so compile both characters from the JSON. slower, but always up to date.
+            else:
+                Data.name_table = Compiler.build_name_table({ 
+                    character: Compiler.compile_character(character) for character in Compiler.characters 
+                })
+
+        return Data.name_table
+
+    ###
+    # Full character data
+    ###
+
+    def ensure_loaded(character):
+        if character not in Data.loaded_characters:
+            Data.load_data(character)
+
+    @timed_data
+    def load_data(character):
+        Data.load_name_table()
+        Data.loaded_characters.add(character)
+
+        if Data.compiled:
+            tables = marshal.loads(Data.compiled['characters'][character])
+        else:
+            tables = Compiler.compile_character(character)
+
+        Data.item_table.extend(tables['item_table'])
+        Data.location_table.extend(tables['location_table'])
+        Data.region_table.extend(tables['region_table'])
+        Data.region_connections_table.extend(tables['region_connections_table'])
+
+        Data.character_item_name_groups[character] = tables['item_name_groups']
+
+        for group_name, item_names in tables['item_name_groups'].items():
+            Data.item_name_groups.setdefault(group_name, []).extend(item_names)
+
+    def reload_character(character, raw):
+        # for development (see tools/DevMode.py): swaps one character's tables for ones compiled from raw, in place, and
+        #   drops the catalogs, analysis, and records built from the old ones. the other character is left alone.
+        Data.load_name_table()
+        tables = Compiler.compile_character(character, raw)
+
+        # the world's id tables, item prototypes, and progression names are class attributes built from the name table when
+        #   the world was imported, so they can't follow a reload. a reload that would change them is refused instead.
+        changed_names = Data.get_changed_names(tables)
+
+        if len(changed_names) > 0:
+            raise RE1RDataError(
+                f"{character.capitalize()}'s data changes the id / name table ({', '.join(changed_names[:5])}"
+                + f"{', ...' if len(changed_names) > 5 else ''}), which needs a restart to pick up."
+            )
+
+        for table_name in ['item_table', 'location_table', 'region_table', 'region_connections_table']:
+            table = getattr(Data, table_name)
+            table[:] = [record for record in table if record['character'] != character] + tables[table_name]
+
+        Data.loaded_characters.add(character)
+        Data.character_item_name_groups[character] = tables['item_name_groups']
+        Data.item_name_groups.clear()
+
+        for loaded_character in Compiler.characters:
+            for group_name, item_names in Data.character_item_name_groups.get(loaded_character, {}).items():
+                Data.item_name_groups.setdefault(group_name, []).extend(item_names)
+
+        for cache in [Data.scenario_catalog, Data.scenario_analysis, Data.scenario_records]:
+            for key in [key for key in cache if key[0] == character]:
+                del cache[key]
+
+        # imported here, since Output imports Data
+        from .Output import clear_item_list_tables
+        clear_item_list_tables(character)
+
+        # the artifact's analysis for this character is out of date now, so it gets re-run from the new tables.
+        #   its hash goes to the files' current one, since that's what the loaded data matches now (Templates versions by it).
+        if Data.compiled:
+            Data.compiled['analysis'] = { key: value for key, value in Data.compiled['analysis'].items() if key[0] != character }
+            Data.compiled['source_hash'] = Compiler.source_hash()
+
+        return tables
+
+    def get_changed_names(tables) -> list:
+        # names in tables that aren't in the name table as they are there: new or renamed items and locations, and items
+        #   with a different id, type, or progression. rows are built the same way as Compiler.build_name_table's.
+        item_rows = set(tuple(row) for row in Data.name_table['items'])
+        location_rows = set(tuple(row) for row in Data.name_table['locations'])
+
+        changed_items = [
+            item['name'] for item in tables['item_table']
+                if (item['id'], item['name'], item.get('type'), item.get('progression')) not in item_rows
+        ]
+        changed_locations = [
+            ' - '.join([loc['region'], loc['name']]) for loc in tables['location_table']
+                if (loc['id'], ' - '.join([loc['region'], loc['name']])) not in location_rows
+        ]
+
+        return changed_items + changed_locations
+
+    ###
+    # Scenario catalog
+    ###
+
+    def get_scenario_catalog(character, scenario, difficulty) -> dict:
+        # difficulties that share another's data (like real survival on hard's) share its catalog too
+        key = (character, scenario, Compiler.resolve_difficulty(difficulty))
+
+        if key not in Data.scenario_catalog:
+            Data.scenario_catalog[key] = Data.build_scenario_catalog(character, scenario, difficulty)
+
+        return Data.scenario_catalog[key]
+
+    @timed_data
+    def build_scenario_catalog(character, scenario, difficulty) -> dict:
+        Data.ensure_loaded(character)
+
+        return Compiler.build_scenario_catalog(Data.get_tables(), character, scenario, difficulty)
+
+    def get_scenario_records(character, scenario, difficulty):
+        key = (character, scenario, Compiler.resolve_difficulty(difficulty))
+
+        if key not in Data.scenario_records:
+            Data.scenario_records[key] = build_scenario_records(Data.get_scenario_catalog(character, scenario, difficulty), key)
+
+        return Data.scenario_records[key]
+
+    def get_tables() -> dict:
+        return {
+            'item_table': Data.item_table,
+            'location_table': Data.location_table,
+            'region_table': Data.region_table,
+            'region_connections_table': Data.region_connections_table
+        }
+
+    ###
+    # Key-gating analysis
+    ###
+
+    def get_scenario_analysis(character, scenario, difficulty) -> dict:
+        key = (character, scenario, Compiler.resolve_difficulty(difficulty))
+
+        if key not in Data.scenario_analysis:
+            Data.load_name_table()
+
+            if Data.compiled and key in Data.compiled['analysis']:
+                Data.scenario_analysis[key] = marshal.loads(Data.compiled['analysis'][key])
+            else:
+                Data.scenario_analysis[key] = analyze_scenario(Data.get_scenario_catalog(character, scenario, difficulty))
+
+        return Data.scenario_analysis[key]
@@ -6,3 +6,16 @@ class RE1ROptionError(OptionError):
 
         super().__init__(msg)
 
+
+class RE1RDataError(Exception):
+    def __init__(self, msg):
+        msg = f"There was a problem with the RE1R world data. {msg}"
+
+        super().__init__(msg)
+
+
+class RE1RGenerationError(Exception):
+    def __init__(self, msg):
+        msg = f"There was a problem generating the RE1R world. {msg}"
+
+        super().__init__(msg)
@@ -0,0 +1,101 @@
+from collections import Counter
+
+from BaseClasses import LocationProgressType
+
+from .Settings import env_flag, env_value
+
+###
+# Fast fill for solo seeds, where one RE1R player is the whole multiworld (no other games, no item links).
+#
+# Archipelago's fill works through CollectionState sweeps, which is built for many games at once. With only one RE1R
+#   player, reachability comes from the player's RE1RSimulator instead (see Simulator), which follows the same graph and
+#   rules as the world. Locked placements (force_item, randomized: 0, pre_fill, Victory) and starting items are collected
+#   like anywhere else.
+#
+# Progression goes in with assumed fill: every progression item starts out assumed collected, and each one is taken out
+#   of that inventory and placed somewhere still reachable without it, that its location's item rule allows (so
+#   forbid_item and the Laboratory restriction apply). Priority locations are picked first while any of them can take
+#   the item. Useful items, then filler, go in the rest, with excluded locations only taking filler, same as
+#   Archipelago's fill. The result is written back to the MultiWorld, and the regular fill runs with nothing left to place.
+#
+# If the simulator can't place something, nothing is written and the regular fill does the whole thing.
+#
+# It's off unless the RE1R_FAST_FILL environment variable is set (to anything but 0/false/no). Set it to "validate" to
+#   also check every fast fill against Archipelago's own playthrough calculation: the spheres have to reach the same
+#   locations the simulator does, and the seed has to be beatable.
+###
+
+enabled = env_flag("RE1R_FAST_FILL")
+validate = env_value("RE1R_FAST_FILL") == "validate"
+
+def get_reachable(simulator, counts, placed) -> set:
+    # the location indexes that can be reached from counts (item name: count), collecting the progression placed along
+    #   the way (placed is an item name or None per location)
+    spheres, _ = simulator.sweep(placed, Counter(counts).elements())
+
+    return set(index for sphere in spheres for index in sphere)
+
+def accepts(location, item) -> bool:
+    # Location.can_fill without the access check, which the simulator does itself
+    return (location.progress_type != LocationProgressType.EXCLUDED or not (item.advancement or item.useful)) \
+        and location.item_rule(item)
+
+def fill_solo(simulator, random, fill_locations, progression_items, useful_items, filler_items, placed_item_names, start_counts) -> list:
+    # returns [(location, item), ...] for every item, or None if the simulator can't place them all.
+    #   placed_item_names is what's already at each simulator location (locked items), or None.
+    if len(progression_items) + len(useful_items) + len(filler_items) > len(fill_locations):
+        return None
+
+    placed = list(placed_item_names)
+    empty = { simulator.location_index[location.name]: location for location in fill_locations }
+    placements = []
+
+    # assumed fill: the items still to place are assumed to be collected
+    progression_items = list(progression_items)
+    random.shuffle(progression_items)
+    assumed = Counter(start_counts)
+    assumed.update(item.name for item in progression_items)
+
+    while len(progression_items) > 0:
+        item = progression_items.pop()
+        assumed[item.name] -= 1
+        reachable = get_reachable(simulator, assumed, placed)
+        candidates = [index for index, location in empty.items() if index in reachable and accepts(location, item)]
+
+        if len(candidates) == 0:
+            return None
+
+        # progression goes in priority locations first, same as Archipelago's fill
+        priority_candidates = [index for index in candidates if empty[index].progress_type == LocationProgressType.PRIORITY]
+        index = random.choice(priority_candidates or candidates)
+        placed[index] = item.name
+        placements.append((empty.pop(index), item))
+
+    # the rest don't change what's reachable, so they go anywhere that takes them. picky locations (an item rule, or
+    #   excluded) go first, fewest takers first, so one like Chris' Main Hall floor doesn't get left with nothing it can hold.
+    remaining_locations = list(empty.values())
+    random.shuffle(remaining_locations)
+
+    for items in [useful_items, filler_items]:
+        items = list(items)
+        random.shuffle(items)
+        remaining_locations.sort(key=lambda location: sum(1 for item in items if accepts(location, item)) if is_picky(location) else len(items))
+        unfilled_locations = []
+
+        for location in remaining_locations:
+            item_index = next((item_index for item_index, item in enumerate(items) if accepts(location, item)), None)
+
+            if item_index is None:
+                unfilled_locations.append(location)
+            else:
+                placements.append((location, items.pop(item_index)))
+
+        if len(items) > 0:
+            return None
+
+        remaining_locations = unfilled_locations
+
+    return placements
+
+def is_picky(location) -> bool:
+    return location.item_rule is not type(location).item_rule or location.progress_type == LocationProgressType.EXCLUDED
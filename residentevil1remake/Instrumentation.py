@@ -0,0 +1,121 @@
+import functools
+import json
+import logging
+import time
+
+from .Settings import env_flag
+
+###
+# Per-stage timing and counters, for working out whether RE1R is what's slowing down a big generation.
+#
+# Turn it on by setting the RE1R_INSTRUMENT environment variable (to anything but 0/false/no) before generating.
+# When it's on, each instrumented stage logs a line with its wall time and counters, and each player's spoiler gets
+#   a JSON line with everything that player recorded, plus the data loading done in this process.
+#
+# When it's off, the decorators below hand back the original functions untouched, so there's nothing extra to run at all.
+###
+
+enabled = env_flag("RE1R_INSTRUMENT")
+
+data_timings = [] # one entry per timed Data call, for the whole process, since the data is shared by every player
+
+def timed_stage(counter_function = None):
+    # for World stages. counter_function(world) returns a dict of counts to record alongside the time, after the stage is done.
+    def decorator(method):
+        if not enabled:
+            return method
+
+        @functools.wraps(method)
+        def wrapper(world, *args, **kwargs):
+            start = time.perf_counter()
+            result = method(world, *args, **kwargs)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            counters = counter_function(world) if counter_function else {}
+            get_stats(world)['stages'][method.__name__] = { 'ms': round(elapsed_ms, 3), **counters }
+
+            logging.info(f"RE1R player {world.player}: {method.__name__} took {elapsed_ms:.2f} ms"
+                + "".join(f", {name}={value}" for name, value in counters.items()))
+
+            return result
+
+        return wrapper
+
+    return decorator
+
+def timed_data(function):
+    # for Data's loading functions, which aren't tied to a player
+    if not enabled:
+        return function
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        data_timings.append({ 'name': function.__qualname__, 'args': [str(arg) for arg in args], 'ms': round(elapsed_ms, 3) })
+        logging.info(f"RE1R: {function.__qualname__}({', '.join(str(arg) for arg in args)}) took {elapsed_ms:.2f} ms")
+
+        return result
+
+    return wrapper
+
+def get_stats(world) -> dict:
+    if 'instrumentation_stats' not in world.__dict__:
+        world.instrumentation_stats = { 'stages': {} }
+
+    return world.instrumentation_stats
+
+def get_report(world) -> dict:
+    # fast_fill is empty unless the fast solo fill ran, see FastFill
+    return { 'player': world.player, 'stages': get_stats(world)['stages'], 'data': data_timings, 'fast_fill': world.fast_fill_stats }
+
+def write_spoiler_report(world, spoiler_handle):
+    if not enabled:
+        return
+
+    spoiler_handle.write(f"RE1R instrumentation (JSON): {json.dumps(get_report(world), sort_keys=True)}\n")
+
+###
+# Counters for each stage
+###
+
+def count_location_records(world) -> dict:
+    return {
+        'location_records': len(world.scenario_records.locations),
+        'template_source': world.template_source,
+        'shared_build_players': len(world.shared_build['players']) if world.shared_build else 1
+    }
+
+def count_regions(world) -> dict:
+    regions = world.multiworld.get_regions(world.player)
+    locations = [location for region in regions for location in region.locations]
+    entrances = [entrance for region in regions for entrance in region.exits]
+
+    # a spot has a rule installed if its access_rule isn't the class's default
+    location_rules = [location.access_rule for location in locations if location.access_rule is not type(location).access_rule]
+    entrance_rules = [entrance.access_rule for entrance in entrances if entrance.access_rule is not type(entrance).access_rule]
+
+    return {
+        'regions': len(regions),
+        'locations': len(locations),
+        'entrances': len(entrances),
+        'location_rules': len(location_rules),
+        'entrance_rules': len(entrance_rules),
+        'distinct_rules': len(set(map(id, location_rules + entrance_rules)))
+    }
+
+def count_items(world) -> dict:
+    pool = world.item_pool
+
+    return {
+        'precollected': sum(pool.precollected.values()),
+        'padded': pool.padded,
+        'pool_before_trim': pool.size_before_trim,
+        'trimmed': pool.trimmed,
+        'pool_after_trim': len(pool)
+    }
+
+def count_pre_fill(world) -> dict:
+    return { 'pre_filled': len(world.pre_filled), 'pre_fill_fallbacks': len(world.pre_fill_fallbacks) }
@@ -0,0 +1,104 @@
+import os
+
+from .Data import Data
+
+###
+# Writes the ItemList file that Ben Powell's randomizer reads, e.g. ItemListJillNormal.txt.
+#
+# The file is one line per item location, in `locval` order (from locations.json), holding the `itemval` (from items.json)
+#   of the item placed there. After that come the enemy, door, and lock sections, each a header line then one value per line.
+# -1 means "leave this one alone" everywhere in the file.
+###
+
+# lines in each section after the item section, in file order. the item section is sized from the locvals in the data.
+section_lengths = {
+    'ENEMYRANDODATA': 53,
+    'DOORRANDODATA': 265,
+    'LOCKRANDODATA': 0 # just the header, since lock layouts can't be written out yet (see tools/Locks)
+}
+minimum_item_section_length = 180
+
+# items for other players still need something to pick up in-game, so those locations get a harmless item
+foreign_item_name = 'Ink Ribbon'
+
+item_list_tables = {} # character: tables from build_item_list_tables, built once per character (and dropped when Data reloads it)
+
+def get_item_list_tables(character) -> dict:
+    if character not in item_list_tables:
+        item_list_tables[character] = build_item_list_tables(character)
+
+    return item_list_tables[character]
+
+def clear_item_list_tables(character):
+    # for Data.reload_character, since the tables come from the character's items and locations
+    item_list_tables.pop(character, None)
+
+def build_item_list_tables(character) -> dict:
+    Data.ensure_loaded(character)
+
+    locval_by_location_id = {
+        loc['id']: loc['locval'] for loc in Data.location_table
+            if loc['character'] == character and loc.get('locval') is not None
+    }
+    itemval_by_item_name = {
+        item['name']: item['itemval'] for item in Data.item_table
+            if item['character'] == character and item.get('itemval') is not None
+    }
+
+    return {
+        'locval_by_location_id': locval_by_location_id,
+        'itemval_by_item_name': itemval_by_item_name,
+        'item_section_length': max([minimum_item_section_length] + [locval + 1 for locval in locval_by_location_id.values()]),
+        'foreign_itemval': itemval_by_item_name.get(foreign_item_name, -1)
+    }
+
+def build_item_list(character, locations, player, sections = None) -> str:
+    # sections is section name: list of values, for any section that shouldn't be all -1
+    tables = get_item_list_tables(character)
+    locval_by_location_id = tables['locval_by_location_id']
+    itemval_by_item_name = tables['itemval_by_item_name']
+    foreign_itemval = tables['foreign_itemval']
+
+    item_values = [-1] * tables['item_section_length']
+
+    for location in locations:
+        locval = locval_by_location_id.get(location.address)
+
+        if locval is None or location.item is None:
+            continue
+
+        # items from other players all get the same placeholder, the Ink Ribbon's itemval. the randomizer only knows this
+        #   character's items, so there's nothing truer to show. picking it up is still a check, which the client sends
+        #   on, and an Ink Ribbon can't change what the player can reach. -1 (the original item) if the data has no Ink Ribbon.
+        if location.item.player != player:
+            item_values[locval] = foreign_itemval
+        # items without a known itemval are left as -1, which leaves the original item there
+        else:
+            item_values[locval] = itemval_by_item_name.get(location.item.name, -1)
+
+    lines = [str(value) for value in item_values]
+    sections = sections or {}
+
+    for section_name, section_length in section_lengths.items():
+        section_values = sections.get(section_name, [-1] * section_length)
+
+        lines.append(section_name)
+        lines.extend(str(value) for value in section_values)
+
+    return "\n".join(lines) + "\n"
+
+def get_item_list_file_name(character, difficulty) -> str:
+    return f"ItemList{character.capitalize()}{difficulty.capitalize()}.txt"
+
+def write_item_list(world, output_directory, sections = None) -> str:
+    character = world._get_character()
+    contents = build_item_list(character, world.multiworld.get_locations(world.player), world.player, sections)
+
+    # the randomizer expects the plain name (e.g. ItemListJillNormal.txt), so rename the file after unzipping.
+    # it's prefixed here so multiple RE1R players in one multiworld don't overwrite each other.
+    file_name = f"{world.multiworld.get_out_file_name_base(world.player)}_{get_item_list_file_name(character, world._get_difficulty())}"
+
+    with open(os.path.join(output_directory, file_name), "w") as f:
+        f.write(contents)
+
+    return file_name
@@ -0,0 +1,99 @@
+from collections import Counter
+
+from BaseClasses import ItemClassification, Item
+
+###
+# Builds a player's item pool as item name counts, so removing placed items, padding, and trimming are all count math
+#   instead of list searches. Item objects are only created once, at the very end, from each name's prototype.
+###
+
+def get_item_classification(item) -> ItemClassification:
+    if item.get('progression', False):
+        return ItemClassification.progression
+    elif item.get('type', None) not in ['Lore', 'Trap']:
+        return ItemClassification.useful
+    elif item.get('type', None) == 'Trap':
+        return ItemClassification.trap
+    else: # it's Lore
+        return ItemClassification.filler
+
+def build_item_prototypes(item_name_to_item) -> dict:
+    # name: (classification, id), precomputed so creating an item never has to work out its classification again
+    return {
+        name: (get_item_classification(item), item['id']) for name, item in item_name_to_item.items()
+    }
+
+
+class RE1RItemPool:
+    def __init__(self, prototypes: dict):
+        self.prototypes = prototypes
+        self.counts = Counter()
+        self.precollected = Counter()
+        self.padded = 0 # how many items pad() and trim() added or removed, for instrumentation
+        self.trimmed = 0
+        self.size_before_trim = 0
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+    def add(self, item_name, count = 1):
+        if item_name not in self.prototypes:
+            raise KeyError(f"'{item_name}' is not a RE1R item.")
+
+        self.counts[item_name] += count
+
+    def remove(self, item_name, count = 1) -> int:
+        # removes up to count of the item, and returns how many were actually removed
+        current_count = self.counts.get(item_name, 0)
+        removed = min(count, current_count)
+
+        if removed <= 0:
+            return 0
+
+        if removed == current_count:
+            del self.counts[item_name]
+        else:
+            self.counts[item_name] = current_count - removed
+
+        return removed
+
+    def remove_placed(self, item_names):
+        # already-placed items (forced items, etc.) come out of the pool, but only if the pool had them to begin with
+        for item_name, count in Counter(item_names).items():
+            self.remove(item_name, count)
+
+    def pad(self, size, item_name):
+        missing_item_count = size - len(self)
+
+        if missing_item_count > 0:
+            self.add(item_name, missing_item_count)
+            self.padded += missing_item_count
+
+    def trim(self, size, tiers: list) -> int:
+        # tiers is a list of lists of item names, in the order they should be removed.
+        # everything in the first tier is removed before anything in the second, and so on.
+        self.size_before_trim = len(self)
+        extra_items = self.size_before_trim - size
+
+        for tier in tiers:
+            for item_name in tier:
+                if extra_items <= 0:
+                    break
+
+                removed = self.remove(item_name, extra_items)
+                extra_items -= removed
+                self.trimmed += removed
+
+        return max(extra_items, 0) # anything left over couldn't be removed
+
+    def names_with_classification(self, classification) -> list:
+        return [item_name for item_name in self.counts if self.prototypes[item_name][0] == classification]
+
+    def create_items(self, player, counts = None) -> list:
+        items = []
+
+        for item_name, count in (counts if counts is not None else self.counts).items():
+            classification, code = self.prototypes[item_name]
+            items.extend(Item(item_name, classification, code, player) for _ in range(count))
+
+        return items
@@ -0,0 +1,108 @@
+import sys
+
+from .Analysis import get_condition_items, stack_location_name
+
+###
+# Shared, read-only records for a scenario's locations, regions, and connections.
+#
+# These are built once per (character, scenario, difficulty) by Data.get_scenario_records and shared by every player
+#   playing that scenario, instead of each player copying every location dict. Names are interned, so the same strings
+#   are shared with the multiworld's Location / Region objects and the name tables too.
+#
+# Records can't be changed in place. Code that needs a different version of one (like the door shuffle in tools/Doors)
+#   makes a copy with replace(), so the shared records never change.
+###
+
+class Record:
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for field in self.__slots__:
+            object.__setattr__(self, field, fields.get(field))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is shared between players and can't be changed. Use replace() for a changed copy.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is shared between players and can't be changed.")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{field}={getattr(self, field)!r}' for field in self.__slots__)})"
+
+    def replace(self, **changes):
+        return type(self)(**{ **{ field: getattr(self, field) for field in self.__slots__ }, **changes })
+
+
+class LocationRecord(Record):
+    # condition_items is the data's condition list as-is (shared, never modified), since the rule compiler reads it directly
+    __slots__ = ('id', 'name', 'full_name', 'region', 'original_item', 'force_item', 'randomized', 'forbid_item', 'condition_items')
+
+
+class RegionRecord(Record):
+    __slots__ = ('name', 'zone_id', 'locations')
+
+
+class ConnectionRecord(Record):
+    __slots__ = ('from_name', 'to_name', 'condition_items', 'doorval')
+
+
+class ScenarioRecords(Record):
+    __slots__ = ('key', 'regions', 'regions_by_name', 'connections', 'locations', 'locations_by_id', 'locations_by_name')
+
+
+lab_zone_id = 3 # zones past this are the Laboratory / endgame, 3 is typically Sewers
+
+def is_closed_to_progression(region_record, allow_progression_in_lab) -> bool:
+    # the Laboratory restriction: with allow_progression_in_lab off, the fill can't put progression in there
+    return not allow_progression_in_lab and region_record.zone_id > lab_zone_id
+
+def intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+def build_location_record(loc) -> LocationRecord:
+    return LocationRecord(
+        id=loc['id'],
+        name=intern(loc['name']),
+        full_name=intern(stack_location_name(loc)),
+        region=intern(loc['region']),
+        original_item=intern(loc.get('original_item') or None),
+        force_item=intern(loc.get('force_item') or None),
+        randomized=loc.get('randomized', 1) != 0,
+        forbid_item=frozenset(intern(item_name) for item_name in loc.get('forbid_item') or []),
+        condition_items=get_condition_items(loc) or None
+    )
+
+def build_scenario_records(catalog, key) -> ScenarioRecords:
+    locations_by_id = { id: build_location_record(loc) for id, loc in catalog['locations'].items() }
+
+    regions = tuple(
+        RegionRecord(
+            name=intern(region_name),
+            zone_id=region['zone_id'],
+            locations=tuple(locations_by_id[loc['id']] for loc in catalog['region_locations'][region_name])
+        )
+        for region_name, region in catalog['regions'].items()
+    )
+
+    # one-sided doors are left out, since they should not be reachable backwards (and should be reachable otherwise)
+    connections = tuple(
+        ConnectionRecord(
+            from_name=intern(connect['from'] if 'Menu' not in connect['from'] else 'Menu'),
+            to_name=intern(connect['to'] if 'Menu' not in connect['to'] else 'Menu'),
+            condition_items=get_condition_items(connect) or None,
+            doorval=connect.get('doorval')
+        )
+        for connect in catalog['connections'] if connect.get('limitation') not in ['ONE_SIDED_DOOR']
+    )
+
+    locations = tuple(locations_by_id.values())
+
+    return ScenarioRecords(
+        key=key,
+        regions=regions,
+        regions_by_name={ region.name: region for region in regions },
+        connections=connections,
+        locations=locations,
+        locations_by_id=locations_by_id,
+        locations_by_name={ location.full_name: location for location in locations }
+    )
@@ -0,0 +1,80 @@
+from collections import Counter
+from typing import Callable, Optional
+
+from BaseClasses import CollectionState
+
+###
+# Compiles the `condition.items` lists from the data files into access rules once, when regions are created,
+#   instead of interpreting the list on every rule call like the original rule (tools/RuleBenchmark.has_items) does.
+#
+# A condition's items are either a list of item names (all required, duplicates mean "this many"),
+#   or a list of lists of item names (any one of the lists is enough).
+###
+
+def normalize_condition(item_names) -> tuple:
+    # returns a tuple of alternatives, each a sorted tuple of (item name, count) pairs
+    if len(item_names) == 0:
+        return ()
+
+    # if the requirements are a single set of items, make it a list of a single set of items, same as RuleBenchmark.has_items
+    if type(item_names[0]) is not list:
+        item_names = [item_names]
+
+    alternatives = []
+
+    for set_of_requirements in item_names:
+        alternative = tuple(sorted(Counter(set_of_requirements).items()))
+
+        # an empty alternative means the condition is always met, so there's nothing to check
+        if len(alternative) == 0:
+            return ()
+
+        if alternative not in alternatives:
+            alternatives.append(alternative)
+
+    return tuple(alternatives)
+
+def compile_alternative(alternative, player) -> Callable[[CollectionState], bool]:
+    if len(alternative) == 1:
+        item_name, count = alternative[0]
+
+        if count == 1:
+            return lambda state: state.has(item_name, player)
+
+        return lambda state: state.has(item_name, player, count)
+
+    if all(count == 1 for _, count in alternative):
+        item_names = tuple(item_name for item_name, _ in alternative)
+
+        return lambda state: state.has_all(item_names, player)
+
+    item_counts = dict(alternative)
+
+    return lambda state: state.has_all_counts(item_counts, player)
+
+def compile_condition(item_names, player, rule_cache = None) -> Optional[Callable[[CollectionState], bool]]:
+    # returns None when there's nothing to check, so callers can skip setting a rule at all
+    return compile_normalized_condition(normalize_condition(item_names), player, rule_cache)
+
+def compile_normalized_condition(key, player, rule_cache = None) -> Optional[Callable[[CollectionState], bool]]:
+    # same as compile_condition, for a condition that's already normalized (like the ones in a Templates template)
+    if len(key) == 0:
+        return None
+
+    if rule_cache is not None and key in rule_cache:
+        return rule_cache[key]
+
+    if len(key) == 1:
+        rule = compile_alternative(key[0], player)
+    # any one of several single items
+    elif all(len(alternative) == 1 and alternative[0][1] == 1 for alternative in key):
+        item_names = tuple(alternative[0][0] for alternative in key)
+        rule = lambda state: state.has_any(item_names, player)
+    else:
+        alternative_rules = tuple(compile_alternative(alternative, player) for alternative in key)
+        rule = lambda state: any(alternative_rule(state) for alternative_rule in alternative_rules)
+
+    if rule_cache is not None:
+        rule_cache[key] = rule
+
+    return rule
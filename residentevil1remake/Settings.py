@@ -0,0 +1,16 @@
+import os
+
+###
+# The RE1R_* environment variables that turn on the world's opt-in modes (see Instrumentation, FastFill, and Templates).
+#   They're read once, when the module using them is imported.
+###
+
+off_values = ["", "0", "false", "no"]
+
+def env_value(name) -> str:
+    # the variable's value, lowercased, or "" if it isn't set. for variables with modes, like RE1R_FAST_FILL=validate.
+    return os.environ.get(name, "").lower()
+
+def env_flag(name) -> bool:
+    # on if the variable is set to anything but 0/false/no
+    return env_value(name) not in off_values
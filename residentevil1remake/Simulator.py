@@ -0,0 +1,340 @@
+from collections import Counter
+
+from .Analysis import condition_to_sets, get_condition_items, stack_location_name
+from .Data import Data
+
+###
+# A standalone logic simulator for one RE1R scenario: give it a placement (location name: item name) and it works out
+#   reachability, spheres, and beatability, without a MultiWorld, CollectionState, or Region.can_reach.
+#
+# A whole inventory is one int. Every copy of a progression item that any condition counts gets its own bit, so having
+#   2 Old Keys sets the ('Old Key', 1) and ('Old Key', 2) bits (the same tokens Analysis uses). Each condition compiles to
+#   a tuple of masks, one per alternative, and an alternative is met when inventory & mask == mask.
+#
+# It follows the same graph and the same rules the world builds: directed connections with one-sided doors skipped,
+#   only the locations in regions that exist, and only progression items counting for anything, same as CollectionState.
+###
+
+class RE1RSimulator:
+    def __init__(self, catalog, progression_item_names):
+        self.progression_item_names = set(progression_item_names)
+        self.item_bits = {} # (item name, copy): bit number
+        self.region_index = {} # region name: index
+        self.outgoing = [] # region index: [(to region index, masks), ...]
+        self.location_names = []
+        self.location_regions = []
+        self.location_masks = []
+
+        for region_name in catalog['regions']:
+            self.region_index[region_name] = len(self.region_index)
+            self.outgoing.append([])
+
+        for connect in catalog['connections']:
+            if connect.get('limitation') in ['ONE_SIDED_DOOR']:
+                continue
+
+            from_name = connect['from'] if 'Menu' not in connect['from'] else 'Menu'
+            to_name = connect['to'] if 'Menu' not in connect['to'] else 'Menu'
+
+            self.outgoing[self.region_index[from_name]].append(
+                (self.region_index[to_name], self.compile_condition(get_condition_items(connect)))
+            )
+
+        for region_name, region_locations in catalog['region_locations'].items():
+            for loc in region_locations:
+                self.location_names.append(stack_location_name(loc))
+                self.location_regions.append(self.region_index[region_name])
+                self.location_masks.append(self.compile_condition(get_condition_items(loc)))
+
+        self.location_index = { name: index for index, name in enumerate(self.location_names) }
+        self.item_copies = Counter(item_name for item_name, _ in self.item_bits) # item name: copies that any condition counts
+
+    def compile_condition(self, item_names) -> tuple:
+        masks = []
+
+        for item_set in condition_to_sets(item_names):
+            # an alternative that needs a non-progression item can never be met, since those are never collected
+            if any(item_name not in self.progression_item_names for item_name, _ in item_set):
+                continue
+
+            mask = 0
+
+            for token in item_set:
+                if token not in self.item_bits:
+                    self.item_bits[token] = len(self.item_bits)
+
+                mask |= 1 << self.item_bits[token]
+
+            masks.append(mask)
+
+        return tuple(masks)
+
+    def get_inventory(self, item_names) -> int:
+        inventory = 0
+        counts = Counter()
+
+        for item_name in item_names:
+            inventory = self.collect(inventory, counts, item_name)
+
+        return inventory
+
+    def collect(self, inventory, counts, item_name) -> int:
+        # sets the bit for the next copy of the item, if any condition counts that many
+        if item_name in self.item_copies and counts[item_name] < self.item_copies[item_name]:
+            counts[item_name] += 1
+            inventory |= 1 << self.item_bits[(item_name, counts[item_name])]
+
+        return inventory
+
+    def get_reachable_regions(self, inventory) -> int:
+        # a bitmask of region indexes
+        return self.expand_regions(inventory, 1 << self.region_index['Menu'], [self.region_index['Menu']], [])
+
+    def expand_regions(self, inventory, reached, pending, blocked) -> int:
+        # walks out from the pending regions. connections that can't be used yet go in blocked, to retry when the inventory grows.
+        while len(pending) > 0:
+            for to_index, masks in self.outgoing[pending.pop()]:
+                if reached >> to_index & 1:
+                    continue
+
+                if any(inventory & mask == mask for mask in masks):
+                    reached |= 1 << to_index
+                    pending.append(to_index)
+                else:
+                    blocked.append((to_index, masks))
+
+        return reached
+
+    def can_reach_location(self, location_index, inventory, reached_regions) -> bool:
+        return bool(reached_regions >> self.location_regions[location_index] & 1) \
+            and any(inventory & mask == mask for mask in self.location_masks[location_index])
+
+    def simulate(self, placement, starting_items = ()) -> dict:
+        # placement is location name: item name, with None (or no entry) for nothing / another player's item
+        spheres, remaining = self.sweep([placement.get(location_name) for location_name in self.location_names], starting_items)
+
+        return {
+            'spheres': [[self.location_names[index] for index in sphere] for sphere in spheres],
+            'unreachable': [self.location_names[index] for index in remaining],
+            'beatable': 'Victory' in self.location_index and self.location_index['Victory'] not in remaining
+        }
+
+    def sweep(self, placed_items, starting_items = ()) -> tuple:
+        # placed_items is the item name (or None) at each location, in location index order. returns the spheres as lists
+        #   of location indexes, and the location indexes that were never reached.
+        counts = Counter()
+        inventory = 0
+
+        for item_name in starting_items:
+            inventory = self.collect(inventory, counts, item_name)
+
+        location_regions = self.location_regions
+        location_masks = self.location_masks
+        remaining = list(range(len(self.location_names)))
+        spheres = []
+
+        # regions only ever get added, so the region sweep carries on from where the last sphere left it
+        blocked = []
+        reached = self.expand_regions(inventory, 1 << self.region_index['Menu'], [self.region_index['Menu']], blocked)
+
+        while True:
+            sphere = []
+            still_remaining = []
+
+            for index in remaining:
+                # plain loops instead of any(), since this is the hot part and most conditions are one mask
+                if reached >> location_regions[index] & 1:
+                    for mask in location_masks[index]:
+                        if inventory & mask == mask:
+                            sphere.append(index)
+                            break
+                    else:
+                        still_remaining.append(index)
+                else:
+                    still_remaining.append(index)
+
+            if len(sphere) == 0:
+                break
+
+            spheres.append(sphere)
+            remaining = still_remaining
+            old_inventory = inventory
+
+            for index in sphere:
+                if placed_items[index] is not None:
+                    inventory = self.collect(inventory, counts, placed_items[index])
+
+            if inventory != old_inventory:
+                unblocked = [
+                    to_index for to_index, masks in blocked
+                        if not reached >> to_index & 1 and any(inventory & mask == mask for mask in masks)
+                ]
+                blocked = [(to_index, masks) for to_index, masks in blocked if not reached >> to_index & 1 and to_index not in unblocked]
+
+                for to_index in unblocked:
+                    reached |= 1 << to_index
+
+                reached = self.expand_regions(inventory, reached, unblocked, blocked)
+
+        return spheres, remaining
+
+    def simulate_batch(self, placements, starting_items = ()) -> list:
+        # every placement at once, bit-sliced: instead of one inventory per placement, each item copy, region, and location
+        #   gets one int with a bit per placement (a seed mask), so one pass over the locations advances every placement by
+        #   a sphere. the results are the same as simulate() for each placement.
+        seed_count = len(placements)
+        every_seed = (1 << seed_count) - 1
+
+        if seed_count == 0:
+            return []
+
+        # shared setup: for each location, which placements put which progression item there
+        location_items = [{} for _ in self.location_names]
+
+        for seed, placement in enumerate(placements):
+            for location_name, item_name in placement.items():
+                if item_name in self.item_copies and location_name in self.location_index:
+                    items = location_items[self.location_index[location_name]]
+                    items[item_name] = items.get(item_name, 0) | 1 << seed
+
+        # has[bit] is the placements that have that item copy. collecting a copy sets the next one, so the copies of an
+        #   item work as a counter per placement.
+        has = [0] * len(self.item_bits)
+
+        def collect(item_name, seeds):
+            for copy in range(1, self.item_copies[item_name] + 1):
+                bit = self.item_bits[(item_name, copy)]
+                new_seeds = seeds & ~has[bit]
+                has[bit] |= new_seeds
+                seeds &= ~new_seeds
+
+                if seeds == 0:
+                    break
+
+        def get_seeds(masks) -> int:
+            # the placements that meet any alternative
+            seeds = 0
+
+            for mask in masks:
+                alternative_seeds = every_seed
+
+                while mask and alternative_seeds:
+                    low = mask & -mask
+                    alternative_seeds &= has[low.bit_length() - 1]
+                    mask ^= low
+
+                seeds |= alternative_seeds
+
+            return seeds
+
+        for item_name, count in Counter(item_name for item_name in starting_items if item_name in self.item_copies).items():
+            for _ in range(count):
+                collect(item_name, every_seed)
+
+        regions = [0] * len(self.outgoing)
+        regions[self.region_index['Menu']] = every_seed
+        reached = [0] * len(self.location_names) # location index: placements that reached it
+        rounds = [] # per sphere: [(location index, placements that reached it in this sphere), ...]
+
+        while True:
+            # regions, to a fixpoint
+            changed = True
+
+            while changed:
+                changed = False
+
+                for from_index, connections in enumerate(self.outgoing):
+                    if regions[from_index] == 0:
+                        continue
+
+                    for to_index, masks in connections:
+                        missing = regions[from_index] & ~regions[to_index]
+
+                        if missing:
+                            new_seeds = missing & get_seeds(masks)
+
+                            if new_seeds:
+                                regions[to_index] |= new_seeds
+                                changed = True
+
+            sphere = []
+
+            for index, masks in enumerate(self.location_masks):
+                missing = regions[self.location_regions[index]] & ~reached[index]
+
+                if missing:
+                    new_seeds = missing & get_seeds(masks)
+
+                    if new_seeds:
+                        sphere.append((index, new_seeds))
+
+            if len(sphere) == 0:
+                break
+
+            rounds.append(sphere)
+
+            for index, new_seeds in sphere:
+                reached[index] |= new_seeds
+
+            for index, new_seeds in sphere:
+                for item_name, item_seeds in location_items[index].items():
+                    if new_seeds & item_seeds:
+                        collect(item_name, new_seeds & item_seeds)
+
+        # split back out per placement
+        results = [{ 'spheres': [], 'unreachable': [], 'beatable': False } for _ in range(seed_count)]
+
+        for sphere in rounds:
+            seed_spheres = {}
+
+            for index, new_seeds in sphere:
+                while new_seeds:
+                    low = new_seeds & -new_seeds
+                    seed_spheres.setdefault(low.bit_length() - 1, []).append(self.location_names[index])
+                    new_seeds ^= low
+
+            for seed, location_names in seed_spheres.items():
+                results[seed]['spheres'].append(location_names)
+
+        victory_index = self.location_index.get('Victory')
+
+        for index, seeds in enumerate(reached):
+            unreached = every_seed & ~seeds
+
+            while unreached:
+                low = unreached & -unreached
+                results[low.bit_length() - 1]['unreachable'].append(self.location_names[index])
+                unreached ^= low
+
+        for seed, result in enumerate(results):
+            result['beatable'] = victory_index is not None and bool(reached[victory_index] >> seed & 1)
+
+        return results
+
+    def is_beatable(self, placement, starting_items = ()) -> bool:
+        return self.simulate(placement, starting_items)['beatable']
+
+###
+# Building simulators and placements from the data
+###
+
+def build_simulator(character, scenario = 'a', difficulty = 'normal') -> RE1RSimulator:
+    # progression is looked up by name, last one wins, same as the world's item_name_to_item
+    progression = { name: progression for _, name, _, progression in Data.load_name_table()['items'] }
+
+    return RE1RSimulator(
+        Data.get_scenario_catalog(character, scenario, difficulty),
+        [name for name, is_progression in progression.items() if is_progression]
+    )
+
+def get_original_placement(character, scenario = 'a', difficulty = 'normal') -> dict:
+    # the unrandomized game, with forced items where the world forces them
+    placement = {}
+
+    for region_locations in Data.get_scenario_catalog(character, scenario, difficulty)['region_locations'].values():
+        for loc in region_locations:
+            placement[stack_location_name(loc)] = loc.get('force_item') or loc.get('original_item') or None
+
+    placement['Victory'] = 'Victory'
+
+    return placement
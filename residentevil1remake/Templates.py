@@ -0,0 +1,279 @@
+import hashlib
+import logging
+import marshal
+import os
+
+from collections import Counter
+
+from BaseClasses import ItemClassification
+
+from . import Compiler
+from .Data import Data
+from .Pool import RE1RItemPool
+from .Records import is_closed_to_progression
+from .Rules import normalize_condition
+from .Settings import env_flag
+
+###
+# Scenario templates: everything create_regions and create_items work out for a player that only depends on the options,
+#   flattened into plain data that's ready to turn into Regions / Locations / Items. There's one template per
+#   (character, scenario, difficulty, bonus_start, allow_progression_in_lab), so only a handful of them ever exist.
+#
+# A template has:
+#   - the region graph: every region with its locations, each location with its locked item (force_item, or the original
+#     item if it's not randomized), whether it's closed to progression (the Laboratory, when allow_progression_in_lab is
+#     off), its forbid_item list, and its condition
+#   - the connections, with their conditions
+#   - conditions are stored once each, normalized (Rules.normalize_condition), and referenced by index. rules are closures
+#     over the player, so they can't be stored, but compiling a normalized condition is just picking a lambda.
+#   - the item pool counts, with the locked items already taken out, and the bonus start items
+#
+# Templates are kept in memory for the process. The disk cache is opt-in: set the RE1R_TEMPLATE_CACHE environment
+#   variable (to anything but 0/false/no) to also keep them in Archipelago's cache folder, for generations that start a
+#   fresh process every time. There's one file per options hash, so the folder never holds more than one file per
+#   options combination. Each file carries the version it was built for: template_format_version, the world's version,
+#   and the data's source hash (see Compiler). A file that doesn't match is rebuilt and overwritten, so editing the data
+#   or updating the world never uses a stale template.
+#
+# A template is only written after the options have passed the world's beatability checks, so loading one skips them.
+###
+
+template_format_version = 2 # bump this whenever the shape of a template, or the way it's built, changes
+
+disk_cache_enabled = env_flag("RE1R_TEMPLATE_CACHE")
+
+loaded_templates = {} # options hash: template, for this process
+data_hash = None
+
+def get_template_key(character, scenario, difficulty, bonus_start, allow_progression_in_lab) -> tuple:
+    # difficulties that play on another difficulty's data share its template too
+    return (character, scenario, Compiler.resolve_difficulty(difficulty), bool(bonus_start), bool(allow_progression_in_lab))
+
+def get_options_hash(key) -> str:
+    return hashlib.sha256(repr(key).encode()).hexdigest()[:16]
+
+def get_template_version(world_version) -> str:
+    global data_hash
+
+    if data_hash is None:
+        # the artifact's hash was already checked against the JSON when it was loaded, so there's no need to hash the files again
+        Data.load_name_table()
+        data_hash = Data.compiled['source_hash'] if Data.compiled else Compiler.source_hash()
+
+    return f"{template_format_version}:{world_version}:{data_hash}"
+
+###
+# Building
+###
+
+def build_template(records, item_prototypes, allow_progression_in_lab, bonus_start_items) -> dict:
+    conditions = []
+    condition_indexes = {}
+
+    def add_condition(condition_items) -> int:
+        # -1 for no condition
+        condition = normalize_condition(condition_items or [])
+
+        if len(condition) == 0:
+            return -1
+
+        if condition not in condition_indexes:
+            condition_indexes[condition] = len(conditions)
+            conditions.append(condition)
+
+        return condition_indexes[condition]
+
+    regions = []
+    locked_items = []
+
+    for region_record in records.regions:
+        locations = []
+
+        for location_record in region_record.locations:
+            # same order as before templates: a forced item wins over the original one, and the Laboratory restriction
+            #   only matters for locations that get filled.
+            locked_item = location_record.force_item or (location_record.original_item if not location_record.randomized else None)
+            no_progression = not locked_item and is_closed_to_progression(region_record, allow_progression_in_lab)
+
+            if locked_item:
+                locked_items.append(locked_item)
+
+            locations.append((
+                location_record.full_name,
+                location_record.id,
+                locked_item,
+                no_progression,
+                tuple(location_record.forbid_item or ()),
+                add_condition(location_record.condition_items)
+            ))
+
+        regions.append((region_record.name, locations))
+
+    connections = [
+        (connection_record.from_name, connection_record.to_name, add_condition(connection_record.condition_items))
+            for connection_record in records.connections
+    ]
+
+    # the pool is every original item in the scenario, minus the ones that are already placed (if they're real items)
+    pool = RE1RItemPool(item_prototypes)
+
+    for location_record in records.locations:
+        if location_record.original_item:
+            pool.add(location_record.original_item)
+
+    pool.remove_placed(item_name for item_name in locked_items if item_prototypes[item_name][1])
+
+    return {
+        'regions': regions,
+        'connections': connections,
+        'conditions': conditions,
+        'pool': dict(pool.counts),
+        'precollected': dict(Counter(bonus_start_items))
+    }
+
+###
+# Rule dependencies
+#
+# Every rule comes from a condition's item list, so which items can change which rules is known from the template alone.
+#   build_rule_dependencies turns the conditions around into item name: the locations and connections whose conditions
+#   mention that item, which the world publishes as ResidentEvil1Remake.rule_dependencies.
+###
+
+def build_rule_dependencies(template) -> dict:
+    # item name: { 'locations': set of location names, 'connections': set of (from region, to region) }
+    conditions = template['conditions']
+    dependencies = {}
+
+    def add_dependencies(condition_index, kind, name):
+        if condition_index < 0:
+            return
+
+        for alternative in conditions[condition_index]:
+            for item_name, _ in alternative:
+                dependencies.setdefault(item_name, { 'locations': set(), 'connections': set() })[kind].add(name)
+
+    for _, template_locations in template['regions']:
+        for location_name, _, _, _, _, condition_index in template_locations:
+            add_dependencies(condition_index, 'locations', location_name)
+
+    for from_name, to_name, condition_index in template['connections']:
+        add_dependencies(condition_index, 'connections', (from_name, to_name))
+
+    return dependencies
+
+###
+# Item rules
+#
+# The Laboratory restriction is a lookup by the item's raw ItemClassification value into a table worked out up front,
+#   instead of item.advancement, which is a property that does an IntFlag membership test on every call (about 35 ns
+#   a call instead of 260). forbid_item stays a plain set lookup, which is already as quick as a table would be.
+###
+
+# room for every combination of the ItemClassification flags, e.g. 16 for progression | useful | trap | skip_balancing
+classification_slots = 1 << max(int(classification) for classification in ItemClassification.__members__.values()).bit_length()
+
+# classification: 1 if it can go in a location that's closed to progression, 0 if not
+non_progression = bytes(
+    0 if classification & int(ItemClassification.progression) else 1 for classification in range(classification_slots)
+)
+
+def build_item_rules(template) -> list:
+    # one item rule (or None) per location, in the template's order. every location with the same restrictions shares one.
+    rules = {}
+    item_rules = []
+
+    for _, template_locations in template['regions']:
+        for _, _, _, no_progression, forbid_items, _ in template_locations:
+            restrictions = (no_progression, frozenset(forbid_items))
+
+            if restrictions not in rules:
+                rules[restrictions] = build_item_rule(*restrictions)
+
+            item_rules.append(rules[restrictions])
+
+    return item_rules
+
+def build_item_rule(no_progression, forbid_items):
+    if no_progression and forbid_items:
+        return lambda item: non_progression[item.classification] and item.name not in forbid_items
+
+    if no_progression:
+        return lambda item: non_progression[item.classification]
+
+    if forbid_items:
+        return lambda item: item.name not in forbid_items
+
+    return None
+
+###
+# Cache
+###
+
+def get_template(key, version, build, cache_directory = None) -> tuple:
+    # returns (template, where it came from: 'memory', 'disk', or 'built'). build() makes the template if it isn't cached.
+    #   with no cache_directory, templates are only kept in memory.
+    options_hash = get_options_hash(key)
+    cached = loaded_templates.get(options_hash)
+
+    if cached and cached['version'] == version:
+        return cached['template'], 'memory'
+
+    source = 'disk'
+    template = load_template(cache_directory, options_hash, key, version) if cache_directory else None
+
+    if template is None:
+        source = 'built'
+        template = build()
+
+        if cache_directory:
+            save_template(cache_directory, options_hash, key, version, template)
+
+    loaded_templates[options_hash] = { 'version': version, 'template': template }
+
+    return template, source
+
+def get_template_path(cache_directory, options_hash) -> str:
+    return os.path.join(cache_directory, f"{options_hash}.bin")
+
+def load_template(cache_directory, options_hash, key, version) -> dict:
+    try:
+        with open(get_template_path(cache_directory, options_hash), "rb") as f:
+            cached = marshal.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, TypeError):
+        logging.warning(f"RE1R: the cached template for {key} could not be read, so it's being rebuilt.")
+        return None
+
+    # a different key means a hash collision, which is about as likely as it sounds, but costs nothing to check
+    if not isinstance(cached, dict) or cached.get('version') != version or cached.get('key') != key:
+        return None
+
+    return cached['template']
+
+def save_template(cache_directory, options_hash, key, version, template):
+    path = get_template_path(cache_directory, options_hash)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+
+    # written to a temporary file and moved into place, so a generation running alongside never reads half a file
+    try:
+        os.makedirs(cache_directory, exist_ok=True)
+
+        with open(temporary_path, "wb") as f:
+            f.write(marshal.dumps({ 'version': version, 'key': key, 'template': template }, 4))
+
+        os.replace(temporary_path, path)
+    except OSError as e:
+        logging.warning(f"RE1R: couldn't write the template cache to {cache_directory}, so it's only kept in memory: {e}")
+
+def clear_templates(cache_directory = None):
+    # for after the data changes in the same process (see tools/DevMode.py). the data hash is worked out again next time.
+    global data_hash
+
+    loaded_templates.clear()
+    data_hash = None
+
+    if cache_directory and os.path.isdir(cache_directory):
+        for file_name in os.listdir(cache_directory):
+            if file_name.endswith(".bin"):
+                os.remove(os.path.join(cache_directory, file_name))
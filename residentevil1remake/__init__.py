@@ -1,21 +1,33 @@
+import logging
 import re
+import time
 import typing
 
+from collections import Counter
+
 from typing import Dict, Any, TextIO
-from Utils import visualize_regions
 
 from BaseClasses import ItemClassification, Item, Location, Region, CollectionState
+from Fill import fill_restrictive
+from Utils import cache_path
 from worlds.AutoWorld import World
 from ..generic.Rules import set_rule
-from Fill import fill_restrictive
 
+from .Analysis import get_required_items
 from .Data import Data
-from .Exceptions import RE1ROptionError
+from .Exceptions import RE1ROptionError, RE1RGenerationError
+from .FastFill import fill_solo, get_reachable, enabled as fast_fill_enabled, validate as fast_fill_validate
+from .Instrumentation import timed_stage, write_spoiler_report, count_location_records, count_regions, count_items, count_pre_fill
 from .Options import RE1ROptions
+from .Output import write_item_list
+from .Pool import RE1RItemPool, build_item_prototypes
+from .Rules import compile_condition, compile_normalized_condition
+from .Simulator import RE1RSimulator
+from .Templates import get_template, get_template_key, get_template_version, build_template, build_item_rules, build_rule_dependencies, disk_cache_enabled as template_disk_cache_enabled
 
 
-Data.load_data('chris')
-Data.load_data('jill')
+# only the id / name table is loaded up front. each character's full data is loaded the first time a world for that character is created.
+Data.load_name_table()
 
 
 class RE1RLocation(Location):
@@ -27,9 +39,6 @@ class RE1RLocation(Location):
 
         return RE1RLocation.stack_names(*area_names)
 
-    def is_item_forbidden(item, location_data, current_item_rule):
-        return current_item_rule(item) and ('forbid_item' not in location_data or item.name not in location_data['forbid_item'])
-
 
 class ResidentEvil1Remake(World):
     """
@@ -41,215 +50,200 @@ class ResidentEvil1Remake(World):
     required_client_version = (0, 5, 0)
     apworld_release_version = "0.1.0" # defined to show in spoiler log
 
-    item_id_to_name = { item['id']: item['name'] for item in Data.item_table }
-    item_name_to_id = { item['name']: item['id'] for item in Data.item_table }
-    item_name_to_item = { item['name']: item for item in Data.item_table }
-    location_id_to_name = { loc['id']: RE1RLocation.stack_names(loc['region'], loc['name']) for loc in Data.location_table }
-    location_name_to_id = { RE1RLocation.stack_names(loc['region'], loc['name']): loc['id'] for loc in Data.location_table }
-    location_name_to_location = { RE1RLocation.stack_names(loc['region'], loc['name']): loc for loc in Data.location_table }
-    source_locations = {} # this is used to seed the initial item pool from original items, and is indexed by player as lname:loc locations
+    item_id_to_name = { id: name for id, name, _, _ in Data.name_table['items'] }
+    item_name_to_id = { name: id for id, name, _, _ in Data.name_table['items'] }
+    item_name_to_item = { name: { 'id': id, 'name': name, 'type': type, 'progression': progression } for id, name, type, progression in Data.name_table['items'] }
+    item_prototypes = build_item_prototypes(item_name_to_item) # name: (classification, id)
+    progression_item_names = frozenset(
+        name for name, (classification, _) in item_prototypes.items() if classification & ItemClassification.progression
+    )
+    location_id_to_name = { id: name for id, name in Data.name_table['locations'] }
+    location_name_to_id = { name: id for id, name in Data.name_table['locations'] }
 
     # de-dupe the item names for the item group name
-    item_name_groups = { key: set(values) for key, values in Data.item_name_groups.items() }
+    item_name_groups = { key: set(values) for key, values in Data.name_table['item_name_groups'].items() }
+
+    # Chris' early weapon goes on the Main Hall floor, where his Handgun usually is, and is one of these.
+    #   this is the location's name in the data. the full name depends on the scenario, see _get_early_weapon_location.
+    early_weapon_location = "MH - Main Hall Floor"
+    early_weapons = ['Handgun', 'Broken Shotgun', 'Magnum Revolver']
+
+    # starting items for the bonus start option, as item name: count
+    bonus_start_items = { 'First Aid Spray': 3, 'Handgun Magazine': 4, 'Dagger': 3, 'Old Key': 1 }
+
+    # see Templates. off unless RE1R_TEMPLATE_CACHE is set. with this off, templates are still built once per process,
+    #   just never written to disk.
+    use_template_cache = template_disk_cache_enabled
+
+    # solo seeds can be filled with the Simulator instead of Archipelago's fill, see FastFill and stage_fill_hook
+    fast_solo_fill = fast_fill_enabled
+    validate_fast_fill = fast_fill_validate
+
+    # players on the same options share one build of their scenario, see stage_assert_generate. with this off (or when
+    #   the stage doesn't run), each player gets their own, which still reuses the process' template.
+    share_builds = True
+    shared_build = None
 
     options_dataclass = RE1ROptions
     options: RE1ROptions
 
+    @classmethod
+    def stage_assert_generate(cls, multiworld):
+        # runs once, before any player's generate_early. RE1R players are grouped by the options their scenario depends on
+        #   (character, scenario, and difficulty, plus the two options the template's pool and item rules depend on), and
+        #   each group's read-only structures are built once, for every player in it to stamp their own regions and locations from.
+        if not cls.share_builds:
+            return
+
+        groups = {}
+
+        for world in multiworld.get_game_worlds(cls.game):
+            groups.setdefault(world._get_template_key(), []).append(world)
+
+        for worlds in groups.values():
+            shared_build = worlds[0]._build_shared()
+            shared_build['players'] = [world.player for world in worlds]
+
+            for world in worlds:
+                world.shared_build = shared_build
+
+    @timed_stage(count_location_records)
     def generate_early(self):
-        self.source_locations[self.player] = self._get_locations_for_scenario(self._get_character(), self._get_scenario()) # id:loc combo
-        self.source_locations[self.player] = { 
-            RE1RLocation.stack_names(l['region'], l['name']): { **l, 'id': i } 
-                for i, l in self.source_locations[self.player].items() 
-        } # turn it into name:loc instead
+        # the scenario's records are shared with every other player on the same scenario, see Records.
+        shared_build = self.shared_build or self._build_shared()
+        self.scenario_records = shared_build['scenario_records']
+
+        # the regions, locations, and pool this player's options build, see Templates. the beatability checks ran when it was built.
+        self.template = shared_build['template']
+        self.template_source = shared_build['template_source']
+        self.item_rules = shared_build['item_rules']
+        self.rule_dependencies = shared_build['rule_dependencies'] # item name: the locations and connections it can open
+        self.fast_fill_stats = {}
 
+        # the early_key_items option's items have to be in this player's pool for pre_fill to place them
+        missing_early_items = sorted(item_name for item_name in self.options.early_key_items.value if self.template['pool'].get(item_name, 0) == 0)
+
+        if len(missing_early_items) > 0:
+            raise RE1ROptionError(f"early_key_items has {', '.join(missing_early_items)}, which {self._get_character().capitalize()} doesn't have in their item pool. Remove them from early_key_items.")
+
+    @timed_stage(count_regions)
     def create_regions(self): # and create locations
-        scenario_locations = { l['id']: l for _, l in self.source_locations[self.player].items() }
-        scenario_regions = self._get_region_table_for_scenario(self._get_character(), self._get_scenario())
+        regions = {}
+        rule_cache = {} # identical conditions share one compiled rule
+        conditions = self.template['conditions']
+        item_rules = iter(self.item_rules)
 
-        regions = [
-            Region(region['name'], self.player, self.multiworld) 
-                for region in scenario_regions
-        ]
-        
-        for region in regions:
-            region.locations = [
-                RE1RLocation(self.player, RE1RLocation.stack_names_not_victory(region.name, location['name']), location['id'], region) 
-                    for _, location in scenario_locations.items() if location['region'] == region.name
-            ]
-            region_data = [scenario_region for scenario_region in scenario_regions if scenario_region['name'] == region.name][0]
-            
-            for location in region.locations:
-                location_data = scenario_locations[location.address]
-                
-                #maybe the code for giving chris an early weapon goes here??
-                    
-                # if location has an item that should be forced there, place that. for cases where the item to place differs from the original.
-                if 'force_item' in location_data and location_data['force_item']:
-                    location.place_locked_item(self.create_item(location_data['force_item']))
-                # if location is marked not rando'd, place its original item. 
-                # if/elif here allows force_item + randomized=0, since a forced item is technically not randomized, but don't need to trigger both.
-                elif 'randomized' in location_data and location_data['randomized'] == 0:
-                    location.place_locked_item(self.create_item(location_data["original_item"]))
-                # if location is not force_item'd or not not randomized, check for Labs progression option and apply
-                # since Labs progression option doesn't matter for force_item'd or not randomized locations
-                # we check for zone id > 3 because 3 is typically Sewers, and anything beyond that is Labs / endgame stuff
-                elif self._format_option_text(self.options.allow_progression_in_lab) == 'False' and region_data['zone_id'] > 3:
-                    location.item_rule = lambda item: not item.advancement
-                #end if
-  ######################################################################################################################################################################################################################              
-               # if self._format_option_text(self.options.early_weapon_for_chris) == 'True': not sure if this is done right so commented out for now
-                    # something that makes "MH - Main Hall Floor" location guaranteed to be one of the weapons available to chris
- ####################################################################################################################################################################################################
-                    
-                
-
-                if 'forbid_item' in location_data and location_data['forbid_item']:
-                    current_item_rule = location.item_rule or None
-
-                    if not current_item_rule:
-                        current_item_rule = lambda x: True
-
-                    location.item_rule = lambda item, loc_data=location_data, cur_rule=current_item_rule: RE1RLocation.is_item_forbidden(item, loc_data, cur_rule)
+        for region_name, template_locations in self.template['regions']:
+            region = Region(region_name, self.player, self.multiworld)
+            regions[region_name] = region
+
+            for location_name, location_id, locked_item, _, _, condition_index in template_locations:
+                location = RE1RLocation(self.player, location_name, location_id, region)
+                region.locations.append(location)
+
+                # force_item'd and not rando'd locations get their item placed. see Templates.build_template for which is which.
+                if locked_item:
+                    location.place_locked_item(self.create_item(locked_item))
+
+                # the Labs progression option and forbid_item, as one shared rule. see Templates.build_item_rules.
+                item_rule = next(item_rules)
+
+                if item_rule:
+                    location.item_rule = item_rule
 
                 # now, set rules for the location access
-                if "condition" in location_data and "items" in location_data["condition"]:
-                    set_rule(location, lambda state, loc=location, loc_data=location_data: self._has_items(state, loc_data["condition"].get("items", [])))
+                if condition_index >= 0:
+                    set_rule(location, compile_normalized_condition(conditions[condition_index], self.player, rule_cache))
 
             self.multiworld.regions.append(region)
-                
-        for connect in self._get_region_connection_table_for_scenario(self._get_character(), self._get_scenario()):
-            # skip connecting on a one-sided connection because this should not be reachable backwards (and should be reachable otherwise)
-            if 'limitation' in connect and connect['limitation'] in ['ONE_SIDED_DOOR']:
-                continue
 
-            from_name = connect['from'] if 'Menu' not in connect['from'] else 'Menu'
-            to_name = connect['to'] if 'Menu' not in connect['to'] else 'Menu'
+        # one-sided connections were already left out of the records, because they should not be reachable backwards (and should be reachable otherwise)
+        for from_name, to_name, condition_index in self.template['connections']:
+            ent = regions[from_name].connect(regions[to_name])
+            entrance_rule = compile_normalized_condition(conditions[condition_index] if condition_index >= 0 else (), self.player, rule_cache)
 
-            region_from = self.multiworld.get_region(from_name, self.player)
-            region_to = self.multiworld.get_region(to_name, self.player)
-            ent = region_from.connect(region_to)
-
-            if "condition" in connect and "items" in connect["condition"]:
-                set_rule(ent, lambda state, en=ent, conn=connect: self._has_items(state, conn["condition"].get("items", [])))
+            if entrance_rule:
+                set_rule(ent, entrance_rule)
 
         # Uncomment the below to see a connection of the regions (and their locations) for any scenarios you're testing.
+        # from Utils import visualize_regions
         # visualize_regions(self.multiworld.get_region("Menu", self.player), "region_uml")
 
         # Place victory and set the completion condition for having victory
         self.multiworld.get_location("Victory", self.player) \
             .place_locked_item(self.create_item("Victory"))
 
-        self.multiworld.completion_condition[self.player] = lambda state: self._has_items(state, ['Victory'])
+        self.multiworld.completion_condition[self.player] = compile_condition(['Victory'], self.player, rule_cache)
 
+    @timed_stage(count_items)
     def create_items(self):
-        scenario_locations = self.source_locations[self.player]
-
-        pool = [
-            self.create_item(item['name'] if item else None) for item in [
-                self.item_name_to_item[location['original_item']] if location.get('original_item') else None
-                    for _, location in scenario_locations.items()
-            ]
-        ]
-
-        pool = [item for item in pool if item is not None] # some of the locations might not have an original item, so might not create an item for the pool
+        pool = RE1RItemPool(self.item_prototypes)
+        self.item_pool = pool # kept for instrumentation
 
-        # remove any already-placed items from the pool (forced items, etc.)
-        for filled_location in self.multiworld.get_filled_locations(self.player):
-            if filled_location.item.code and filled_location.item in pool: # not id... not address... "code"
-                pool.remove(filled_location.item)
+        # the template's pool is every original item, with the already-placed ones (forced items, etc.) taken out
+        pool.counts.update(self.template['pool'])
 
-        # check the bonus start option and add some heal items and ammo packs as precollected / starting items
+        # with the bonus start option, the template has some heal items and ammo packs as precollected / starting items
         #Needs changed to be based on character, with Jill getting spray, ammo, dagger; Currently not implemented
         #and chris getting spray ammo, dagger, and an Old Key count_bangs repurposed into old key for chris
-        if self._format_option_text(self.options.bonus_start) == 'True':
-            count_spray = 3
-            count_ammo = 4
-            count_grenades = 3
-            count_bangs = 1
-
-            for x in range(count_spray): self.multiworld.push_precollected(self.create_item('First Aid Spray'))
-            for x in range(count_ammo): self.multiworld.push_precollected(self.create_item('Handgun Magazine'))
-            for x in range(count_grenades): self.multiworld.push_precollected(self.create_item('Dagger'))
-            for x in range(count_bangs): self.multiworld.push_precollected(self.create_item('Old Key'))
+        pool.precollected.update(self.template['precollected'])
 
+        for item in pool.create_items(self.player, pool.precollected):
+            self.multiworld.push_precollected(item)
 
         # if the number of unfilled locations exceeds the count of the pool, fill the remainder of the pool with extra maybe helpful items
-        missing_item_count = len(self.multiworld.get_unfilled_locations(self.player)) - len(pool)
-
-        if missing_item_count > 0:
-            for x in range(missing_item_count):
-                pool.append(self.create_item('Blue Herb'))
+        unfilled_location_count = len(self.multiworld.get_unfilled_locations(self.player))
+        pool.pad(unfilled_location_count, 'Blue Herb')
 
-        # Make any items that result in a really quick BK either early or local items, so the BK time is reduced
-        early_items = {}       
-        #early_items["Fuse - Main Hall"] = 1
-        #Possible items for this: Book of Curses, Dog whistle, Stone and Metal Object, Square crank 
-        #need to find which items cause BK to be sure
+        # items that result in a really quick BK (the early_key_items option) and Chris' early weapon get placed in pre_fill
 
-        for item_name, item_qty in early_items.items():
-            if item_qty > 0:
-                self.multiworld.early_items[self.player][item_name] = item_qty
+        # Check the item count against the location count, and remove items until they match.
+        # filler goes first, then the filler item and blue herbs, then handgun ammo. if that's still not enough, give up.
+        pool.trim(unfilled_location_count, [
+            pool.names_with_classification(ItemClassification.filler),
+            [self.get_filler_item_name(), "Blue Herb"],
+            ["Handgun Magazine"]
+        ])
 
-        local_items = {}       
-        #local_items["Fuse - Main Hall"] = len([i for i in pool if i.name == "Fuse - Main Hall"])
+        self.multiworld.itempool += pool.create_items(self.player)
 
-        for item_name, item_qty in local_items.items():
-            if item_qty > 0:
-                self.options.local_items.value.add(item_name)
+    @timed_stage(count_pre_fill)
+    def pre_fill(self):
+        # places Chris' early weapon and the early_key_items option's items in this player's own sphere 1, before the main fill.
+        # it works from a state with nothing but this player's starting items and only looks at this player's locations,
+        #   so it's cheap no matter how big the multiworld is, and the main fill never has to squeeze these in (or fail and retry).
+        self.pre_filled = []
+        self.pre_fill_fallbacks = []
+        state = CollectionState(self.multiworld)
 
-        # Check the item count against the location count, and remove items until they match
-        extra_items = len(pool) - len(self.multiworld.get_unfilled_locations(self.player))
+        if self._get_character() == 'chris' and self._format_option_text(self.options.early_weapon_for_chris) == 'True':
+            location = self.multiworld.get_location(self._get_early_weapon_location(), self.player)
+            weapon_names = sorted({ item.name for item in self.multiworld.itempool if item.player == self.player and item.name in self.early_weapons })
 
-        for _ in range(extra_items):
-            eligible_items = [i for i in pool if i.classification == ItemClassification.filler]
+            if not location.item and len(weapon_names) > 0:
+                self._fill_early(state, [location], [self.random.choice(weapon_names)])
 
-            if len(eligible_items) == 0:
-                eligible_items = [i for i in pool if i.name in [self.get_filler_item_name(), "Blue Herb"]]
+        early_item_names = sorted(self.options.early_key_items.value)
 
-            if len(eligible_items) == 0:
-                eligible_items = [i for i in pool if i.name in ["Handgun Magazine"]]
+        if len(early_item_names) > 0:
+            sphere_one_locations = [location for location in self.multiworld.get_unfilled_locations(self.player) if location.can_reach(state)]
+            self.random.shuffle(sphere_one_locations)
+            self._fill_early(state, sphere_one_locations, early_item_names)
 
-            if len(eligible_items) == 0: break # no items to remove to match, give up
+    @classmethod
+    def stage_fill_hook(cls, multiworld, progitempool, usefulitempool, filleritempool, fill_locations):
+        # runs inside Archipelago's main fill, right before it places anything. when this world is the only player, the
+        #   fast fill places everything itself, and leaves the main fill nothing to do. see FastFill.
+        world = multiworld.worlds.get(1)
 
-            pool.remove(eligible_items[0])
+        if not cls.fast_solo_fill or multiworld.players != 1 or not isinstance(world, cls) or len(multiworld.groups) > 0:
+            return
 
-        self.multiworld.itempool += pool
-       ##################################################### ###
-    #def generate_output(self, output_directory: str) -> None:
+        world._fast_fill(progitempool, usefulitempool, filleritempool, fill_locations)
 
-     #   char = str(self.options.character)
-        
-      #  if char == "Character(Jill)":
-       #     with open(os.path.join(output_directory,f"ItemListJillNormal"+ ".txt"), "w") as f:
-                
-        #        X = 0
-         #       while X<180:
-          #         
-                    
-           #       f.write(something +"\n"),
-            #      locval+=1
-            #at some point may change rest of this to add in enemy rando, door rando, and lock rando
-         #       f.write("ENEMYRANDODATA\n" + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n")
-          #      f.write("DOORRANDODATA\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n" + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n") 
-           #     f.write("-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n" + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n" + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"   + "-1\n" + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"  + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n" + "-1\n" + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"
-            #    + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"
-             #   + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n" +"LOCKRANDODATA\n")
-        
-        #else:
-         #   with open(os.path.join(output_directory,f"ItemListChrisNormal"+ ".txt"), "w") as f:
-          #      locval = 0
-
-           #     while locval<180:
-
-            #        f.write(str(locval) +"\n"),
-             #       locval+=1
-            #at some point may change rest of this to add in enemy rando, door rando, and lock rando
-              #  f.write("ENEMYRANDODATA\n" + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n")
-               # f.write("DOORRANDODATA\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n" + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n") 
-                #f.write("-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n" + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n" + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"   + "-1\n" + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"  + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n" + "-1\n" + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"
-              #  + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"
-               # + "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n"+ "-1\n" +"LOCKRANDODATA\n")
- 
+    @timed_stage()
+    def generate_output(self, output_directory: str) -> None:
+        write_item_list(self, output_directory)
 
     ##############
     #
@@ -261,22 +255,10 @@ class ResidentEvil1Remake(World):
 
     def create_item(self, item_name: str) -> Item:
         if not item_name: return
-        if not isinstance(item_name, str):
-            print(item_name) 
 
-        item = self.item_name_to_item[item_name]
+        classification, code = self.item_prototypes[item_name]
 
-        if item.get('progression', False):
-            classification = ItemClassification.progression
-        elif item.get('type', None) not in ['Lore', 'Trap']:
-            classification = ItemClassification.useful
-        elif item.get('type', None) == 'Trap':
-            classification = ItemClassification.trap
-        else: # it's Lore
-            classification = ItemClassification.filler
-
-        new_item = Item(item['name'], classification, item['id'], player=self.player)
-        return new_item
+        return Item(item_name, classification, code, player=self.player)
 
     def get_filler_item_name(self) -> str:
         return "Wooden Mount"
@@ -293,84 +275,194 @@ class ResidentEvil1Remake(World):
     
     def write_spoiler_header(self, spoiler_handle: TextIO):
         spoiler_handle.write(f"RE1R_AP_World version: {self.apworld_release_version}\n")
+        write_spoiler_report(self, spoiler_handle)
 
-    def _has_items(self, state: CollectionState, item_names: list) -> bool:
-        # if there are no item requirements, this location is open, they "have the items needed"
-        if len(item_names) == 0:
-            return True
-
-        # if the requirements are a single set of items, make it a list of a single set of items to support looping for multiple sets (below)
-        if len(item_names) > 0 and type(item_names[0]) is not list:
-            item_names = [item_names]
-
-        for set_of_requirements in item_names:
-            # if it requires all unique items, just do a state has all
-            if len(set(set_of_requirements)) == len(set_of_requirements):
-                if state.has_all(set_of_requirements, self.player):
-                    return True
-            # else, it requires some duplicates, so let's group them up and do some has w/ counts
-            else:
-                item_counts = {
-                    item_name: len([i for i in set_of_requirements if i == item_name]) for item_name in set_of_requirements # e.g., { Spare Key: 2 }
-                }
-                missing_an_item = False
-
-                for item_name, count in item_counts.items():
-                    if not state.has(item_name, self.player, count):
-                        missing_an_item = True
-
-                if missing_an_item:
-                    continue # didn't meet these requirements, so skip to the next set, if any
-                
-                # if we made it here, state has all the items and the quantities needed, return True
-                return True
-
-        # if we made it here, state didn't have enough to return True, so return False
-        return False
+    # the minimal sets of items that gate a location (any one set is enough), from the static analysis in Analysis.
+    # location_name is the name the location has in the multiworld, e.g. "Main Hall (J) - MH - Barry" or "Victory".
+    def required_items(self, location_name: str) -> list:
+        return get_required_items(self._get_scenario_analysis(), location_name)
 
-    def _format_option_text(self, option) -> str:
-        return re.sub(r'\w+\(', '', str(option)).rstrip(')')
-    
-    def _get_locations_for_scenario(self, character, scenario) -> dict:
-        locations_pool = {
-            loc['id']: loc for _, loc in self.location_name_to_location.items()
-                if loc['character'] == character and loc['scenario'] == scenario
+    # fast pre-checks against the static analysis, so option combinations that can never work fail here instead of in fill
+    def _check_options_are_beatable(self):
+        analysis = self._get_scenario_analysis()
+        regions_by_name = self.scenario_records.regions_by_name
+        available_items = Counter()
+        progression_count = 0
+        non_lab_location_count = 0
+
+        for location_record in self.scenario_records.locations:
+            item_name = location_record.force_item or location_record.original_item
+
+            if item_name:
+                available_items[item_name] += 1
+
+            if location_record.force_item or not location_record.randomized or location_record.region not in regions_by_name:
+                continue
+
+            if location_record.original_item and self.item_prototypes[location_record.original_item][0] & ItemClassification.progression:
+                progression_count += 1
+
+            if regions_by_name[location_record.region].zone_id <= 3:
+                non_lab_location_count += 1
+
+        if self._format_option_text(self.options.bonus_start) == 'True':
+            available_items.update(self.bonus_start_items)
+
+        victory_sets = analysis['locations'].get('Victory', [])
+
+        if not any(all(available_items[item_name] >= count for item_name, count in Counter(item_set).items()) for item_set in victory_sets):
+            raise RE1ROptionError(f"{self._get_character().capitalize()} on {self._get_difficulty().capitalize()} can't be completed, because the items needed for Victory aren't all in this scenario.")
+
+        if self._format_option_text(self.options.allow_progression_in_lab) == 'False' and progression_count > non_lab_location_count:
+            raise RE1ROptionError(f"There are {progression_count} progression items but only {non_lab_location_count} locations outside the Laboratory to put them in. Set allow_progression_in_lab to true.")
+
+    def _get_template_key(self) -> tuple:
+        return get_template_key(
+            self._get_character(), self._get_scenario(), self._get_difficulty(),
+            self._format_option_text(self.options.bonus_start) == 'True',
+            self._format_option_text(self.options.allow_progression_in_lab) == 'True'
+        )
+
+    def _build_shared(self) -> dict:
+        # everything this player's scenario needs that only depends on the options in _get_template_key, so it can be
+        #   shared by every player with the same ones. nothing in here can be changed by a player.
+        key = self._get_template_key()
+        bonus_start = self._format_option_text(self.options.bonus_start) == 'True'
+        allow_progression_in_lab = self._format_option_text(self.options.allow_progression_in_lab) == 'True'
+        self.scenario_records = Data.get_scenario_records(self._get_character(), self._get_scenario(), self._get_difficulty())
+
+        def build() -> dict:
+            self._check_options_are_beatable()
+
+            return build_template(
+                self.scenario_records, self.item_prototypes, allow_progression_in_lab,
+                self.bonus_start_items if bonus_start else {}
+            )
+
+        template, template_source = get_template(
+            key, get_template_version(self.apworld_release_version), build,
+            cache_path("re1r", "templates") if self.use_template_cache else None
+        )
+
+        return {
+            'key': key,
+            'players': [self.player],
+            'scenario_records': self.scenario_records,
+            'template': template,
+            'template_source': template_source,
+            'item_rules': build_item_rules(template),
+            'rule_dependencies': build_rule_dependencies(template)
         }
 
-        # if the player chose hard, take out any matching standard difficulty locations
-        if self._format_option_text(self.options.difficulty) == 'Hard':
-            for hard_loc in [loc for loc in locations_pool.values() if loc['difficulty'] == 'Hard']:
-                check_loc_region = re.sub(r'H\)$', ')', hard_loc['region']) # take the hard off the region name
-                check_loc_name = hard_loc['name']
+    def _fast_fill(self, progitempool, usefulitempool, filleritempool, fill_locations):
+        start = time.perf_counter()
+        simulator = RE1RSimulator(
+            Data.get_scenario_catalog(self._get_character(), self._get_scenario(), self._get_difficulty()), self.progression_item_names
+        )
+        start_counts = Counter(item.name for item in self.multiworld.precollected_items[self.player])
 
-                # if there's a standard location with matching name and region, it's obsoleted in hard, remove it
-                standard_locs = [id for id, loc in locations_pool.items() if loc['region'] == check_loc_region and loc['name'] == check_loc_name and loc['difficulty'] != 'hard']
+        placements = fill_solo(
+            simulator, self.random, fill_locations, progitempool, usefulitempool, filleritempool, self._get_placed_item_names(simulator), start_counts
+        )
 
-                if len(standard_locs) > 0:
-                    del locations_pool[standard_locs[0]]
+        if placements is None:
+            logging.info(f"RE1R: the fast fill couldn't place everything for {self.multiworld.get_player_name(self.player)}, so the regular fill is doing it.")
+            self.fast_fill_stats = { 'used': False }
+            return
 
-        # else, the player is still playing standard, take out all of the matching hard difficulty locations
-        else:
-            locations_pool = {
-                id: loc for id, loc in locations_pool.items() if loc['difficulty'] != 'hard'
-            }
+        for location, item in placements:
+            self.multiworld.push_item(location, item, collect=False)
 
-        # now that we've factored in hard swaps, remove any hard locations that were just there for removing unused standard ones
-        locations_pool = { id: loc for id, loc in locations_pool.items() if 'remove' not in loc }
-        
-        return locations_pool
+        progitempool.clear()
+        usefulitempool.clear()
+        filleritempool.clear()
+        fill_locations[:] = [location for location in fill_locations if not location.item]
+
+        self.fast_fill_stats = { 'used': True, 'placed': len(placements), 'ms': (time.perf_counter() - start) * 1000 }
+
+        if self.validate_fast_fill:
+            self._validate_fast_fill(simulator, start_counts)
+
+    def _validate_fast_fill(self, simulator, start_counts):
+        # the same sweep Archipelago's playthrough does (collect everything reachable, repeat), against what the simulator reaches
+        state = CollectionState(self.multiworld)
+        reached = set()
+
+        while True:
+            new_locations = [location for location in self.multiworld.get_reachable_locations(state, self.player) if location.name not in reached]
+
+            if len(new_locations) == 0:
+                break
+
+            for location in new_locations:
+                reached.add(location.name)
+
+                if location.item:
+                    state.collect(location.item, True, location)
+
+        simulator_reached = {
+            simulator.location_names[index] for index in get_reachable(simulator, start_counts, self._get_placed_item_names(simulator))
+        }
+
+        if simulator_reached != reached or not self.multiworld.can_beat_game(CollectionState(self.multiworld)):
+            raise RE1RGenerationError(
+                f"The fast fill's result didn't validate: the simulator reaches {len(simulator_reached)} locations and the playthrough reaches {len(reached)}"
+                + f" (only the simulator: {sorted(simulator_reached - reached)[:5]}, only the playthrough: {sorted(reached - simulator_reached)[:5]})."
+            )
+
+        self.fast_fill_stats['validated'] = True
+
+    def _get_placed_item_names(self, simulator) -> list:
+        # the item name at each of the simulator's locations, or None
+        locations_by_name = { location.name: location for location in self.multiworld.get_locations(self.player) }
 
-    def _get_region_table_for_scenario(self, character, scenario) -> list:
         return [
-            region for region in Data.region_table 
-                if region['character'] == character and region['scenario'] == scenario
+            locations_by_name[location_name].item.name if locations_by_name[location_name].item else None for location_name in simulator.location_names
         ]
+
+    def _fill_early(self, state: CollectionState, locations: list, item_names: list):
+        # takes one of each item name out of the item pool (for this player) and places them in locations. anything that
+        #   won't fit goes back in the pool, for the main fill to place like normal.
+        wanted = Counter(item_names)
+        items = []
+
+        for item in self.multiworld.itempool:
+            if item.player == self.player and wanted[item.name] > 0:
+                wanted[item.name] -= 1
+                items.append(item)
+
+        # generate_early already checked the option's items are in the pool, so this is only ones something else took out
+        #   (start_inventory_from_pool, or the early weapon)
+        for item_name in sorted(wanted.elements()):
+            logging.warning(f"Couldn't place {item_name} early for {self.multiworld.get_player_name(self.player)}, because it isn't in their item pool anymore.")
+            self.pre_fill_fallbacks.append(item_name)
+
+        for item in items:
+            self.multiworld.itempool.remove(item)
+
+        to_place = list(items)
+        fill_restrictive(self.multiworld, state, locations, items, single_player_placement=True, lock=True, allow_partial=True, name="RE1R Early Items")
+
+        self.pre_filled += [(item.name, item.location.name) for item in to_place if item.location]
+
+        # whatever's left in items didn't fit
+        for item in items:
+            logging.warning(f"Couldn't place {item.name} early for {self.multiworld.get_player_name(self.player)}, so it's going in the main fill.")
+            self.multiworld.itempool.append(item)
+            self.pre_fill_fallbacks.append(item.name)
+
+    def _get_early_weapon_location(self) -> str:
+        # the region names in the records carry the scenario's suffix, e.g. "Main Hall (C) - MH - Main Hall Floor"
+        return next(
+            location_record.full_name for location_record in self.scenario_records.locations
+                if location_record.name == self.early_weapon_location
+        )
+
+    def _format_option_text(self, option) -> str:
+        return re.sub(r'\w+\(', '', str(option)).rstrip(')')
     
-    def _get_region_connection_table_for_scenario(self, character, scenario) -> list:
-        return [
-            conn for conn in Data.region_connections_table
-                if conn['character'] == character and conn['scenario'] == scenario
-        ]
+    def _get_scenario_analysis(self) -> dict:
+        return Data.get_scenario_analysis(self._get_character(), self._get_scenario(), self._get_difficulty())
     
     def _get_character(self) -> str:
         return self._format_option_text(self.options.character).lower()
@@ -382,43 +474,16 @@ class ResidentEvil1Remake(World):
         return "a"; 
 
 
-    ##################################################################################################################
-    #Trying to set an option for the chris playthrough to guarantee an early gun since he doesn't start with one
-  #  def _get_earlywep(self) -> str:
-   #     if self._format_option_text(self.options.character).lower() =="chris"
-    #        return self._format_option_text(self.options.earlywep).lower()
-     #   else return None
-    ########################################################################################################################
     def _get_difficulty(self) -> str:
         return self._format_option_text(self.options.difficulty).lower()
 
 
-#######################################################################################################################################################################
- #    x = 0
- #   with open(os.path.join(f"ItemList{self._format_option_text(self.options.character)}Normal.txt", 'w') as f:    Need to put item list as integer??
-  #      while x<=180
-  #           
-  #  Need to write programming to automatically write the itemlist file for the randomizer (may be changed if randomizer is altered or new randomizer made)
-  #  Top may need rewritten file should have name "ItemListJillNormal.txt" for Jill and "ItemListChrisNormal.txt" for Chris
-  #################################################################################################################################################################  
-    def _replace_pool_item_with(self, pool, from_item_name, to_item_name) -> list:
-        items_to_remove = [item for item in pool if item.name == from_item_name]
-        count_of_new_items = len(items_to_remove)
-
-        for item in items_to_remove:
-            pool.remove(item)
-
-        for x in range(count_of_new_items):
-            pool.append(self.create_item(to_item_name))
-
-        return pool
-       
     # def _output_items_and_locations_as_text(self):
     #     my_locations = [
     #         {
     #             'id': loc.address,
     #             'name': loc.name,
-    #             'original_item': self.location_name_to_location[loc.name]['original_item'] if loc.name != "Victory" else "(Game Complete)"
+    #             'original_item': self.source_locations[self.player][loc.name]['original_item'] if loc.name != "Victory" else "(Game Complete)"
     #         } for loc in self.multiworld.get_locations() if loc.player == self.player
     #     ]
 
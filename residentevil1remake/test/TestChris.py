@@ -0,0 +1,37 @@
+import unittest
+
+from Options import OptionError
+
+from ..tools.Harness import generate
+from . import RE1RTestBase
+
+
+class TestChrisEarlyWeapon(RE1RTestBase):
+    # a Chris seed with early_weapon_for_chris on. WorldTestBase's own tests generate and fill it.
+    options = { "character": "chris", "early_weapon_for_chris": "true" }
+
+    def test_early_weapon(self):
+        location = self.multiworld.get_location("Main Hall (C) - MH - Main Hall Floor", self.player)
+
+        self.assertIsNotNone(location.item)
+        self.assertIn(location.item.name, self.world.early_weapons)
+
+
+class TestChrisDefaults(RE1RTestBase):
+    # early_weapon_for_chris is off by default, so existing YAMLs keep their seeds
+    options = { "character": "chris" }
+
+
+class TestEarlyKeyItems(RE1RTestBase):
+    options = { "character": "jill", "early_key_items": ["Dog Whistle", "Square Crank"] }
+
+    def test_placed_early(self):
+        self.assertEqual({ "Dog Whistle", "Square Crank" }, set(item_name for item_name, _ in self.world.pre_filled))
+        self.assertEqual([], self.world.pre_fill_fallbacks)
+
+
+class TestEarlyKeyItemsNotInPool(unittest.TestCase):
+    def test_other_characters_key(self):
+        # the Old Key is Chris only, so it can't be placed early for Jill
+        with self.assertRaises(OptionError):
+            generate([{ "character": "jill", "early_key_items": ["Old Key"] }], 1, "generate_early")
@@ -0,0 +1,107 @@
+import unittest
+
+from types import SimpleNamespace
+
+from .. import ResidentEvil1Remake
+from ..Client import RE1RContext, ReplayGameSource, build_item_translation
+from ..Data import Data
+from . import RE1RTestBase
+
+
+class TestItemTranslation(unittest.TestCase):
+    def test_world_ids_translate_to_own_items(self):
+        # every item the world can send a character comes back as that character's own itemval / decimal
+        for character in ["chris", "jill"]:
+            with self.subTest(character=character):
+                Data.ensure_loaded(character)
+                context = SimpleNamespace(item_translation=build_item_translation(character))
+
+                for item in Data.item_table:
+                    if item['character'] != character:
+                        continue
+
+                    expected = (
+                        item['itemval'] if item.get('itemval') is not None else -1,
+                        int(item['decimal'], 16) if item.get('decimal') else -1
+                    )
+                    item_id = ResidentEvil1Remake.item_name_to_id[item['name']]
+
+                    self.assertEqual(expected, RE1RContext.translate_item(context, item_id), item['name'])
+
+
+class TestChrisItemTranslation(RE1RTestBase):
+    options = { "character": "chris" }
+
+    def test_placed_items_translate(self):
+        # the items in a generated Chris seed, by the ids they'd be sent with
+        context = SimpleNamespace(item_translation=build_item_translation("chris"))
+        chris_items = { item['name']: item for item in Data.item_table if item['character'] == "chris" }
+
+        for item in self.multiworld.itempool:
+            if item.code is None or item.name not in chris_items or chris_items[item.name].get('itemval') is None:
+                continue
+
+            self.assertEqual(chris_items[item.name]['itemval'], RE1RContext.translate_item(context, item.code)[0], item.name)
+
+
+class TestReconnects(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.context = RE1RContext(None, None, ReplayGameSource("unused.jsonl"))
+        self.context.location_translation = { 'by_locval': {}, 'by_name': { "A": 1, "B": 2, "C": 3 } }
+        self.sent = []
+
+    def connect(self, failures = 0):
+        # a server that's up, and a send_msgs that fails the first few times
+        async def send_msgs(msgs):
+            if len(self.sent) < failures:
+                self.sent.append(None)
+                raise ConnectionError("connection lost")
+
+            self.sent.append(msgs)
+
+        self.context.server = SimpleNamespace(socket=SimpleNamespace(closed=False))
+        self.context.send_msgs = send_msgs
+
+    async def test_checks_wait_for_a_connection(self):
+        self.context.queue_checks(["A", "B"])
+        await self.context.flush_checks(force=True)
+
+        self.assertEqual({ 1, 2 }, self.context.pending_checks)
+        self.assertEqual(set(), self.context.locations_checked)
+
+        self.connect()
+        await self.context.flush_checks(force=True)
+
+        self.assertEqual([[{ "cmd": "LocationChecks", "locations": [1, 2] }]], self.sent)
+        self.assertEqual({ 1, 2 }, self.context.locations_checked)
+        self.assertEqual(set(), self.context.pending_checks)
+
+    async def test_failed_send_is_retried(self):
+        self.connect(failures=1)
+        self.context.queue_checks(["A", "B"])
+        await self.context.flush_checks(force=True)
+
+        self.assertEqual({ 1, 2 }, self.context.pending_checks)
+        self.assertEqual(set(), self.context.locations_checked)
+
+        self.context.queue_checks(["B", "C"])
+        await self.context.flush_checks(force=True)
+
+        self.assertEqual([{ "cmd": "LocationChecks", "locations": [1, 2, 3] }], self.sent[-1])
+        self.assertEqual({ 1, 2, 3 }, self.context.locations_checked)
+        self.assertEqual(set(), self.context.pending_checks)
+
+    def test_reconnect_keeps_items_given(self):
+        connected = { "slot_data": { "character": "jill", "difficulty": "normal" } }
+        self.context.seed_name, self.context.slot = "seed", 1
+        self.context.on_package("Connected", connected)
+        self.context.items_given = 3
+
+        # the same slot again, after a reconnect
+        self.context.on_package("Connected", connected)
+        self.assertEqual(3, self.context.items_given)
+
+        # a different slot starts over
+        self.context.slot = 2
+        self.context.on_package("Connected", connected)
+        self.assertEqual(0, self.context.items_given)
@@ -0,0 +1,83 @@
+import marshal
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from ..Compiler import compiled_file_name, load_raw_data_file, source_hash, load_character_files, compile_character, build_scenario_catalog
+
+# builds the artifact in a fresh interpreter, so each build gets its own hash seed (and set / dict order)
+build_script = "import sys; from worlds.residentevil1remake.Compiler import write_artifact; write_artifact(sys.argv[1])"
+
+
+class TestCompiledArtifact(unittest.TestCase):
+    def build(self, output_directory, hash_seed) -> bytes:
+        output_path = os.path.join(output_directory, f"compiled_{hash_seed}.bin")
+        environment = { **os.environ, "PYTHONHASHSEED": str(hash_seed) }
+
+        subprocess.run([sys.executable, "-c", build_script, output_path], check=True, env=environment)
+
+        with open(output_path, "rb") as f:
+            return f.read()
+
+    def test_builds_are_reproducible(self):
+        with tempfile.TemporaryDirectory() as output_directory:
+            first = self.build(output_directory, 1)
+            second = self.build(output_directory, 2)
+
+        self.assertEqual(first, second, "two builds from the same sources came out different")
+
+    def test_artifact_is_current(self):
+        # compared by content, not bytes, since marshal's output can differ between Python versions
+        committed = marshal.loads(load_raw_data_file(compiled_file_name))
+
+        self.assertEqual(source_hash(), committed['source_hash'],
+                         f"data/{compiled_file_name} was built from other sources, rebuild it (see Compiler)")
+
+        with tempfile.TemporaryDirectory() as output_directory:
+            built = marshal.loads(self.build(output_directory, 1))
+
+        self.assertEqual(built, committed, f"data/{compiled_file_name} doesn't match the sources, rebuild it (see Compiler)")
+
+
+class TestDifficultyOverlays(unittest.TestCase):
+    def build_catalogs(self, hard_locations) -> dict:
+        raw = load_character_files('jill')
+        raw['locations_hardcore.json'] = hard_locations
+        tables = compile_character('jill', raw)
+
+        return { difficulty: build_scenario_catalog(tables, 'jill', 'a', difficulty) for difficulty in ['normal', 'hard'] }
+
+    def test_no_hard_file_plays_on_normal(self):
+        catalogs = self.build_catalogs([])
+
+        self.assertEqual(catalogs['normal']['locations'].keys(), catalogs['hard']['locations'].keys())
+        self.assertEqual(catalogs['normal']['regions'].keys(), catalogs['hard']['regions'].keys())
+
+    def test_hard_file_replaces_standard_locations(self):
+        standard = load_character_files('jill')['locations.json']
+        replaced, removed = standard[0], standard[2]
+        catalogs = self.build_catalogs([
+            { **replaced, 'original_item': 'Blue Herb' },
+            { 'name': removed['name'], 'region': removed['region'], 'remove': True }
+        ])
+        normal, hard = catalogs['normal'], catalogs['hard']
+
+        def names(catalog) -> set:
+            return set((loc['region'], loc['name']) for loc in catalog['locations'].values())
+
+        self.assertNotEqual(names(normal), names(hard))
+        self.assertIn((replaced['region'] + ' (J)', replaced['name']), names(normal))
+        self.assertIn((removed['region'] + ' (J)', removed['name']), names(normal))
+
+        # the replacement is in the hard copy of its region, and neither standard location is left
+        self.assertIn((replaced['region'] + ' (JH)', replaced['name']), names(hard))
+        self.assertNotIn((replaced['region'] + ' (J)', replaced['name']), names(hard))
+        self.assertNotIn((removed['region'] + ' (J)', removed['name']), names(hard))
+        self.assertEqual(len(normal['locations']) - 1, len(hard['locations']))
+
+        # the hard regions are connected like their standard ones, and only hard has them
+        self.assertIn(replaced['region'] + ' (JH)', hard['regions'])
+        self.assertNotIn(replaced['region'] + ' (JH)', normal['regions'])
+        self.assertTrue(any(conn['to'] == replaced['region'] + ' (JH)' for conn in hard['connections']))
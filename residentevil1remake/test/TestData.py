@@ -0,0 +1,42 @@
+import copy
+import unittest
+
+from .. import Compiler
+from ..Data import Data
+from ..Exceptions import RE1RDataError
+
+
+class TestReloadCharacter(unittest.TestCase):
+    def setUp(self):
+        self.raw = Compiler.load_character_files('jill')
+        Data.ensure_loaded('jill')
+
+    def tearDown(self):
+        Data.reload_character('jill', self.raw)
+
+    def test_reload(self):
+        # a change that keeps every name is reloaded, and the records are rebuilt from it
+        raw = copy.deepcopy(self.raw)
+        raw['locations.json'][0]['original_item'] = 'Blue Herb'
+        Data.reload_character('jill', raw)
+
+        records = Data.get_scenario_records('jill', 'a', 'normal')
+        location = next(location for location in records.locations if location.name == raw['locations.json'][0]['name'])
+
+        self.assertEqual('Blue Herb', location.original_item)
+
+    def test_name_table_changes_are_refused(self):
+        renamed = copy.deepcopy(self.raw)
+        renamed['locations.json'][0]['name'] += ' (renamed)'
+        reclassified = copy.deepcopy(self.raw)
+        reclassified['items.json'][0]['progression'] = not reclassified['items.json'][0].get('progression')
+
+        for raw in [renamed, reclassified]:
+            with self.assertRaises(RE1RDataError):
+                Data.reload_character('jill', raw)
+
+        # and the loaded data is left as it was
+        location_names = { location['name'] for location in Data.location_table if location['character'] == 'jill' }
+
+        self.assertIn(self.raw['locations.json'][0]['name'], location_names)
+        self.assertNotIn(renamed['locations.json'][0]['name'], location_names)
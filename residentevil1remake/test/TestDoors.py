@@ -0,0 +1,95 @@
+import random
+import unittest
+
+from collections import Counter
+
+from ..Data import Data
+from ..Records import ConnectionRecord, LocationRecord, RegionRecord, ScenarioRecords
+from ..tools.Doors import get_available_items, get_required_regions, is_completable, shuffle_doors
+
+
+def get_progression_item_names() -> set:
+    return { name for _, name, _, progression in Data.load_name_table()['items'] if progression }
+
+
+def make_location(region_name, name, **fields) -> LocationRecord:
+    return LocationRecord(name=name, full_name=name, region=region_name, randomized=True, forbid_item=frozenset(), **fields)
+
+
+class TestCompletable(unittest.TestCase):
+    def test_unshuffled_layout(self):
+        progression_item_names = get_progression_item_names()
+
+        for character in ["chris", "jill"]:
+            with self.subTest(character=character):
+                records = Data.get_scenario_records(character, 'a', 'normal')
+                available_items = get_available_items(records, progression_item_names)
+
+                self.assertTrue(is_completable(records, records.connections, available_items, False))
+                self.assertTrue(is_completable(records, records.connections, available_items, True))
+
+    def test_keys_follow_item_rules(self):
+        # keys only go where the world's item rules would let the fill put them
+        progression_item_names = get_progression_item_names()
+
+        for character in ["chris", "jill"]:
+            with self.subTest(character=character):
+                records = Data.get_scenario_records(character, 'a', 'normal')
+                available_items = get_available_items(records, progression_item_names)
+
+                all_lab = records.replace(regions=tuple(region.replace(zone_id=99) for region in records.regions))
+                all_forbidden = records.replace(regions=tuple(
+                    region.replace(locations=tuple(
+                        location.replace(forbid_item=frozenset(progression_item_names)) for location in region.locations
+                    ))
+                    for region in records.regions
+                ))
+
+                self.assertFalse(is_completable(all_lab, records.connections, available_items, False))
+                self.assertTrue(is_completable(all_lab, records.connections, available_items, True))
+                self.assertFalse(is_completable(all_forbidden, records.connections, available_items, True))
+
+    def test_shuffled_layouts(self):
+        # shuffled layouts on the real records can be completed, and reach every room the unshuffled graph does
+        progression_item_names = get_progression_item_names()
+
+        for character in ["chris", "jill"]:
+            records = Data.get_scenario_records(character, 'a', 'normal')
+            available_items = get_available_items(records, progression_item_names)
+            required_regions = get_required_regions(records.connections)
+
+            for seed in range(10):
+                with self.subTest(character=character, seed=seed):
+                    connections, pairs, _ = shuffle_doors(records, random.Random(seed), progression_item_names)
+
+                    self.assertTrue(is_completable(records, connections, available_items, False))
+                    self.assertLessEqual(required_regions, get_required_regions(connections))
+
+                    # every door keeps its exit and its lock, and the rooms behind them are the same rooms, reshuffled
+                    self.assertEqual(
+                        Counter((connection.from_name, repr(connection.condition_items)) for connection in records.connections),
+                        Counter((connection.from_name, repr(connection.condition_items)) for connection in connections)
+                    )
+                    self.assertEqual(
+                        Counter(connection.to_name for connection in records.connections),
+                        Counter(connection.to_name for connection in connections)
+                    )
+
+    def test_tries_other_keys(self):
+        # one free location, and two keys that open something: the Yellow Key's room is a dead end, so the Red Key has to
+        #   go there. picking the Yellow Key first (it comes up first) shouldn't fail the layout.
+        records = ScenarioRecords(regions=(
+            RegionRecord(name='Menu', zone_id=0, locations=()),
+            RegionRecord(name='Hall', zone_id=1, locations=(make_location('Hall', 'Desk'),)),
+            RegionRecord(name='Closet', zone_id=1, locations=()),
+            RegionRecord(name='Exit', zone_id=1, locations=(make_location('Exit', 'Victory', force_item='Victory'),))
+        ))
+        connections = (
+            ConnectionRecord(from_name='Menu', to_name='Hall'),
+            ConnectionRecord(from_name='Hall', to_name='Closet', condition_items=['Yellow Key']),
+            ConnectionRecord(from_name='Hall', to_name='Exit', condition_items=['Red Key'])
+        )
+        available_items = { 'Yellow Key': 1, 'Red Key': 1 }
+
+        self.assertTrue(is_completable(records, connections, Counter(available_items)))
+        self.assertFalse(is_completable(records, connections, Counter({ 'Yellow Key': 1 })))
@@ -0,0 +1,100 @@
+from collections import Counter
+
+from BaseClasses import LocationProgressType
+from Fill import distribute_items_restrictive
+
+from .. import ResidentEvil1Remake
+from ..Simulator import build_simulator
+from ..tools.SimulatorCheck import compare_spheres, get_archipelago_spheres, get_placement, get_starting_items
+from . import RE1RTestBase
+
+
+class FastFillTests:
+    # the fast fill against Archipelago's own fill, on the same seeds. fast_solo_fill / validate_fast_fill are what
+    #   RE1R_FAST_FILL sets, see FastFill.
+    run_default_tests = False
+    seeds = [1, 2, 3]
+    priority_locations = []
+
+    def generate(self, seed, fast_solo_fill, validate_fast_fill = False):
+        modes = ResidentEvil1Remake.fast_solo_fill, ResidentEvil1Remake.validate_fast_fill
+        ResidentEvil1Remake.fast_solo_fill, ResidentEvil1Remake.validate_fast_fill = fast_solo_fill, validate_fast_fill
+
+        try:
+            self.world_setup(seed)
+
+            # Main.main does this for the priority_locations option, which world_setup doesn't
+            for location_name in self.priority_locations:
+                self.multiworld.get_location(location_name, self.player).progress_type = LocationProgressType.PRIORITY
+
+            distribute_items_restrictive(self.multiworld)
+        finally:
+            ResidentEvil1Remake.fast_solo_fill, ResidentEvil1Remake.validate_fast_fill = modes
+
+        return self.multiworld
+
+    def get_placed(self, multiworld) -> tuple:
+        # every location that got an item, and the items placed
+        locations = multiworld.get_locations(self.player)
+
+        return set(location.name for location in locations if location.item), Counter(location.item.name for location in locations if location.item)
+
+    def assert_same_spheres(self, multiworld):
+        # Archipelago's playthrough finds the same spheres as the simulator the fast fill works from, and they reach Victory
+        world = multiworld.worlds[self.player]
+        simulator = build_simulator(world._get_character(), world._get_scenario(), world._get_difficulty())
+        simulated = simulator.simulate(get_placement(multiworld, self.player), get_starting_items(multiworld, self.player))
+        archipelago = get_archipelago_spheres(multiworld, self.player)
+
+        self.assertEqual([], compare_spheres(simulated['spheres'], archipelago))
+        self.assertTrue(simulated['beatable'])
+
+    def test_same_seed(self):
+        for seed in self.seeds:
+            with self.subTest(seed=seed):
+                regular = self.generate(seed, False)
+
+                self.assertTrue(regular.can_beat_game())
+                self.assertTrue(regular.fulfills_accessibility())
+                regular_placed = self.get_placed(regular)
+
+                for validate_fast_fill in [False, True]:
+                    fast = self.generate(seed, True, validate_fast_fill)
+
+                    self.assertTrue(fast.worlds[self.player].fast_fill_stats.get('used'))
+                    self.assertEqual(0, len(fast.get_unfilled_locations(self.player)))
+                    self.assertTrue(fast.can_beat_game())
+                    self.assertTrue(fast.fulfills_accessibility())
+                    self.assertEqual(regular_placed, self.get_placed(fast))
+                    self.assert_same_spheres(fast)
+
+
+class TestJillFastFill(FastFillTests, RE1RTestBase):
+    options = { "character": "jill" }
+
+
+class TestChrisFastFill(FastFillTests, RE1RTestBase):
+    options = { "character": "chris" }
+
+
+class TestLabFastFill(FastFillTests, RE1RTestBase):
+    options = { "character": "chris", "allow_progression_in_lab": "true", "bonus_start": "true" }
+
+
+class TestPriorityFastFill(FastFillTests, RE1RTestBase):
+    options = { "character": "jill" }
+    priority_locations = [
+        "Small Library (J) - SL - Desk Opposite East Door",
+        "West Wing Outer Stairway (J) - WWOS - By Bird Cage",
+        "Northern Corridor (J) - NC - Cabinet near Western Entrance"
+    ]
+
+    def test_priority_locations_get_progression(self):
+        for seed in self.seeds:
+            with self.subTest(seed=seed):
+                fast = self.generate(seed, True)
+
+                self.assertTrue(fast.worlds[self.player].fast_fill_stats.get('used'))
+
+                for location_name in self.priority_locations:
+                    self.assertTrue(fast.get_location(location_name, self.player).item.advancement, location_name)
@@ -0,0 +1,33 @@
+import random
+import unittest
+
+from ..Data import Data
+from ..tools.Doors import get_available_items, is_completable
+from ..tools.Locks import get_character_keys, get_lock_sets, lock_values, solve_locks
+
+
+class TestLockSolver(unittest.TestCase):
+    def test_layouts_are_completable(self):
+        progression_item_names = { name for _, name, _, progression in Data.load_name_table()['items'] if progression }
+
+        for character in ["chris", "jill"]:
+            records = Data.get_scenario_records(character, 'a', 'normal')
+            available_items = get_available_items(records, progression_item_names)
+            lock_sets = get_lock_sets(records.connections)
+
+            for seed in range(10):
+                with self.subTest(character=character, seed=seed):
+                    connections, layout, _ = solve_locks(records, records.connections, random.Random(seed), available_items, character)
+
+                    self.assertTrue(is_completable(records, connections, available_items, False))
+
+                    # every set gets a key, and a different lock value from every other set
+                    self.assertEqual(lock_sets.keys(), layout.keys())
+                    self.assertEqual(len(layout), len(set(lock_values[key] for key in layout.values())))
+
+    def test_character_keys(self):
+        # the Old Key and the Lock Pick are the same lock value, so each character only gets their own
+        self.assertIn('Old Key', get_character_keys('chris'))
+        self.assertNotIn('Lock Pick', get_character_keys('chris'))
+        self.assertIn('Lock Pick', get_character_keys('jill'))
+        self.assertNotIn('Old Key', get_character_keys('jill'))
@@ -0,0 +1,87 @@
+import concurrent.futures
+import io
+import json
+import unittest
+
+from types import SimpleNamespace
+
+from ..tools.SeedService import SeedService, SeedServiceHandler, generate_seed
+
+
+def handle(service, method, path, body = None) -> tuple:
+    # runs one request through the handler, without a socket. returns (status, response).
+    contents = json.dumps(body).encode() if body is not None else b""
+    handler = SeedServiceHandler.__new__(SeedServiceHandler)
+    handler.server = SimpleNamespace(service=service, verbose=False)
+    handler.command, handler.path, handler.request_version = method, path, "HTTP/1.1"
+    handler.requestline = f"{method} {path} HTTP/1.1"
+    handler.client_address = ("localhost", 0)
+    handler.headers = { "Content-Length": str(len(contents)) }
+    handler.rfile = io.BytesIO(contents)
+    handler.wfile = io.BytesIO()
+
+    getattr(handler, f"do_{method}")()
+
+    head, _, response = handler.wfile.getvalue().partition(b"\r\n\r\n")
+
+    return int(head.split()[1]), json.loads(response)
+
+
+class TestGenerateSeed(unittest.TestCase):
+    # what a worker does for a request, run in this process
+    def test_generate(self):
+        for character, item_list_name in [("jill", "ItemListJillNormal.txt"), ("chris", "ItemListChrisNormal.txt")]:
+            with self.subTest(character=character):
+                result = generate_seed({ 'character': character }, 1)
+
+                self.assertNotIn('error', result, result.get('error'))
+                self.assertEqual(character, result['slot_data']['character'])
+                self.assertTrue(result['item_list']['file_name'].endswith(item_list_name))
+                self.assertTrue(len(result['item_list']['contents']) > 0)
+                self.assertIn("RE1R_AP_World version", result['spoiler'])
+                self.assertIn("Playthrough", result['spoiler'])
+
+
+class TestSeedServiceHandler(unittest.TestCase):
+    # the requests against a service that generates on a thread in this process. the end to end run, with the worker
+    #   processes and a real server, is the SeedService tool's burst mode.
+    def setUp(self):
+        self.service = SeedService(1, pool=concurrent.futures.ThreadPoolExecutor(1))
+
+    def tearDown(self):
+        self.service.close()
+
+    def test_generate(self):
+        status, response = handle(self.service, "POST", "/generate", { 'options': { 'character': "jill" }, 'seed': 1 })
+
+        self.assertEqual(200, status, response.get('error'))
+        self.assertEqual("generated", response['cache'])
+        self.assertEqual("jill", response['slot_data']['character'])
+
+        status, repeated = handle(self.service, "POST", "/generate", { 'options': { 'character': "jill", 'difficulty': "normal" }, 'seed': 1 })
+
+        self.assertEqual(200, status)
+        self.assertEqual("hit", repeated['cache'])
+        self.assertEqual(response['key'], repeated['key'])
+
+    def test_bad_requests(self):
+        status, response = handle(self.service, "POST", "/generate", { 'options': { 'character': "leon" } })
+
+        self.assertEqual(400, status)
+        self.assertIn("character", response['error'])
+
+        for seed in ["one", True, 1.5]:
+            status, response = handle(self.service, "POST", "/generate", { 'options': {}, 'seed': seed })
+
+            self.assertEqual(400, status)
+            self.assertIn("seed", response['error'])
+
+        self.assertEqual(404, handle(self.service, "GET", "/nowhere")[0])
+
+    def test_health_and_stats(self):
+        self.assertEqual((200, { 'ok': True }), handle(self.service, "GET", "/health"))
+
+        status, stats = handle(self.service, "GET", "/stats")
+
+        self.assertEqual(200, status)
+        self.assertEqual(0, stats['queue_depth'])
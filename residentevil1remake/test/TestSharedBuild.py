@@ -0,0 +1,68 @@
+import unittest
+
+from .. import ResidentEvil1Remake
+from ..tools.Harness import generate, is_beatable
+
+
+class TestSharedBuild(unittest.TestCase):
+    # three Jills on the same options, one on bonus_start, and a Chris, all in one multiworld
+    players_options = [
+        { 'character': 'jill' },
+        { 'character': 'jill' },
+        { 'character': 'jill', 'bonus_start': 'true' },
+        { 'character': 'chris' },
+        { 'character': 'jill' }
+    ]
+
+    def generate(self, share_builds, until = "create_items"):
+        setting = ResidentEvil1Remake.share_builds
+        ResidentEvil1Remake.share_builds = share_builds
+
+        try:
+            return generate(self.players_options, 1, until)
+        finally:
+            ResidentEvil1Remake.share_builds = setting
+
+    def test_groups(self):
+        multiworld = self.generate(True)
+        worlds = multiworld.worlds
+
+        # players on the same options get the same build, everyone else gets their own
+        self.assertIs(worlds[1].shared_build, worlds[2].shared_build)
+        self.assertIs(worlds[1].shared_build, worlds[5].shared_build)
+        self.assertEqual([1, 2, 5], worlds[1].shared_build['players'])
+        self.assertEqual([3], worlds[3].shared_build['players'])
+        self.assertEqual([4], worlds[4].shared_build['players'])
+        self.assertIsNot(worlds[1].shared_build, worlds[3].shared_build)
+        self.assertIsNot(worlds[1].shared_build, worlds[4].shared_build)
+
+        self.assertIs(worlds[1].template, worlds[2].template)
+        self.assertIs(worlds[1].item_rules, worlds[5].item_rules)
+        self.assertIs(worlds[1].scenario_records, worlds[3].scenario_records)
+        self.assertNotEqual(worlds[1].template['precollected'], worlds[3].template['precollected'])
+
+        # but every player still has their own regions and locations
+        for player in [2, 5]:
+            self.assertEqual(
+                [location.name for location in multiworld.get_locations(1)],
+                [location.name for location in multiworld.get_locations(player)]
+            )
+            self.assertTrue(all(location.player == player for location in multiworld.get_locations(player)))
+            self.assertIsNot(multiworld.get_region("Main Hall (J)", 1), multiworld.get_region("Main Hall (J)", player))
+
+    def test_same_as_unshared(self):
+        shared = self.generate(True)
+        unshared = self.generate(False)
+
+        for player in shared.player_ids:
+            with self.subTest(player=player):
+                self.assertIsNone(unshared.worlds[player].shared_build)
+                self.assertEqual(unshared.worlds[player].template, shared.worlds[player].template)
+                self.assertEqual(unshared.worlds[player].rule_dependencies, shared.worlds[player].rule_dependencies)
+                self.assertEqual(
+                    sorted(item.name for item in unshared.itempool if item.player == player),
+                    sorted(item.name for item in shared.itempool if item.player == player)
+                )
+
+    def test_beatable(self):
+        self.assertTrue(is_beatable(self.generate(True, "post_fill")))
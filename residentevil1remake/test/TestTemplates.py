@@ -0,0 +1,47 @@
+from . import RE1RTestBase
+
+
+class TestRuleDependencies(RE1RTestBase):
+    options = { "character": "jill" }
+    run_default_tests = False
+
+    def get_condition_item_names(self, condition_items) -> set:
+        if not condition_items:
+            return set()
+
+        alternatives = condition_items if isinstance(condition_items[0], list) else [condition_items]
+
+        # an empty alternative means the condition is always met, so nothing depends on it
+        if any(len(alternative) == 0 for alternative in alternatives):
+            return set()
+
+        return { item_name for alternative in alternatives for item_name in alternative }
+
+    def test_matches_the_records(self):
+        # every item in a location's or connection's condition, and nothing else, points back at it
+        expected = {}
+        records = self.world.scenario_records
+
+        for location_record in records.locations:
+            for item_name in self.get_condition_item_names(location_record.condition_items):
+                expected.setdefault(item_name, { 'locations': set(), 'connections': set() })['locations'].add(location_record.full_name)
+
+        for connection_record in records.connections:
+            for item_name in self.get_condition_item_names(connection_record.condition_items):
+                expected.setdefault(item_name, { 'locations': set(), 'connections': set() })['connections'].add(
+                    (connection_record.from_name, connection_record.to_name)
+                )
+
+        self.assertTrue(any(dependencies['connections'] for dependencies in expected.values()))
+        self.assertEqual(expected, self.world.rule_dependencies)
+
+    def test_dependencies_are_real_spots(self):
+        for item_name, dependencies in self.world.rule_dependencies.items():
+            with self.subTest(item=item_name):
+                self.assertIn(item_name, self.world.item_name_to_id)
+
+                for location_name in dependencies['locations']:
+                    self.multiworld.get_location(location_name, self.player)
+
+                for from_name, to_name in dependencies['connections']:
+                    self.multiworld.get_entrance(f"{from_name} -> {to_name}", self.player)
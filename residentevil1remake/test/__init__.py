@@ -0,0 +1,5 @@
+from test.bases import WorldTestBase
+
+
+class RE1RTestBase(WorldTestBase):
+    game = "Resident Evil 1 Remake"
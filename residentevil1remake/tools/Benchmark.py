@@ -0,0 +1,180 @@
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from .Harness import stages, get_option_combinations, format_options, make_multiworld, run_stage
+
+###
+# Generation benchmark: runs every generation stage, up to and including the full fill, for every combination of the swept
+#   options (see Harness.swept_options) at 1, 10, and 100 RE1R players, all in one local multiworld with no network.
+#
+# Each stage reports:
+#   - wall_ms: wall time, from a pass with tracemalloc off (tracing slows everything down a lot)
+#   - peak_kib: the most memory held during the stage, above what was held when it started
+#   - net_kib / net_blocks: memory and allocated blocks still held once the stage is done
+#
+# Results can be saved as JSON and compared against an earlier run, e.g. from before and after a change:
+#
+#   python -m worlds.residentevil1remake.tools.Benchmark --output before.json
+#   python -m worlds.residentevil1remake.tools.Benchmark --output after.json --compare before.json
+###
+
+default_player_counts = [1, 10, 100]
+
+def time_generation(players_options, seed) -> dict:
+    timings = {}
+
+    gc.collect()
+    start = time.perf_counter()
+    multiworld = make_multiworld(players_options, seed)
+    timings["setup"] = { "wall_ms": (time.perf_counter() - start) * 1000 }
+
+    for stage in stages:
+        start = time.perf_counter()
+        run_stage(multiworld, stage)
+        timings[stage] = { "wall_ms": (time.perf_counter() - start) * 1000 }
+
+    return timings
+
+def trace_generation(players_options, seed) -> dict:
+    memory = {}
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        multiworld = trace_stage(memory, "setup", make_multiworld, players_options, seed)
+
+        for stage in stages:
+            trace_stage(memory, stage, run_stage, multiworld, stage)
+    finally:
+        tracemalloc.stop()
+
+    return memory
+
+def trace_stage(memory, stage, function, *args):
+    tracemalloc.reset_peak()
+    start_bytes, _ = tracemalloc.get_traced_memory()
+    start_blocks = sys.getallocatedblocks()
+
+    result = function(*args)
+
+    end_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    memory[stage] = {
+        "peak_kib": (peak_bytes - start_bytes) / 1024,
+        "net_kib": (end_bytes - start_bytes) / 1024,
+        "net_blocks": sys.getallocatedblocks() - start_blocks
+    }
+
+    return result
+
+def run_benchmark(combinations, player_counts, seed, trace_memory = True) -> list:
+    results = []
+
+    for options in combinations:
+        for players in player_counts:
+            players_options = [options] * players
+
+            # a combination that can't generate is recorded and skipped, so one bad combination doesn't end the whole run
+            try:
+                stage_results = time_generation(players_options, seed)
+
+                if trace_memory:
+                    for stage, memory in trace_generation(players_options, seed).items():
+                        stage_results[stage].update(memory)
+            except Exception as e:
+                results.append({ "options": options, "players": players, "stages": {}, "error": f"{type(e).__name__}: {e}" })
+                print(f"{get_result_key(results[-1])}: failed with {results[-1]['error']}")
+                continue
+
+            results.append({ "options": options, "players": players, "stages": stage_results })
+            print_result(results[-1])
+
+    return results
+
+def get_result_key(result) -> str:
+    return f"{format_options(result['options'])} @ {result['players']}p"
+
+def print_result(result):
+    total_ms = sum(stage["wall_ms"] for stage in result["stages"].values())
+    print(f"{get_result_key(result)}: {total_ms:.1f} ms")
+
+    for stage, values in result["stages"].items():
+        line = f"  {stage:<16}{values['wall_ms']:10.1f} ms"
+
+        if "peak_kib" in values:
+            line += f"{values['peak_kib']:12.1f} KiB peak{values['net_kib']:12.1f} KiB net{values['net_blocks']:10} blocks"
+
+        print(line)
+
+def print_comparison(results, baseline):
+    # only wall time and peak memory, since those are what a regression shows up in
+    baseline_by_key = { get_result_key(result): result for result in baseline["results"] }
+
+    print(f"\nCompared to {baseline['meta'].get('label') or 'baseline'}:")
+
+    for result in results:
+        old_result = baseline_by_key.get(get_result_key(result))
+
+        if old_result is None:
+            continue
+
+        print(get_result_key(result))
+
+        for stage, values in result["stages"].items():
+            old_values = old_result["stages"].get(stage)
+
+            if old_values is None:
+                continue
+
+            line = f"  {stage:<16}{format_change(old_values['wall_ms'], values['wall_ms'], 'ms')}"
+
+            if "peak_kib" in values and "peak_kib" in old_values:
+                line += f"    {format_change(old_values['peak_kib'], values['peak_kib'], 'KiB peak')}"
+
+            print(line)
+
+def format_change(old_value, new_value, unit) -> str:
+    change = f"{(new_value - old_value) / old_value * 100:+6.1f}%" if old_value > 0 else "    n/a"
+
+    return f"{old_value:10.1f} -> {new_value:10.1f} {unit} ({change})"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RE1R generation, stage by stage.")
+    parser.add_argument("--players", type=int, nargs="+", default=default_player_counts, help="RE1R player counts to run")
+    parser.add_argument("--character", choices=["chris", "jill"], help="only run combinations with this character")
+    parser.add_argument("--difficulty", choices=["normal", "hard"], help="only run combinations with this difficulty")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass, for a quicker run")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--compare", help="compare the results to a JSON file from an earlier run")
+    parser.add_argument("--label", help="a name for this run in the JSON, like a commit hash")
+    args = parser.parse_args()
+
+    combinations = get_option_combinations(character=args.character, difficulty=args.difficulty)
+
+    results = run_benchmark(combinations, args.players, args.seed, trace_memory=not args.no_memory)
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(results, json.load(f))
+
+    if args.output:
+        meta = {
+            "label": args.label,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+        }
+
+        with open(args.output, "w") as f:
+            json.dump({ "meta": meta, "results": results }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
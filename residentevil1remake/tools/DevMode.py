@@ -0,0 +1,209 @@
+import argparse
+import json
+import os
+import time
+
+from .. import Compiler
+from ..Data import Data
+from ..Exceptions import RE1RDataError
+from .Doors import get_available_items, is_completable
+from ..Simulator import RE1RSimulator, get_original_placement
+
+###
+# Development mode for the data files: watches data/<character>/*.json and, whenever one is saved, reloads just that
+#   character and re-checks it, without restarting anything.
+#   - only the records that changed get validated again (the whole file is still checked for references, which is quick)
+#   - Data.reload_character swaps that character's tables in place, and drops the catalogs / analysis / records built from them
+#   - then a quick check: the records and analysis get rebuilt, the unrandomized game is played through with the Simulator,
+#     and the door check (Doors.is_completable) makes sure the fill can place every key. with --generate, it also does a
+#     full solo generation through the Harness, which needs Archipelago.
+#
+#   python -m worlds.residentevil1remake.tools.DevMode --character chris --difficulty normal
+#
+# A bad save (broken JSON, a record that fails validation) is reported and the last good data is kept.
+# A save that adds or renames an item or location, or changes an item's id, type, or progression, is refused too, since the
+#   world's id tables and item prototypes are built once at startup. Restart for those.
+# This works on the files in data/, not on a zipped .apworld. Rebuild data/compiled.bin when you're done (see Compiler).
+###
+
+data_directory = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+class CharacterWatch:
+    def __init__(self, character):
+        self.character = character
+        self.raw = Compiler.load_character_files(character) # validates everything, once
+        self.serialized = { file_name: serialize(records) for file_name, records in self.raw.items() }
+        self.mtimes = self.get_mtimes()
+        self.warnings = set(Compiler.check_references(character, self.raw))
+
+    def get_mtimes(self) -> dict:
+        mtimes = {}
+
+        for file_name in Compiler.data_files:
+            path = os.path.join(data_directory, self.character, file_name)
+            mtimes[file_name] = os.path.getmtime(path) if os.path.exists(path) else None
+
+        return mtimes
+
+    def poll(self) -> list:
+        # the files that changed on disk since the last poll
+        mtimes = self.get_mtimes()
+        changed = [file_name for file_name, mtime in mtimes.items() if mtime != self.mtimes.get(file_name)]
+        self.mtimes = mtimes
+
+        return changed
+
+    def apply(self, changed_files) -> dict:
+        # reads the changed files, validates the changed records, and reloads the character if they're good.
+        #   returns what happened, for report().
+        raw = dict(self.raw)
+        changed_records = 0
+        errors = []
+
+        for file_name in changed_files:
+            path = os.path.join(data_directory, self.character, file_name)
+
+            if not os.path.exists(path):
+                records = []
+            else:
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        records = json.load(f)
+                except ValueError as e:
+                    errors.append(f"data/{self.character}/{file_name}: could not parse: {e}")
+                    continue
+
+            if not isinstance(records, list):
+                errors.extend(Compiler.validate_file(self.character, file_name, records))
+                continue
+
+            serialized = serialize(records)
+            old_serialized = self.serialized.get(file_name, [])
+            indexes = [index for index, record in enumerate(serialized) if index >= len(old_serialized) or record != old_serialized[index]]
+
+            changed_records += len(indexes) + max(0, len(old_serialized) - len(serialized))
+            errors.extend(Compiler.validate_file(self.character, file_name, records, indexes))
+            raw[file_name] = records
+
+        if len(errors) > 0:
+            return { 'errors': errors }
+
+        start = time.perf_counter()
+
+        try:
+            Data.reload_character(self.character, raw)
+        except RE1RDataError as e:
+            return { 'errors': [str(e)] }
+
+        reload_seconds = time.perf_counter() - start
+
+        warnings = set(Compiler.check_references(self.character, raw))
+        new_warnings = sorted(warnings - self.warnings)
+
+        self.raw = raw
+        self.serialized.update({ file_name: serialize(records) for file_name, records in raw.items() if file_name in changed_files })
+        self.warnings = warnings
+
+        return { 'errors': [], 'changed_records': changed_records, 'reload_ms': reload_seconds * 1000, 'new_warnings': new_warnings }
+
+def serialize(records) -> list:
+    return [json.dumps(record, sort_keys=True) for record in records] if isinstance(records, list) else []
+
+def quick_check(character, difficulty) -> dict:
+    start = time.perf_counter()
+
+    records = Data.get_scenario_records(character, 'a', difficulty)
+    analysis = Data.get_scenario_analysis(character, 'a', difficulty)
+
+    # progression straight from the reloaded items, since the name table is from startup
+    progression_item_names = { item['name'] for item in Data.item_table if item['character'] == character and item.get('progression') }
+
+    simulator = RE1RSimulator(Data.get_scenario_catalog(character, 'a', difficulty), progression_item_names)
+    result = simulator.simulate(get_original_placement(character, 'a', difficulty))
+    completable = is_completable(records, records.connections, get_available_items(records, progression_item_names))
+
+    return {
+        'locations': len(records.locations),
+        'regions': len(records.regions),
+        'gated_spots': len(analysis['locations']),
+        'beatable': result['beatable'],
+        'unreachable': result['unreachable'],
+        'fill_can_place_keys': completable,
+        'check_ms': (time.perf_counter() - start) * 1000
+    }
+
+def full_generation(character, difficulty, seed) -> dict:
+    from .Harness import generate, is_beatable
+    from ..Templates import clear_templates
+
+    # the world's templates were built from the data before the reload
+    clear_templates()
+
+    start = time.perf_counter()
+    multiworld = generate([{ 'character': character, 'difficulty': difficulty }], seed)
+
+    return { 'beatable': is_beatable(multiworld), 'generate_ms': (time.perf_counter() - start) * 1000 }
+
+def report(character, difficulty, applied, args):
+    if applied['errors']:
+        print(f"[{character}] not reloaded, keeping the last good data:")
+
+        for error in applied['errors']:
+            print(f"  {error}")
+
+        return
+
+    check = quick_check(character, difficulty)
+
+    print(f"[{character}] {applied['changed_records']} changed records, reloaded in {applied['reload_ms']:.0f} ms, checked in {check['check_ms']:.0f} ms:")
+    print(f"  {check['regions']} regions, {check['locations']} locations, {check['gated_spots']} gated spots")
+    print(f"  original placement beatable: {check['beatable']}, unreachable: {len(check['unreachable'])}")
+
+    for location_name in check['unreachable'][:args.show]:
+        print(f"    {location_name}")
+
+    print(f"  fill can place every key: {check['fill_can_place_keys']}")
+
+    for warning in applied['new_warnings']:
+        print(f"  new warning: {warning}")
+
+    if args.generate:
+        try:
+            generated = full_generation(character, difficulty, args.seed)
+            print(f"  solo generation: beatable {generated['beatable']}, {generated['generate_ms']:.0f} ms")
+        except Exception as e:
+            print(f"  solo generation failed: {type(e).__name__}: {e}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch the RE1R data files and re-check a character on every save.")
+    parser.add_argument("--character", choices=Compiler.characters, nargs="+", default=Compiler.characters)
+    parser.add_argument("--difficulty", choices=Compiler.difficulties, default="normal")
+    parser.add_argument("--interval", type=float, default=0.2, help="seconds between checks of the files")
+    parser.add_argument("--generate", action="store_true", help="also run a full solo generation after each reload")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--show", type=int, default=10, help="how many unreachable locations to list")
+    args = parser.parse_args()
+
+    Data.load_name_table()
+    watches = [CharacterWatch(character) for character in args.character]
+
+    for watch in watches:
+        report(watch.character, args.difficulty, watch.apply([]), args)
+
+    print(f"Watching {data_directory} for {', '.join(args.character)}. Ctrl+C to stop.")
+
+    try:
+        while True:
+            time.sleep(args.interval)
+
+            for watch in watches:
+                changed_files = watch.poll()
+
+                if changed_files:
+                    report(watch.character, args.difficulty, watch.apply(changed_files), args)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
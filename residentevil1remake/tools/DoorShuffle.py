@@ -0,0 +1,81 @@
+import argparse
+import random
+import statistics
+import time
+
+from ..Data import Data
+from .Doors import shuffle_doors, try_shuffle, is_completable, get_required_regions, get_available_items
+
+###
+# Door shuffle report: shuffles the doors for a lot of seeds and reports how many attempts a layout takes, and how long
+#   the shuffle and the completability check each take per attempt. No multiworld is built, it's just Doors on the records.
+#
+#   python -m worlds.residentevil1remake.tools.DoorShuffle --seeds 1000 --character jill
+###
+
+def get_progression_item_names() -> set:
+    return { name for _, name, _, progression in Data.load_name_table()['items'] if progression }
+
+def time_attempts(records, seeds, progression_item_names) -> dict:
+    # times the two halves of an attempt separately, over the same seeds
+    fixed = [connection for connection in records.connections if connection.from_name == 'Menu']
+    doors = [connection for connection in records.connections if connection.from_name != 'Menu']
+    required_regions = get_required_regions(records.connections)
+    available_items = get_available_items(records, progression_item_names)
+
+    shuffle_seconds = []
+    check_seconds = []
+    dead_ends = 0
+
+    for seed in seeds:
+        start = time.perf_counter()
+        entrances = try_shuffle(fixed, doors, required_regions, random.Random(seed))
+        shuffle_seconds.append(time.perf_counter() - start)
+
+        if entrances is None:
+            dead_ends += 1
+            continue
+
+        connections = tuple(fixed) + tuple(door.replace(to_name=doors[entrance].to_name) for door, entrance in zip(doors, entrances))
+
+        start = time.perf_counter()
+        is_completable(records, connections, available_items)
+        check_seconds.append(time.perf_counter() - start)
+
+    return {
+        'dead_ends': dead_ends,
+        'shuffle_ms': statistics.mean(shuffle_seconds) * 1000,
+        'check_ms': statistics.mean(check_seconds) * 1000 if check_seconds else 0
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Report attempts and timings for the RE1R door shuffle.")
+    parser.add_argument("--seeds", type=int, default=1000)
+    parser.add_argument("--character", choices=["chris", "jill"], default=None, help="only this character, instead of both")
+    parser.add_argument("--difficulty", choices=["normal", "hard"], default="normal")
+    args = parser.parse_args()
+
+    progression_item_names = get_progression_item_names()
+
+    for character in [args.character] if args.character else ["chris", "jill"]:
+        records = Data.get_scenario_records(character, 'a', args.difficulty)
+        attempts = []
+        seconds = []
+
+        for seed in range(args.seeds):
+            start = time.perf_counter()
+            _, _, attempt = shuffle_doors(records, random.Random(seed), progression_item_names)
+            seconds.append(time.perf_counter() - start)
+            attempts.append(attempt)
+
+        attempt_timings = time_attempts(records, range(args.seeds), progression_item_names)
+
+        print(f"{character} on {args.difficulty}, {len(records.connections)} doors, {args.seeds} seeds:")
+        print(f"  attempts per seed:  mean {statistics.mean(attempts):.2f}, median {statistics.median(attempts)}, max {max(attempts)}")
+        print(f"  ms per seed:        mean {statistics.mean(seconds) * 1000:.2f}, max {max(seconds) * 1000:.2f}")
+        print(f"  ms per attempt:     shuffle {attempt_timings['shuffle_ms']:.2f}, check {attempt_timings['check_ms']:.2f}")
+        print(f"  dead ends:          {attempt_timings['dead_ends']} of {args.seeds} first attempts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+from collections import Counter
+
+from ..Analysis import condition_to_sets
+from ..Exceptions import RE1RGenerationError
+from ..Records import is_closed_to_progression
+
+###
+# Door shuffle on top of region_connections.json.
+#
+# Every connection is a door from one region (its exit side, where the lock is) into another (its entrance side).
+#   Shuffling keeps every exit, with its key condition, and gives it a different entrance, so the lock stays on the door
+#   it's on but the room behind it changes. The Menu connection and one-sided doors are left where they are (one-sided
+#   doors aren't in the world's graph at all, see Records.build_scenario_records).
+#
+# Layouts are built out from Menu one door at a time, keeping the set of regions reachable (with every item) up to date
+#   as each door is assigned. That way a layout that can't reach everything is thrown out the moment it runs out of open
+#   doors, instead of after building the whole graph and sweeping it. A finished layout then gets one check that the
+#   keys can actually be found in an order that opens everything (see is_completable), and that's the only full pass.
+#
+# This isn't an option, so it lives with the tools instead of the world. The randomizer's door order (a `doorval` per
+#   connection) isn't in the data, so there's no way to tell the game about a layout. Until it is, the shuffle is only used
+#   by tools/DoorShuffle, and is_completable by tools/DevMode and tools/LockSolver.
+###
+
+max_attempts = 1000
+
+def get_required_regions(connections) -> set:
+    # the regions reachable from Menu in the unshuffled graph, with every item. a shuffle has to reach all of these too.
+    outgoing = {}
+
+    for connection in connections:
+        outgoing.setdefault(connection.from_name, []).append(connection.to_name)
+
+    reached = { 'Menu' }
+    pending = ['Menu']
+
+    while len(pending) > 0:
+        for to_name in outgoing.get(pending.pop(), []):
+            if to_name not in reached:
+                reached.add(to_name)
+                pending.append(to_name)
+
+    return reached
+
+def shuffle_doors(records, random, progression_item_names, allow_progression_in_lab = False) -> tuple:
+    # returns (the shuffled connections, the (exit door, entrance door) pairs, the number of attempts it took)
+    fixed = [connection for connection in records.connections if connection.from_name == 'Menu']
+    doors = [connection for connection in records.connections if connection.from_name != 'Menu']
+    required_regions = get_required_regions(records.connections)
+    available_items = get_available_items(records, progression_item_names)
+
+    for attempt in range(1, max_attempts + 1):
+        entrances = try_shuffle(fixed, doors, required_regions, random)
+
+        if entrances is None:
+            continue
+
+        pairs = tuple((door, doors[entrance]) for door, entrance in zip(doors, entrances))
+        connections = tuple(fixed) + tuple(door.replace(to_name=entrance_door.to_name) for door, entrance_door in pairs)
+
+        if is_completable(records, connections, available_items, allow_progression_in_lab):
+            return connections, pairs, attempt
+
+    raise RE1RGenerationError(f"Couldn't find a door layout that reaches every room in {max_attempts} attempts.")
+
+def try_shuffle(fixed, doors, required_regions, random) -> list:
+    # returns the door whose entrance each door now leads to (as door indexes, in door order), or None if this attempt hit a dead end
+    exits_by_region = {}
+
+    for index, door in enumerate(doors):
+        exits_by_region.setdefault(door.from_name, []).append(index)
+
+    unassigned_entrances = list(range(len(doors))) # drawn from as doors are assigned
+    assigned = [None] * len(doors)
+
+    reached = set()
+    open_exits = []
+
+    def reach(region_name):
+        # adds a region to the reached set, along with everything its fixed connections lead to
+        pending = [region_name]
+
+        while len(pending) > 0:
+            name = pending.pop()
+
+            if name in reached:
+                continue
+
+            reached.add(name)
+            open_exits.extend(exits_by_region.get(name, []))
+            pending.extend(connection.to_name for connection in fixed if connection.from_name == name)
+
+    reach('Menu')
+
+    while len(open_exits) > 0:
+        exit_index = open_exits.pop(random.randrange(len(open_exits)))
+        unreached_required = required_regions - reached
+
+        # while there's still somewhere to get to, go somewhere new. prefer rooms that lead on, if this was the last open door.
+        if len(unreached_required) > 0:
+            candidates = [index for index, door in enumerate(unassigned_entrances) if doors[door].to_name in unreached_required]
+
+            if len(open_exits) == 0:
+                candidates = [index for index in candidates if doors[unassigned_entrances[index]].to_name in exits_by_region] or candidates
+        else:
+            candidates = range(len(unassigned_entrances))
+
+        if len(candidates) == 0:
+            return None
+
+        assigned[exit_index] = unassigned_entrances.pop(random.choice(candidates))
+        reach(doors[assigned[exit_index]].to_name)
+
+        # the incremental check: if there are no open doors left but there are still rooms to reach, this layout is done for
+        if len(open_exits) == 0 and len(required_regions - reached) > 0:
+            return None
+
+    # doors in rooms that were never required (and never reached) take whatever entrances are left
+    random.shuffle(unassigned_entrances)
+
+    for index in range(len(doors)):
+        if assigned[index] is None:
+            assigned[index] = unassigned_entrances.pop()
+
+    return assigned
+
+def get_available_items(records, progression_item_names) -> Counter:
+    # the progression items the fill gets to place, as name: count. locked items aren't in here, since they can only be
+    #   picked up where they're locked, which is_completable does as it reaches them.
+    return Counter(
+        location.original_item for location in records.locations
+            if location.randomized and not location.force_item and location.original_item in progression_item_names
+    )
+
+def is_completable(records, connections, available_items, allow_progression_in_lab = False) -> bool:
+    # a walk through the layout: collect the items at locked locations as they're reached, and put each missing key in a
+    #   free location that's reachable and would take it in the world (not the Laboratory when progression is kept out of
+    #   it, and not a location that forbids it), until Victory is reachable.
+    #   - a key can only go where it was reachable when it was needed. keys already placed get moved around to make room,
+    #     but never somewhere that was only reached after them.
+    #   - when more than one key would open something new, each one is tried in turn, so picking the wrong key first
+    #     (one that fills the last free location, say) doesn't fail a layout that another order would complete.
+    #   - reaching the same keys in a different order reaches the same rooms, so a set of keys that already failed isn't
+    #     tried again. that's exact except when forbid_item keeps some keys out of some locations, where it can miss an
+    #     order that would have worked.
+    #   like the shuffle, the walk itself is incremental: regions and locations only ever get added as the inventory grows.
+    outgoing = {}
+    door_sets = []
+
+    for connection in connections:
+        item_sets = condition_to_sets(connection.condition_items or [])
+        outgoing.setdefault(connection.from_name, []).append((connection.to_name, item_sets))
+        door_sets.append((connection, item_sets))
+
+    locations_by_region = {
+        region.name: [(location, condition_to_sets(location.condition_items or [])) for location in region.locations]
+            for region in records.regions
+    }
+    location_sets = [entry for entries in locations_by_region.values() for entry in entries]
+    closed_regions = set(region.name for region in records.regions if is_closed_to_progression(region, allow_progression_in_lab))
+
+    inventory = Counter()
+    reached = set()
+    blocked = [] # (region name, item sets) for locked doors out of reached regions
+    pending_locations = [] # (location, item sets) for locked locations in reached regions
+    reachable_locations = []
+    free_locations = [] # reachable locations the fill gets to put keys in, in the order they were reached
+    placed_items = {} # full_name: (the key placed there, how many free locations there were when it was needed)
+    failed = set() # inventories that couldn't be completed
+
+    def open_region(region_name):
+        pending = [region_name]
+
+        while len(pending) > 0:
+            name = pending.pop()
+
+            if name in reached:
+                continue
+
+            reached.add(name)
+            pending_locations.extend(locations_by_region.get(name, []))
+
+            for to_name, item_sets in outgoing.get(name, []):
+                if to_name not in reached:
+                    if meets_condition(item_sets, inventory):
+                        pending.append(to_name)
+                    else:
+                        blocked.append((to_name, item_sets))
+
+    def refresh() -> bool:
+        # re-checks only what's still locked. returns whether anything new was reached.
+        nonlocal blocked, pending_locations
+        changed = False
+
+        while True:
+            unlocked = [to_name for to_name, item_sets in blocked if to_name not in reached and meets_condition(item_sets, inventory)]
+
+            if len(unlocked) == 0:
+                break
+
+            blocked = [(to_name, item_sets) for to_name, item_sets in blocked if to_name not in reached and to_name not in unlocked]
+            changed = True
+
+            for to_name in unlocked:
+                open_region(to_name)
+
+        still_locked = []
+
+        for location, item_sets in pending_locations:
+            if meets_condition(item_sets, inventory):
+                reachable_locations.append(location)
+                changed = True
+
+                # locked items come for free
+                if location.force_item or not location.randomized:
+                    inventory[location.force_item or location.original_item] += 1
+                elif location.region not in closed_regions:
+                    free_locations.append(location)
+            else:
+                still_locked.append((location, item_sets))
+
+        pending_locations = still_locked
+
+        return changed
+
+    def place(item_name, limit, visited) -> bool:
+        # finds a free location for the key among the first limit free locations (the ones reachable when it was needed),
+        #   moving keys that are already placed if they can go somewhere else instead
+        for location in free_locations[:limit]:
+            if location.full_name in visited or item_name in location.forbid_item:
+                continue
+
+            visited.add(location.full_name)
+            placed_item, placed_limit = placed_items.get(location.full_name, (None, 0))
+
+            if placed_item is None or place(placed_item, placed_limit, visited):
+                placed_items[location.full_name] = (item_name, limit)
+                return True
+
+        return False
+
+    def search() -> bool:
+        nonlocal inventory, reached, blocked, pending_locations, reachable_locations, free_locations, placed_items
+
+        # picking up locked items can open more, so keep going until nothing changes
+        while refresh():
+            pass
+
+        if any(location.full_name == 'Victory' for location in reachable_locations):
+            return True
+
+        inventory_key = frozenset(inventory.items())
+
+        if inventory_key in failed:
+            return False
+
+        for missing_item in get_missing_items(door_sets, location_sets, reached, inventory, available_items):
+            saved = (Counter(inventory), set(reached), list(blocked), list(pending_locations), list(reachable_locations), list(free_locations), dict(placed_items))
+
+            if place(missing_item, len(free_locations), set()):
+                inventory[missing_item] += 1
+
+                if search():
+                    return True
+
+            inventory, reached, blocked, pending_locations, reachable_locations, free_locations, placed_items = saved
+
+        failed.add(inventory_key)
+
+        return False
+
+    open_region('Menu')
+
+    # with every key already in hand, is Victory even reachable? if not, there's no point searching for an order
+    inventory.update(available_items)
+
+    while refresh():
+        pass
+
+    if not any(location.full_name == 'Victory' for location in reachable_locations):
+        return False
+
+    inventory, reached, blocked, pending_locations, reachable_locations, free_locations = Counter(), set(), [], [], [], []
+    open_region('Menu')
+
+    return search()
+
+def get_missing_items(door_sets, location_sets, reached, inventory, available_items) -> list:
+    # every item that's part of opening a door or location on the edge of what's reachable, in the order they come up
+    edges = [item_sets for connection, item_sets in door_sets if connection.from_name in reached and connection.to_name not in reached]
+    edges.extend(item_sets for location, item_sets in location_sets if location.region in reached)
+    missing_items = []
+
+    for item_sets in edges:
+        for item_set in item_sets:
+            for item_name, copy in sorted(item_set):
+                if inventory[item_name] < copy <= available_items[item_name] and item_name not in missing_items:
+                    missing_items.append(item_name)
+
+    return missing_items
+
+def meets_condition(item_sets, inventory) -> bool:
+    return any(all(inventory[item_name] >= copy for item_name, copy in item_set) for item_set in item_sets)
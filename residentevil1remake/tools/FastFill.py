@@ -0,0 +1,60 @@
+import argparse
+import statistics
+import time
+
+from .. import ResidentEvil1Remake
+from .Harness import is_beatable, make_multiworld, run_stage, stages
+
+###
+# Fast fill comparison: runs the same solo seeds with Archipelago's fill, the fast solo fill, and the fast solo fill
+#   with validation (see FastFill), and times the fill stage. The fast fill places things differently, so placements
+#   aren't compared, only whether every seed comes out beatable, and how often the fast fill had to fall back.
+#
+#   python -m worlds.residentevil1remake.tools.FastFill --seeds 20 --character chris --allow-progression-in-lab
+###
+
+modes = { 'regular': (False, False), 'fast': (True, False), 'validated': (True, True) }
+
+def run_seed(options, seed, mode) -> tuple:
+    ResidentEvil1Remake.fast_solo_fill, ResidentEvil1Remake.validate_fast_fill = modes[mode]
+
+    try:
+        multiworld = make_multiworld([options], seed)
+
+        for stage in stages[:stages.index("pre_fill") + 1]:
+            run_stage(multiworld, stage)
+
+        start = time.perf_counter()
+        run_stage(multiworld, "fill")
+        fill_seconds = time.perf_counter() - start
+    finally:
+        ResidentEvil1Remake.fast_solo_fill, ResidentEvil1Remake.validate_fast_fill = modes['regular']
+
+    return fill_seconds, is_beatable(multiworld), multiworld.worlds[1].fast_fill_stats.get('used', False)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare solo fill times with Archipelago's fill and the RE1R fast solo fill.")
+    parser.add_argument("--seeds", type=int, default=20)
+    parser.add_argument("--character", choices=["chris", "jill"], default="jill")
+    parser.add_argument("--allow-progression-in-lab", action="store_true")
+    args = parser.parse_args()
+
+    options = {
+        'character': args.character,
+        'allow_progression_in_lab': 'true' if args.allow_progression_in_lab else 'false'
+    }
+
+    print(f"{'mode':>10}{'fill ms':>12}{'max ms':>10}{'beatable':>10}{'fast fills':>12}")
+
+    for mode in modes:
+        results = [run_seed(options, seed, mode) for seed in range(1, args.seeds + 1)]
+        fill_ms = [result[0] * 1000 for result in results]
+
+        print(
+            f"{mode:>10}{statistics.mean(fill_ms):>12.1f}{max(fill_ms):>10.1f}"
+            + f"{sum(result[1] for result in results):>7}/{len(results):<2}{sum(result[2] for result in results):>9}/{len(results):<2}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import itertools
+
+from argparse import Namespace
+from collections import Counter
+
+from BaseClasses import MultiWorld, CollectionState, LocationProgressType
+from Fill import distribute_items_restrictive
+from worlds.AutoWorld import call_all, call_stage
+from worlds.generic.Rules import exclusion_rules, locality_rules
+
+from .. import ResidentEvil1Remake
+
+###
+# A local MultiWorld harness for the RE1R tools. It runs the same steps as Archipelago's Main.main, in the same order,
+#   but in-process, with no YAML files, no output files, and no network, and lets the caller run (and time) one stage at a time.
+###
+
+# the options every combination tool sweeps over, as option name: values
+swept_options = {
+    'character': ['chris', 'jill'],
+    'difficulty': ['normal', 'hard'],
+    'bonus_start': ['false', 'true'],
+    'allow_progression_in_lab': ['false', 'true']
+}
+
+stages = ["generate_early", "create_regions", "create_items", "set_rules", "generate_basic", "pre_fill", "fill", "post_fill"]
+
+def get_option_combinations(**fixed_options) -> list:
+    # fixed_options limits the sweep, e.g. character="chris" for only Chris' combinations. None means "any".
+    combinations = [dict(zip(swept_options.keys(), values)) for values in itertools.product(*swept_options.values())]
+
+    return [
+        options for options in combinations
+            if all(value is None or options[option_name] == value for option_name, value in fixed_options.items())
+    ]
+
+def format_options(options) -> str:
+    return ", ".join(f"{option_name}={value}" for option_name, value in options.items())
+
+def make_multiworld(players_options: list, seed = None) -> MultiWorld:
+    # players_options is one dict of option name: value per RE1R player. anything left out gets its default.
+    players = len(players_options)
+    multiworld = MultiWorld(players)
+    multiworld.game = { player: ResidentEvil1Remake.game for player in range(1, players + 1) }
+    multiworld.player_name = { player: f"Player{player}" for player in range(1, players + 1) }
+    multiworld.set_seed(seed)
+
+    args = Namespace()
+
+    for option_name, option in ResidentEvil1Remake.options_dataclass.type_hints.items():
+        setattr(args, option_name, {
+            player: option.from_any(player_options.get(option_name, option.default))
+                for player, player_options in enumerate(players_options, 1)
+        })
+
+    multiworld.set_options(args)
+    multiworld.set_item_links()
+    multiworld.state = CollectionState(multiworld)
+
+    return multiworld
+
+def run_stage(multiworld, stage):
+    if stage == "set_rules":
+        call_all(multiworld, "set_rules")
+
+        for player in multiworld.player_ids:
+            options = multiworld.worlds[player].options
+            exclusion_rules(multiworld, player, options.exclude_locations.value)
+
+            # same as Main.main. the option takes any RE1R location name, so some might not be in this player's scenario.
+            for location_name in options.priority_locations.value - options.exclude_locations.value:
+                try:
+                    location = multiworld.get_location(location_name, player)
+                except KeyError:
+                    continue
+
+                if location.progress_type != LocationProgressType.EXCLUDED:
+                    location.progress_type = LocationProgressType.PRIORITY
+    elif stage == "generate_basic":
+        call_all(multiworld, "generate_basic")
+        remove_start_inventory_from_pool(multiworld)
+    elif stage == "pre_fill":
+        if multiworld.players > 1:
+            locality_rules(multiworld)
+        else:
+            multiworld.worlds[1].options.non_local_items.value = set()
+            multiworld.worlds[1].options.local_items.value = set()
+
+        call_all(multiworld, "pre_fill")
+    elif stage == "fill":
+        distribute_items_restrictive(multiworld)
+    elif stage == "generate_early":
+        # Main.main runs assert_generate as a stage only (no per-player call), right before generate_early
+        call_stage(multiworld, "assert_generate")
+        call_all(multiworld, "generate_early")
+        push_start_inventory(multiworld)
+    else:
+        call_all(multiworld, stage)
+
+def push_start_inventory(multiworld):
+    # like Main.main, every player starts with their start_inventory and start_inventory_from_pool right after generate_early
+    for player in multiworld.player_ids:
+        options = multiworld.worlds[player].options
+
+        for item_name, count in [*options.start_inventory.value.items(), *options.start_inventory_from_pool.value.items()]:
+            for _ in range(count):
+                multiworld.push_precollected(multiworld.create_item(item_name, player))
+
+def remove_start_inventory_from_pool(multiworld):
+    # and after generate_basic, the start_inventory_from_pool items come back out of the pool, with filler in their place
+    depletion = { player: Counter(multiworld.worlds[player].options.start_inventory_from_pool.value) for player in multiworld.player_ids }
+
+    if not any(depletion.values()):
+        return
+
+    fillers = []
+    items = []
+
+    for item in multiworld.itempool:
+        if depletion[item.player][item.name] > 0:
+            depletion[item.player][item.name] -= 1
+            fillers.append(multiworld.worlds[item.player].create_filler())
+        else:
+            items.append(item)
+
+    multiworld.itempool[:] = fillers + items
+
+def generate(players_options: list, seed = None, until = "post_fill") -> MultiWorld:
+    multiworld = make_multiworld(players_options, seed)
+
+    for stage in stages[:stages.index(until) + 1]:
+        run_stage(multiworld, stage)
+
+    return multiworld
+
+def is_beatable(multiworld) -> bool:
+    return multiworld.can_beat_game(CollectionState(multiworld))
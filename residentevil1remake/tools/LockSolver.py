@@ -0,0 +1,79 @@
+import argparse
+import random
+import statistics
+import time
+
+from ..Data import Data
+from .Doors import get_available_items, is_completable
+from .Locks import solve_locks, get_lock_sets, build_connections, disposable_keys
+
+###
+# Lock solver report: solves a lot of lock layouts and reports how long each takes and how much searching it needed. For
+#   comparison, it also runs the naive way on the same seeds (shuffle the keys, check the layout, start over if it fails)
+#   and reports how many tries that took. No multiworld is built, it's just Locks on the records.
+#
+#   python -m worlds.residentevil1remake.tools.LockSolver --layouts 5000 --character chris
+###
+
+def get_progression_item_names() -> set:
+    return { name for _, name, _, progression in Data.load_name_table()['items'] if progression }
+
+def shuffle_and_retry(records, random, available_items, disposable, max_tries = 1000) -> int:
+    # returns how many tries a completable layout took, or max_tries + 1 if none turned up
+    connections = records.connections
+    lock_sets = get_lock_sets(connections)
+    keys = list(lock_sets.keys())
+
+    for tries in range(1, max_tries + 1):
+        random.shuffle(keys)
+        layout = dict(zip(lock_sets.keys(), keys))
+
+        if is_completable(records, build_connections(connections, lock_sets, layout, disposable), available_items):
+            return tries
+
+    return max_tries + 1
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the RE1R lock solver over many layouts.")
+    parser.add_argument("--layouts", type=int, default=5000)
+    parser.add_argument("--character", choices=["chris", "jill"], default=None, help="only this character, instead of both")
+    parser.add_argument("--difficulty", choices=["normal", "hard"], default="normal")
+    parser.add_argument("--no-compare", action="store_true", help="skip the shuffle-and-retry comparison")
+    args = parser.parse_args()
+
+    progression_item_names = get_progression_item_names()
+
+    for character in [args.character] if args.character else ["chris", "jill"]:
+        records = Data.get_scenario_records(character, 'a', args.difficulty)
+        available_items = get_available_items(records, progression_item_names)
+        disposable = disposable_keys[character]
+
+        seconds = []
+        backtracks = []
+        rejected_layouts = 0
+        distinct_layouts = set()
+
+        for seed in range(args.layouts):
+            start = time.perf_counter()
+            _, layout, stats = solve_locks(records, records.connections, random.Random(seed), available_items, character)
+            seconds.append(time.perf_counter() - start)
+
+            backtracks.append(stats['backtracks'])
+            rejected_layouts += stats['rejected_layouts']
+            distinct_layouts.add(tuple(sorted(layout.items())))
+
+        print(f"{character} on {args.difficulty}, {len(get_lock_sets(records.connections))} lock sets, {args.layouts} layouts:")
+        print(f"  ms per layout:      mean {statistics.mean(seconds) * 1000:.2f}, median {statistics.median(seconds) * 1000:.2f}, max {max(seconds) * 1000:.2f}")
+        print(f"  total:              {sum(seconds):.2f} s")
+        print(f"  backtracks:         mean {statistics.mean(backtracks):.3f}, max {max(backtracks)}")
+        print(f"  rejected layouts:   {rejected_layouts}")
+        print(f"  distinct layouts:   {len(distinct_layouts)}")
+
+        if not args.no_compare:
+            tries = [shuffle_and_retry(records, random.Random(seed), available_items, disposable) for seed in range(args.layouts)]
+
+            print(f"  shuffle and retry:  mean {statistics.mean(tries):.2f} tries, max {max(tries)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+from .Doors import is_completable
+from ..Data import Data
+from ..Exceptions import RE1RGenerationError
+
+###
+# Lock randomization: changes which key opens which set of doors.
+#
+# A lock set is every door whose condition is exactly one of the keys below, grouped by that key (e.g. the 7 Armor Key doors).
+#   A layout gives every lock set a different key, so the doors in a set still all share one key, just not the one they
+#   used to. Doors with any other condition (Battery, cranks, the Emblem Key + Red Gemstone, ...) are left alone.
+#
+# Layouts come from a small constraint solver instead of shuffling and hoping the fill works out:
+#   - every lock set starts with every one of the character's keys as a candidate (see get_character_keys), and candidates
+#     are pruned up front:
+#       - disposable keys (Chris' Old Keys get used up) can only go on sets where the worst case is covered by the Old
+#         Keys in the scenario (see get_disposable_counts)
+#       - keys that never move (Jill's Lock Pick, the Armor Key from the Death Passage trap) can't go on a set that has to be
+#         opened to get to them
+#   - then keys are assigned one set at a time, fewest candidates first, and each assignment takes that key off every
+#     other set's candidates, so a dead end shows up as soon as one set runs out, not after the whole layout is built
+#   - a full layout gets the same completability walk as the door shuffle (Doors.is_completable), and backs up if it fails
+#
+# So the layout it returns is always completable, and generation never has to start over because of the locks.
+#
+# Like the door shuffle, this isn't an option, so it lives with the tools instead of the world. LOCKRANDODATA matches
+#   doors up by the randomizer's door order (a `doorval` per connection), which isn't in the data, so a layout can't be
+#   written out. Until it is, the solver is only used by tools/LockSolver (and its lock values by tools/Stats).
+###
+
+# the randomizer's lock values, from Ben Powell's lock value list. these are also the keys that can be moved around.
+#   the Old Key and the Lock Pick are the same lock, so only the one the character has is a candidate (see get_character_keys).
+lock_values = {
+    'Armor Key': 0,
+    'Control Room Key': 1,
+    'Gallery Key': 3,
+    'Helmet Key': 4,
+    'Old Key': 5, # chris
+    'Lock Pick': 5, # jill
+    'Power Room Key': 10,
+    'Key for Room 001': 11,
+    'Key for Room 003': 12,
+    'Shield Key': 13,
+    'Book of Curses - Sword Key': 14
+}
+
+# keys that get used up, by character. a door opened with one of these takes one copy with it.
+disposable_keys = {
+    'chris': { 'Old Key' },
+    'jill': set()
+}
+
+def get_character_keys(character) -> set:
+    # the keys in lock_values the character can be given, so every key the solver hands out is a different lock value.
+    #   where keys share a value (the Old Key and the Lock Pick), only the one in the character's items is kept.
+    Data.ensure_loaded(character)
+    item_names = { item['name'] for item in Data.item_table if item['character'] == character }
+    keys_by_value = {}
+
+    for key, value in lock_values.items():
+        keys_by_value.setdefault(value, []).append(key)
+
+    keys = set()
+
+    for value, value_keys in keys_by_value.items():
+        if len(value_keys) > 1:
+            value_keys = [key for key in value_keys if key in item_names]
+
+        if len(value_keys) > 1:
+            raise RE1RGenerationError(f"{character.capitalize()} has more than one key for lock value {value}: {sorted(value_keys)}")
+
+        keys.update(value_keys)
+
+    return keys
+
+def get_lock_sets(connections) -> dict:
+    # original key: indexes (into connections) of the doors it opens
+    lock_sets = {}
+
+    for index, connection in enumerate(connections):
+        condition_items = connection.condition_items or []
+
+        if len(condition_items) == 1 and isinstance(condition_items[0], str) and condition_items[0] in lock_values:
+            lock_sets.setdefault(condition_items[0], []).append(index)
+
+    return lock_sets
+
+def get_reached_regions(connections, closed_doors) -> set:
+    # every region reachable from Menu with every door open except closed_doors
+    outgoing = {}
+
+    for index, connection in enumerate(connections):
+        if index not in closed_doors:
+            outgoing.setdefault(connection.from_name, []).append(connection.to_name)
+
+    reached = { 'Menu' }
+    pending = ['Menu']
+
+    while len(pending) > 0:
+        for to_name in outgoing.get(pending.pop(), []):
+            if to_name not in reached:
+                reached.add(to_name)
+                pending.append(to_name)
+
+    return reached
+
+def get_disposable_counts(connections, door_indexes) -> dict:
+    # door index: how many copies of a disposable key it takes to be sure of opening it. that's one for this door, plus one
+    #   for every other door in its set that can be reached without going through this one, since the player might have
+    #   used a copy on each of those first.
+    counts = {}
+
+    for index in door_indexes:
+        reached = get_reached_regions(connections, { index })
+        counts[index] = 1 + sum(1 for other in door_indexes if other != index and connections[other].from_name in reached)
+
+    return counts
+
+def get_locked_keys(records) -> dict:
+    # key: the record of the location it's locked to, for keys that are always in the same place
+    return {
+        (location.force_item or location.original_item): location for location in records.locations
+            if (location.force_item or not location.randomized) and (location.force_item or location.original_item) in lock_values
+    }
+
+def can_reach_locked_location(records, connections, closed_doors, target, locked_items) -> bool:
+    # whether target can be reached with closed_doors shut and every other door open. locations that need an item that's
+    #   locked somewhere only count once that somewhere has been reached too.
+    reached = get_reached_regions(connections, closed_doors)
+    collected = set()
+    changed = True
+
+    while changed:
+        changed = False
+
+        for item_name, location in locked_items.items():
+            if item_name not in collected and location.region in reached and is_met(location.condition_items, locked_items, collected):
+                collected.add(item_name)
+                changed = True
+
+    return target.region in reached and is_met(target.condition_items, locked_items, collected)
+
+def is_met(condition_items, locked_items, collected) -> bool:
+    # randomized items are assumed to be findable, so only the locked ones are checked
+    if not condition_items:
+        return True
+
+    item_sets = condition_items if isinstance(condition_items[0], list) else [condition_items]
+
+    return any(all(item_name not in locked_items or item_name in collected for item_name in item_set) for item_set in item_sets)
+
+def get_candidates(records, connections, lock_sets, available_items, character_keys, disposable) -> dict:
+    # the pruned candidate keys for every lock set, as original key: list of keys
+    keys = [key for key in lock_sets.keys() if key in character_keys]
+    locked_keys = get_locked_keys(records)
+    locked_items = {
+        (location.force_item or location.original_item): location for location in records.locations
+            if location.force_item or not location.randomized
+    }
+    candidates = {}
+
+    for set_key, door_indexes in lock_sets.items():
+        set_candidates = []
+        disposable_counts = get_disposable_counts(connections, door_indexes)
+
+        for key in keys:
+            if key in disposable and max(disposable_counts.values()) > available_items[key]:
+                continue
+
+            if key in locked_keys and not can_reach_locked_location(records, connections, set(door_indexes), locked_keys[key], locked_items):
+                continue
+
+            set_candidates.append(key)
+
+        candidates[set_key] = set_candidates
+
+    return candidates
+
+def build_connections(connections, lock_sets, layout, disposable) -> tuple:
+    changed = {}
+
+    for set_key, door_indexes in lock_sets.items():
+        key = layout[set_key]
+        disposable_counts = get_disposable_counts(connections, door_indexes) if key in disposable else {}
+
+        for index in door_indexes:
+            changed[index] = connections[index].replace(condition_items=[key] * disposable_counts.get(index, 1))
+
+    return tuple(changed.get(index, connection) for index, connection in enumerate(connections))
+
+def solve_locks(records, connections, random, available_items, character, allow_progression_in_lab = False) -> tuple:
+    # returns (the connections with their new keys, the layout as original key: new key, stats)
+    disposable = disposable_keys[character]
+    lock_sets = get_lock_sets(connections)
+    candidates = get_candidates(records, connections, lock_sets, available_items, get_character_keys(character), disposable)
+    stats = { 'assignments': 0, 'backtracks': 0, 'rejected_layouts': 0 }
+
+    for set_candidates in candidates.values():
+        random.shuffle(set_candidates)
+
+    def search(layout, remaining):
+        if len(remaining) == 0:
+            solved_connections = build_connections(connections, lock_sets, layout, disposable)
+
+            if is_completable(records, solved_connections, available_items, allow_progression_in_lab):
+                return solved_connections
+
+            stats['rejected_layouts'] += 1
+            return None
+
+        used_keys = set(layout.values())
+        open_candidates = { set_key: [key for key in candidates[set_key] if key not in used_keys] for set_key in remaining }
+        set_key = min(remaining, key=lambda name: len(open_candidates[name]))
+
+        for key in open_candidates[set_key]:
+            stats['assignments'] += 1
+            layout[set_key] = key
+
+            # forward check: every other set still needs a key that isn't taken
+            if all(any(other_key != key for other_key in open_candidates[other]) for other in remaining if other != set_key):
+                solved_connections = search(layout, [other for other in remaining if other != set_key])
+
+                if solved_connections is not None:
+                    return solved_connections
+
+            del layout[set_key]
+            stats['backtracks'] += 1
+
+        return None
+
+    layout = {}
+    solved_connections = search(layout, list(lock_sets.keys()))
+
+    if solved_connections is None:
+        raise RE1RGenerationError("There's no lock layout that can be completed with these options.")
+
+    return solved_connections, layout, stats
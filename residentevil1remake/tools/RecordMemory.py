@@ -0,0 +1,62 @@
+import argparse
+import tracemalloc
+
+from ..Data import Data
+from ..Records import build_scenario_records
+
+###
+# Memory comparison for the per-player location data: the old way, where every player copied every location dict into
+#   source_locations under a freshly built stacked name, vs the shared Records, where every player holds a reference to
+#   the same ScenarioRecords.
+#
+#   python -m worlds.residentevil1remake.tools.RecordMemory --players 100
+#
+# This only covers the location data itself. For the whole generation at 100 players, see Benchmark.
+###
+
+def copy_per_player(catalog, players) -> list:
+    # what generate_early used to do for each player
+    return [
+        { ' - '.join([loc['region'], loc['name']]): { **loc, 'id': id } for id, loc in catalog['locations'].items() }
+            for _ in range(players)
+    ]
+
+def share_records(catalog, key, players) -> list:
+    records = build_scenario_records(catalog, key)
+
+    return [records for _ in range(players)]
+
+def measure(function, *args) -> int:
+    tracemalloc.start()
+
+    try:
+        result = function(*args)
+        used_bytes, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del result
+
+    return used_bytes
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-player location copies with shared location records.")
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--character", choices=["chris", "jill"], default="chris")
+    parser.add_argument("--difficulty", choices=["normal", "hard"], default="normal")
+    args = parser.parse_args()
+
+    # built outside of the measurements, since both ways start from it
+    catalog = Data.get_scenario_catalog(args.character, 'a', args.difficulty)
+
+    copied_bytes = measure(copy_per_player, catalog, args.players)
+    shared_bytes = measure(share_records, catalog, (args.character, 'a', args.difficulty), args.players)
+
+    print(f"{args.character} on {args.difficulty}, {len(catalog['locations'])} locations, {args.players} players:")
+    print(f"  copied per player:  {copied_bytes / 1024:10.1f} KiB")
+    print(f"  shared records:     {shared_bytes / 1024:10.1f} KiB")
+    print(f"  saved:              {(copied_bytes - shared_bytes) / 1024:10.1f} KiB ({copied_bytes / max(shared_bytes, 1):.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
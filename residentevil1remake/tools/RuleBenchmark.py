@@ -0,0 +1,120 @@
+import argparse
+import random
+import time
+
+from BaseClasses import CollectionState
+
+from ..Rules import compile_condition
+from .Harness import generate
+
+###
+# Micro-benchmark for access rules: the interpreted has_items (the world's original rule code) vs the rules compiled by Rules.compile_condition.
+# Both are evaluated for every location and entrance condition over the same recorded states, taken while collecting
+#   a player's progression one item at a time, so every rule sees a spread of "has nothing" to "has everything".
+#
+#   python -m worlds.residentevil1remake.tools.RuleBenchmark --character jill --rounds 20
+###
+
+# the world's original interpreted rule, from before Rules.compile_condition. kept here as the reference to compare against.
+def has_items(state: CollectionState, item_names: list, player: int) -> bool:
+    # if there are no item requirements, this location is open, they "have the items needed"
+    if len(item_names) == 0:
+        return True
+
+    # if the requirements are a single set of items, make it a list of a single set of items to support looping for multiple sets (below)
+    if len(item_names) > 0 and type(item_names[0]) is not list:
+        item_names = [item_names]
+
+    for set_of_requirements in item_names:
+        # if it requires all unique items, just do a state has all
+        if len(set(set_of_requirements)) == len(set_of_requirements):
+            if state.has_all(set_of_requirements, player):
+                return True
+        # else, it requires some duplicates, so let's group them up and do some has w/ counts
+        else:
+            item_counts = {
+                item_name: len([i for i in set_of_requirements if i == item_name]) for item_name in set_of_requirements # e.g., { Spare Key: 2 }
+            }
+            missing_an_item = False
+
+            for item_name, count in item_counts.items():
+                if not state.has(item_name, player, count):
+                    missing_an_item = True
+
+            if missing_an_item:
+                continue # didn't meet these requirements, so skip to the next set, if any
+            
+            # if we made it here, state has all the items and the quantities needed, return True
+            return True
+
+    # if we made it here, state didn't have enough to return True, so return False
+    return False
+
+def record_states(multiworld, seed) -> list:
+    progression = [item for item in multiworld.itempool if item.advancement]
+    progression.extend(location.item for location in multiworld.get_filled_locations(1) if location.item.advancement)
+    random.Random(seed).shuffle(progression)
+
+    state = CollectionState(multiworld)
+    states = [state.copy()]
+
+    for item in progression:
+        state.collect(item, True)
+        states.append(state.copy())
+
+    return states
+
+def get_conditions(world) -> list:
+    conditions = [
+        location_record.condition_items for location_record in world.scenario_records.locations if location_record.condition_items
+    ]
+    conditions.extend(
+        connection_record.condition_items for connection_record in world.scenario_records.connections if connection_record.condition_items
+    )
+
+    return conditions
+
+def time_rules(rules, states, rounds) -> int:
+    start = time.perf_counter_ns()
+
+    for _ in range(rounds):
+        for state in states:
+            for rule in rules:
+                rule(state)
+
+    return time.perf_counter_ns() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare interpreted and compiled RE1R access rules.")
+    parser.add_argument("--character", choices=["chris", "jill"], default="chris")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    multiworld = generate([{ 'character': args.character }], args.seed, until="set_rules")
+    world = multiworld.worlds[1]
+    states = record_states(multiworld, args.seed)
+    conditions = get_conditions(world)
+
+    rule_cache = {}
+    old_rules = [lambda state, items=items: has_items(state, items, world.player) for items in conditions]
+    new_rules = [compile_condition(items, world.player, rule_cache) or (lambda state: True) for items in conditions]
+
+    # both versions have to agree before their timings mean anything
+    for state in states:
+        for items, old_rule, new_rule in zip(conditions, old_rules, new_rules):
+            if old_rule(state) != new_rule(state):
+                raise AssertionError(f"Compiled rule disagrees with has_items for {items}.")
+
+    evaluations = len(conditions) * len(states) * args.rounds
+    old_ns = time_rules(old_rules, states, args.rounds)
+    new_ns = time_rules(new_rules, states, args.rounds)
+
+    print(f"{args.character}: {len(conditions)} conditions ({len(rule_cache)} distinct compiled rules), {len(states)} recorded states, {evaluations} evaluations each")
+    print(f"  has_items:         {old_ns / evaluations:8.1f} ns/eval  ({old_ns / 1e6:.1f} ms)")
+    print(f"  compiled rules:    {new_ns / evaluations:8.1f} ns/eval  ({new_ns / 1e6:.1f} ms)")
+    print(f"  speedup:           {old_ns / new_ns:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,462 @@
+import argparse
+import collections
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .. import ResidentEvil1Remake
+from ..Data import Data
+from ..Templates import get_template_version
+
+###
+# A local seed-generation service: a small HTTP server that takes RE1R options (anything in RE1ROptions: character,
+#   difficulty, bonus_start, allow_progression_in_lab, death_link, ...) and generates solo seeds on a process pool.
+#   Every worker loads the data and builds the templates once when it starts (see init_worker), so a request only
+#   pays for the generation itself.
+#
+# It responds with the spoiler, the ItemList file, and the slot data. It doesn't build a .archipelago file, since
+#   that needs Archipelago's full Main.main.
+#
+#   POST /generate  { "options": { "character": "jill", "difficulty": "hard" }, "seed": 123 }   (seed is optional)
+#   GET  /stats     queue depth, worker utilization, latency per request, cache hits
+#   GET  /health
+#
+# Results are cached by a hash of the options (with every default filled in, so leaving one out is the same as
+#   asking for its default), the seed, and the template version (world version plus data hash). A change to the
+#   world or to the data makes new keys, so nothing stale is served. The cache is in memory, with at most
+#   --cache-size results, plus a folder on disk if --cache-directory is given. A request that's identical to one
+#   still generating waits for that one instead of generating again.
+#
+# Queue depth and busy workers are worked out from the requests still running: with more of those than workers,
+#   the extra ones are queued. Utilization is the time the workers spent generating, out of workers x uptime.
+#
+# Everything runs on localhost, so the client subcommands need no outside network:
+#   python -m worlds.residentevil1remake.tools.SeedService serve --workers 4 --port 38290
+#   python -m worlds.residentevil1remake.tools.SeedService request --port 38290 --option character=jill --seed 5
+#   python -m worlds.residentevil1remake.tools.SeedService burst --workers 4 --requests 40 --distinct 10
+#
+# The workers get the environment, so RE1R_FAST_FILL (see FastFill) works here like anywhere else.
+###
+
+###
+# Workers (in the pool's processes)
+###
+
+def init_worker(characters):
+    # the workers' generation logging would drown out the service's
+    logging.disable(logging.WARNING)
+
+    from .Harness import generate
+
+    Data.load_name_table()
+
+    # one generation up to create_items per character loads its data, builds its templates, and imports everything
+    for character in characters:
+        Data.ensure_loaded(character)
+        generate([{ 'character': character }], 1, until="create_items")
+
+def generate_seed(options, seed) -> dict:
+    from BaseClasses import CollectionState
+    from .Harness import generate
+
+    started = time.time()
+
+    try:
+        multiworld = generate([options], seed)
+
+        if not multiworld.can_beat_game(CollectionState(multiworld)):
+            raise Exception("the seed isn't beatable")
+
+        world = multiworld.worlds[1]
+
+        with tempfile.TemporaryDirectory() as output_directory:
+            world.generate_output(output_directory)
+            item_list_name = next(file_name for file_name in os.listdir(output_directory) if "ItemList" in file_name)
+
+            with open(os.path.join(output_directory, item_list_name)) as f:
+                item_list = f.read()
+
+            multiworld.spoiler.create_playthrough(create_paths=False)
+            spoiler_path = os.path.join(output_directory, "Spoiler.txt")
+            multiworld.spoiler.to_file(spoiler_path)
+
+            with open(spoiler_path, encoding="utf-8-sig") as f:
+                spoiler = f.read()
+
+        result = {
+            'seed': seed,
+            'spoiler': spoiler,
+            'item_list': { 'file_name': item_list_name, 'contents': item_list },
+            'slot_data': world.fill_slot_data()
+        }
+    except Exception as e:
+        # errors come back as text, since not every exception survives the trip between processes
+        result = { 'seed': seed, 'error': f"{type(e).__name__}: {e}" }
+
+    finished = time.time()
+    result['generate_ms'] = (finished - started) * 1000
+    result['worker'] = os.getpid()
+
+    return result
+
+###
+# The service
+###
+
+class SeedService:
+    def __init__(self, workers = None, characters = ("chris", "jill"), cache_size = 256, cache_directory = None, pool = None):
+        # pool is an executor to generate on instead of the worker processes, e.g. a thread for the tests
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = pool or concurrent.futures.ProcessPoolExecutor(self.workers, initializer=init_worker, initargs=(list(characters),))
+        self.option_types = ResidentEvil1Remake.options_dataclass.type_hints
+        self.version = get_template_version(ResidentEvil1Remake.apworld_release_version)
+
+        self.cache = collections.OrderedDict() # result key: result, least recently used first
+        self.cache_size = cache_size
+        self.cache_directory = cache_directory
+        self.pending = {} # result key: future, for the ones still generating
+
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.busy_seconds = 0
+        self.requests = collections.Counter() # by how it was answered: hit, disk, joined, generated, failed
+        self.latencies = { outcome: collections.deque(maxlen=1000) for outcome in ["hit", "disk", "joined", "generated", "failed"] }
+
+    def warm(self):
+        # makes every worker start (and run init_worker) now, instead of on the first requests
+        list(self.pool.map(time.sleep, [0.1] * self.workers))
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def normalize_options(self, options) -> dict:
+        # every option in RE1ROptions, with the requested value (checked the same way a YAML would be) or the default.
+        #   raises ValueError for unknown options or bad values.
+        unknown = sorted(set(options) - set(self.option_types))
+
+        if unknown:
+            raise ValueError(f"Unknown options: {', '.join(unknown)}")
+
+        normalized = {}
+
+        for option_name, option in self.option_types.items():
+            try:
+                value = option.from_any(options.get(option_name, option.default)).value
+            except Exception as e:
+                raise ValueError(f"Bad value for {option_name}: {e}")
+
+            normalized[option_name] = sorted(value) if isinstance(value, (set, frozenset)) else value
+
+        return normalized
+
+    def get_result_key(self, options, seed) -> str:
+        return hashlib.sha256(json.dumps([options, seed, self.version], sort_keys=True).encode()).hexdigest()[:24]
+
+    def generate(self, options, seed = None) -> tuple:
+        # returns (result, how it was answered). options must already be normalized.
+        start = time.perf_counter()
+
+        if seed is None:
+            seed = random.randint(0, 2 ** 63)
+
+        key = self.get_result_key(options, seed)
+
+        with self.lock:
+            result, outcome = self.cache.get(key), "hit"
+
+            if result is None:
+                result, outcome = self.load_result(key), "disk"
+
+                if result is not None:
+                    self.store_result(key, result, False)
+
+            if result is None:
+                future, outcome = self.pending.get(key), "joined"
+
+                if future is None:
+                    future, outcome = self.pool.submit(generate_seed, options, seed), "generated"
+                    self.pending[key] = future
+            else:
+                self.cache.move_to_end(key)
+
+        if result is None:
+            try:
+                result = future.result()
+            except Exception as e: # the pool itself broke, e.g. a worker was killed
+                result = { 'seed': seed, 'error': f"{type(e).__name__}: {e}", 'generate_ms': 0 }
+
+            with self.lock:
+                if self.pending.pop(key, None) is future:
+                    self.busy_seconds += result['generate_ms'] / 1000
+
+                    if 'error' not in result:
+                        self.store_result(key, result, True)
+
+            if 'error' in result:
+                outcome = "failed"
+
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        with self.lock:
+            self.requests[outcome] += 1
+            self.latencies[outcome].append(latency_ms)
+
+        return { **result, 'key': key, 'latency_ms': latency_ms }, outcome
+
+    ###
+    # Cache
+    ###
+
+    def store_result(self, key, result, save):
+        # the lock is held
+        self.cache[key] = result
+
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+        if save and self.cache_directory:
+            self.save_result(key, result)
+
+    def load_result(self, key) -> dict:
+        if not self.cache_directory:
+            return None
+
+        try:
+            with open(os.path.join(self.cache_directory, f"{key}.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logging.warning(f"RE1R: the cached seed {key} could not be read, so it's being generated again.")
+            return None
+
+    def save_result(self, key, result):
+        # same as the template cache: a temporary file, moved into place
+        path = os.path.join(self.cache_directory, f"{key}.json")
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+
+        try:
+            os.makedirs(self.cache_directory, exist_ok=True)
+
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                json.dump(result, f)
+
+            os.replace(temporary_path, path)
+        except OSError as e:
+            logging.warning(f"RE1R: couldn't write the seed cache to {self.cache_directory}, so it's only kept in memory: {e}")
+
+    ###
+    # Stats
+    ###
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            uptime = time.time() - self.started
+            in_flight = len(self.pending)
+            # a worker busy right now has only counted its time once it finishes, so count the running ones as busy
+            busy_workers = min(in_flight, self.workers)
+
+            return {
+                'workers': self.workers,
+                'busy_workers': busy_workers,
+                'queue_depth': max(0, in_flight - self.workers),
+                'utilization': self.busy_seconds / max(uptime * self.workers, 1e-9),
+                'uptime_s': uptime,
+                'cached_results': len(self.cache),
+                'requests': dict(self.requests),
+                'latency_ms': { outcome: summarize(latencies) for outcome, latencies in self.latencies.items() if latencies }
+            }
+
+def summarize(values) -> dict:
+    values = sorted(values)
+
+    return {
+        'count': len(values),
+        'median': values[len(values) // 2],
+        'p95': values[min(len(values) - 1, int(len(values) * 0.95))],
+        'max': values[-1]
+    }
+
+###
+# HTTP
+###
+
+class SeedServiceHandler(BaseHTTPRequestHandler):
+    # self.server.service is the SeedService
+    def do_GET(self):
+        if self.path == "/stats":
+            self.send_json(200, self.server.service.get_stats())
+        elif self.path == "/health":
+            self.send_json(200, { 'ok': True })
+        else:
+            self.send_json(404, { 'error': f"Nothing at {self.path}" })
+
+    def do_POST(self):
+        if self.path != "/generate":
+            self.send_json(404, { 'error': f"Nothing at {self.path}" })
+            return
+
+        service = self.server.service
+
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            seed = request.get('seed')
+
+            # bools are ints in Python, but true / false isn't a seed
+            if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int)):
+                raise ValueError("The seed has to be a whole number")
+
+            options = service.normalize_options(request.get('options', {}))
+        except (ValueError, AttributeError) as e:
+            self.send_json(400, { 'error': str(e) })
+            return
+
+        result, outcome = service.generate(options, seed)
+        self.send_json(500 if outcome == "failed" else 200, { **result, 'options': options, 'cache': outcome })
+
+    def send_json(self, status, body):
+        contents = json.dumps(body).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(contents)))
+        self.end_headers()
+        self.wfile.write(contents)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class SeedServiceServer(ThreadingHTTPServer):
+    # bursts connect all at once, and the default backlog of 5 makes the rest wait on retries
+    request_queue_size = 128
+
+def start_server(service, host = "localhost", port = 38290, verbose = False) -> SeedServiceServer:
+    # port 0 picks a free port, see server.server_address
+    server = SeedServiceServer((host, port), SeedServiceHandler)
+    server.service = service
+    server.verbose = verbose
+    threading.Thread(target=server.serve_forever, name="RE1RSeedService", daemon=True).start()
+
+    return server
+
+###
+# Client
+###
+
+def call(host, port, path, body = None, timeout = 600) -> tuple:
+    # returns (status, response). a POST if there's a body.
+    request = urllib.request.Request(
+        f"http://{host}:{port}{path}",
+        data=json.dumps(body).encode() if body is not None else None,
+        headers={ "Content-Type": "application/json" }
+    )
+
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def run_burst(args) -> dict:
+    # starts a service on a free local port and sends it a burst of requests at once, from as many client threads.
+    #   --distinct sets how many different (options, seed) pairs there are, so the rest are hits or joins.
+    service = SeedService(args.workers, cache_size=args.cache_size, cache_directory=args.cache_directory)
+    start = time.perf_counter()
+    service.warm()
+    warm_seconds = time.perf_counter() - start
+
+    server = start_server(service, "localhost", 0)
+    host, port = server.server_address[:2]
+    characters = ["chris", "jill"]
+
+    bodies = [
+        { 'options': { 'character': characters[index % args.distinct % 2] }, 'seed': args.start_seed + index % args.distinct }
+            for index in range(args.requests)
+    ]
+
+    try:
+        start = time.perf_counter()
+
+        with concurrent.futures.ThreadPoolExecutor(args.requests) as clients:
+            responses = list(clients.map(lambda body: call(host, port, "/generate", body), bodies))
+
+        burst_seconds = time.perf_counter() - start
+        _, stats = call(host, port, "/stats")
+    finally:
+        server.shutdown()
+        service.close()
+
+    return {
+        'warm_s': warm_seconds,
+        'burst_s': burst_seconds,
+        'ok': sum(status == 200 for status, _ in responses),
+        'failed': sum(status != 200 for status, _ in responses),
+        **stats
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="A local HTTP service that generates solo RE1R seeds on a process pool.")
+    parser.add_argument("mode", choices=["serve", "request", "burst"])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=38290)
+    parser.add_argument("--workers", type=int, help="worker processes, defaults to one per core")
+    parser.add_argument("--cache-size", type=int, default=256, help="results kept in memory")
+    parser.add_argument("--cache-directory", help="also keep results in this folder")
+    parser.add_argument("--verbose", action="store_true", help="serve: log every request")
+    parser.add_argument("--option", action="append", default=[], help="request: an option as name=value, e.g. character=jill")
+    parser.add_argument("--seed", type=int, help="request: the seed, or a random one")
+    parser.add_argument("--output", help="request: save the ItemList file and spoiler in this folder")
+    parser.add_argument("--requests", type=int, default=40, help="burst: how many requests")
+    parser.add_argument("--distinct", type=int, default=10, help="burst: how many different seeds among them")
+    parser.add_argument("--start-seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        service = SeedService(args.workers, cache_size=args.cache_size, cache_directory=args.cache_directory)
+        service.warm()
+        server = start_server(service, args.host, args.port, args.verbose)
+        print(f"RE1R seed service with {service.workers} workers at http://{args.host}:{args.port}. Ctrl+C to stop.")
+
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+            service.close()
+    elif args.mode == "request":
+        options = dict(option.split("=", 1) for option in args.option)
+        status, response = call(args.host, args.port, "/generate", { 'options': options, 'seed': args.seed })
+
+        if status != 200:
+            raise SystemExit(f"{status}: {response.get('error')}")
+
+        print(f"seed {response['seed']}, {response['cache']}, {response['latency_ms']:.0f} ms, slot data {response['slot_data']}")
+
+        if args.output:
+            os.makedirs(args.output, exist_ok=True)
+
+            with open(os.path.join(args.output, response['item_list']['file_name']), "w") as f:
+                f.write(response['item_list']['contents'])
+
+            with open(os.path.join(args.output, f"{response['key']}_Spoiler.txt"), "w", encoding="utf-8") as f:
+                f.write(response['spoiler'])
+    else:
+        for name, value in run_burst(args).items():
+            print(f"{name:<20}{value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import time
+
+from BaseClasses import CollectionState
+
+from ..Simulator import build_simulator
+from .Harness import format_options, generate
+
+###
+# Cross-checks Simulator against the real thing: generates solo seeds with the harness, then works out each seed's spheres
+#   both with RE1RSimulator and with a CollectionState sweep over the filled multiworld, and reports any seed where they
+#   disagree, along with how long each took.
+#
+#   python -m worlds.residentevil1remake.tools.SimulatorCheck --character chris --seeds 50
+###
+
+def get_placement(multiworld, player) -> dict:
+    # items for other players don't do anything for this one, so they're left out like empty locations
+    return {
+        location.name: location.item.name if location.item and location.item.player == player else None
+            for location in multiworld.get_locations(player)
+    }
+
+def get_starting_items(multiworld, player) -> list:
+    return [item.name for item in multiworld.precollected_items[player]]
+
+def get_archipelago_spheres(multiworld, player) -> list:
+    state = CollectionState(multiworld)
+    remaining = list(multiworld.get_locations(player))
+    spheres = []
+
+    while True:
+        sphere = [location for location in remaining if location.can_reach(state)]
+
+        if len(sphere) == 0:
+            break
+
+        spheres.append([location.name for location in sphere])
+        remaining = [location for location in remaining if location not in sphere]
+
+        for location in sphere:
+            if location.item and location.item.player == player:
+                state.collect(location.item, True, location)
+
+    return spheres
+
+def compare_spheres(simulated, archipelago) -> list:
+    # returns a line per difference, empty if they agree
+    differences = []
+
+    for sphere_number in range(max(len(simulated), len(archipelago))):
+        simulated_sphere = set(simulated[sphere_number]) if sphere_number < len(simulated) else set()
+        archipelago_sphere = set(archipelago[sphere_number]) if sphere_number < len(archipelago) else set()
+
+        for location_name in sorted(simulated_sphere - archipelago_sphere):
+            differences.append(f"sphere {sphere_number}: only the simulator reaches {location_name}")
+
+        for location_name in sorted(archipelago_sphere - simulated_sphere):
+            differences.append(f"sphere {sphere_number}: only Archipelago reaches {location_name}")
+
+    return differences
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-check the RE1R logic simulator against Archipelago's own sweep.")
+    parser.add_argument("--character", choices=["chris", "jill"], default="chris")
+    parser.add_argument("--difficulty", choices=["normal", "hard"], default="normal")
+    parser.add_argument("--seeds", type=int, default=20)
+    parser.add_argument("--start-seed", type=int, default=1)
+    args = parser.parse_args()
+
+    options = { 'character': args.character, 'difficulty': args.difficulty }
+    simulator = build_simulator(args.character, 'a', args.difficulty)
+    simulator_ns = 0
+    archipelago_ns = 0
+    mismatched_seeds = 0
+
+    for seed in range(args.start_seed, args.start_seed + args.seeds):
+        multiworld = generate([options], seed)
+        placement = get_placement(multiworld, 1)
+        starting_items = get_starting_items(multiworld, 1)
+
+        start = time.perf_counter_ns()
+        simulated = simulator.simulate(placement, starting_items)['spheres']
+        simulator_ns += time.perf_counter_ns() - start
+
+        start = time.perf_counter_ns()
+        archipelago = get_archipelago_spheres(multiworld, 1)
+        archipelago_ns += time.perf_counter_ns() - start
+
+        differences = compare_spheres(simulated, archipelago)
+
+        if differences:
+            mismatched_seeds += 1
+            print(f"seed {seed} ({format_options(options)}) disagrees:")
+
+            for difference in differences:
+                print(f"  {difference}")
+
+    print(f"{args.seeds} seeds, {mismatched_seeds} disagreed")
+    print(f"  simulator:    {simulator_ns / args.seeds / 1e6:8.3f} ms/seed")
+    print(f"  Archipelago:  {archipelago_ns / args.seeds / 1e6:8.3f} ms/seed")
+    print(f"  speedup:      {archipelago_ns / max(simulator_ns, 1):8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
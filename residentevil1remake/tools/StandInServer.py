@@ -0,0 +1,247 @@
+import argparse
+import asyncio
+import json
+import time
+
+from collections import Counter
+
+import websockets
+
+from CommonClient import server_loop
+from NetUtils import encode, decode, NetworkItem, NetworkPlayer, NetworkSlot, SlotType, ClientStatus
+
+from .. import ResidentEvil1Remake
+from ..Client import RE1RContext, ReplayGameSource, game_name, game_watcher
+from ..Data import Data
+
+###
+# A local stand-in for the Archipelago server, just enough of the protocol for one RE1R slot, so the client can be run and
+#   measured without a live server (or the game, with a replay file). It plays a solo seed where every location holds its
+#   original item, and keeps counts of everything the client sends.
+#
+# On its own, it just serves:
+#   python -m worlds.residentevil1remake.tools.StandInServer serve --character jill --port 38281
+#
+# Or it can run the client against itself with a replay, and report throughput and latency. Without --replay, it makes
+#   up a replay that checks every location, a few at a time:
+#   python -m worlds.residentevil1remake.tools.StandInServer benchmark --character jill --speed 10
+###
+
+class StandInServer:
+    def __init__(self, character, difficulty = "normal", slot_name = "Player1", death_link = False):
+        Data.ensure_loaded(character)
+        records = Data.get_scenario_records(character, 'a', difficulty)
+        # the ids the world gives out, same as a real server would send, not the character's own ids in items.json
+        item_ids = { item['name']: ResidentEvil1Remake.item_name_to_id[item['name']] for item in Data.item_table if item['character'] == character }
+
+        self.character = character
+        self.slot_name = slot_name
+        self.slot_data = { "apworld_version": "stand-in", "character": character, "difficulty": difficulty, "death_link": death_link }
+        self.location_ids = [location.id for location in records.locations]
+        self.location_items = {
+            location.id: item_ids[location.force_item or location.original_item] for location in records.locations
+                if (location.force_item or location.original_item) in item_ids
+        }
+        self.item_name_to_id = item_ids
+        self.location_name_to_id = { location.full_name: location.id for location in records.locations }
+
+        self.clients = set()
+        self.checked = set()
+        self.received_items = []
+        self.packets = Counter()
+        self.check_times = {} # location id: time the server got it
+        self.duplicate_checks = 0
+        self.goal_time = None
+        self.server = None
+
+    async def start(self, host = "localhost", port = 38281):
+        self.server = await websockets.serve(self.handler, host, port)
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def send(self, websocket, packets):
+        await websocket.send(encode(packets))
+
+    async def handler(self, websocket, *args):
+        self.clients.add(websocket)
+
+        try:
+            await self.send(websocket, [self.get_room_info()])
+
+            async for message in websocket:
+                for packet in decode(message):
+                    await self.handle(websocket, packet)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.clients.discard(websocket)
+
+    def get_room_info(self) -> dict:
+        return {
+            "cmd": "RoomInfo",
+            "version": { "major": 0, "minor": 5, "build": 0, "class": "Version" },
+            "generator_version": { "major": 0, "minor": 5, "build": 0, "class": "Version" },
+            "tags": ["StandIn"],
+            "password": False,
+            "permissions": { "release": 0, "collect": 0, "remaining": 0 },
+            "hint_cost": 0,
+            "location_check_points": 0,
+            "games": [game_name],
+            "datapackage_checksums": {},
+            "seed_name": "stand-in",
+            "time": time.time()
+        }
+
+    async def handle(self, websocket, packet):
+        cmd = packet.get("cmd")
+        self.packets[cmd] += 1
+
+        if cmd == "GetDataPackage":
+            games = {
+                game: {
+                    "item_name_to_id": self.item_name_to_id if game == game_name else {},
+                    "location_name_to_id": self.location_name_to_id if game == game_name else {},
+                    "checksum": "stand-in"
+                }
+                for game in packet.get("games", [game_name])
+            }
+            await self.send(websocket, [{ "cmd": "DataPackage", "data": { "games": games } }])
+        elif cmd == "Connect":
+            if packet.get("name") != self.slot_name:
+                await self.send(websocket, [{ "cmd": "ConnectionRefused", "errors": ["InvalidSlot"] }])
+                return
+
+            await self.send(websocket, [{
+                "cmd": "Connected",
+                "team": 0,
+                "slot": 1,
+                "players": [NetworkPlayer(0, 1, self.slot_name, self.slot_name)],
+                "missing_locations": [id for id in self.location_ids if id not in self.checked],
+                "checked_locations": sorted(self.checked),
+                "slot_data": self.slot_data,
+                "slot_info": { 1: NetworkSlot(self.slot_name, game_name, SlotType.player) },
+                "hint_points": 0
+            }, { "cmd": "ReceivedItems", "index": 0, "items": self.received_items }])
+        elif cmd == "LocationChecks":
+            now = time.perf_counter()
+            new_items = []
+
+            for location_id in packet.get("locations", []):
+                if location_id in self.checked:
+                    self.duplicate_checks += 1
+                    continue
+
+                self.checked.add(location_id)
+                self.check_times[location_id] = now
+
+                if location_id in self.location_items:
+                    new_items.append(NetworkItem(self.location_items[location_id], location_id, 1, 0))
+
+            if new_items:
+                index = len(self.received_items)
+                self.received_items.extend(new_items)
+                await self.send(websocket, [{ "cmd": "ReceivedItems", "index": index, "items": new_items }])
+        elif cmd == "StatusUpdate":
+            if packet.get("status") == ClientStatus.CLIENT_GOAL:
+                self.goal_time = time.perf_counter()
+        elif cmd == "Bounce":
+            # DeathLink and friends go to everyone else
+            bounced = { **packet, "cmd": "Bounced" }
+
+            for client in self.clients - {websocket}:
+                await self.send(client, [bounced])
+        elif cmd == "ConnectUpdate":
+            pass
+
+###
+# Benchmark
+###
+
+def make_replay(file_path, location_names, per_event = 3, seconds_between = 0.5):
+    with open(file_path, "w") as f:
+        for event_number, start in enumerate(range(0, len(location_names), per_event)):
+            event = { "time": event_number * seconds_between, "checked": location_names[start:start + per_event] }
+
+            if start + per_event >= len(location_names):
+                event["victory"] = True
+
+            f.write(json.dumps(event) + "\n")
+
+async def run_benchmark(args) -> dict:
+    server = StandInServer(args.character, args.difficulty)
+    await server.start("localhost", args.port)
+
+    replay_path = args.replay
+
+    if not replay_path:
+        replay_path = f"re1r_standin_replay_{args.character}.jsonl"
+        make_replay(replay_path, list(server.location_name_to_id.keys()))
+
+    source = ReplayGameSource(replay_path, args.speed)
+    ctx = RE1RContext(f"ws://localhost:{args.port}", None, source)
+    ctx.auth = ctx.username = server.slot_name
+
+    start = time.perf_counter()
+    ctx.server_task = asyncio.create_task(server_loop(ctx), name="ServerLoop")
+    watcher_task = asyncio.create_task(game_watcher(ctx), name="RE1RGameWatcher")
+
+    # done once the replay is over and everything it checked has made it to the server
+    while not (source.start_time and source.is_finished() and not ctx.pending_checks and (server.goal_time or not args.wait_for_goal)):
+        if time.perf_counter() - start > args.timeout:
+            break
+
+        await asyncio.sleep(0.05)
+
+    elapsed = time.perf_counter() - start
+    ctx.exit_event.set()
+    await watcher_task
+    await ctx.shutdown()
+    await server.stop()
+
+    latencies = sorted(
+        server.check_times[location_id] - seen_at for location_key, seen_at in source.seen_at.items()
+            for location_id in [ctx.translate_location(location_key)] if location_id in server.check_times
+    )
+
+    return {
+        "checks": len(server.checked),
+        "duplicate_checks": server.duplicate_checks,
+        "location_packets": server.packets["LocationChecks"],
+        "items_given": ctx.items_given,
+        "elapsed_s": elapsed,
+        "checks_per_s": len(server.checked) / elapsed if elapsed > 0 else 0,
+        "latency_ms_median": latencies[len(latencies) // 2] * 1000 if latencies else None,
+        "latency_ms_max": latencies[-1] * 1000 if latencies else None
+    }
+
+async def serve(args):
+    server = StandInServer(args.character, args.difficulty, death_link=args.death_link)
+    await server.start(args.host, args.port)
+    print(f"Stand-in server for {args.character} on {args.difficulty} at ws://{args.host}:{args.port}, slot name {server.slot_name}.")
+    await asyncio.Future() # until interrupted
+
+def main():
+    parser = argparse.ArgumentParser(description="A local stand-in Archipelago server for the RE1R client.")
+    parser.add_argument("mode", choices=["serve", "benchmark"])
+    parser.add_argument("--character", choices=["chris", "jill"], default="jill")
+    parser.add_argument("--difficulty", choices=["normal", "hard"], default="normal")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=38281)
+    parser.add_argument("--death-link", action="store_true")
+    parser.add_argument("--replay", help="benchmark: the replay to play back, instead of a made-up one")
+    parser.add_argument("--speed", type=float, default=1.0, help="benchmark: replay speed")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--wait-for-goal", action="store_true", help="benchmark: don't finish until the replay's victory arrives")
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        asyncio.run(serve(args))
+    else:
+        for name, value in asyncio.run(run_benchmark(args)).items():
+            print(f"{name:<20}{value}")
+
+
+if __name__ == "__main__":
+    main()
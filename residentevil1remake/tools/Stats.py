@@ -0,0 +1,296 @@
+import argparse
+import logging
+import multiprocessing
+import time
+
+try:
+    import numpy as np
+except ImportError: # Archipelago doesn't ship NumPy, and nothing but this tool needs it
+    np = None
+
+from .. import Compiler, ResidentEvil1Remake
+from ..Data import Data
+from ..Records import is_closed_to_progression
+from ..Simulator import build_simulator
+from .Locks import lock_values
+
+###
+# Seed statistics: generates a lot of solo seeds and reports where things end up.
+#   - a placement heatmap, location x item, counting how often each item lands on each location
+#   - a histogram of sphere depth (the sphere Victory is reached in), plus which sphere progression lands in
+#   - progression density per zone (from zones.json), and how much progression ends up in the Laboratory per seed
+#   - the locations that hold keys most often
+#
+# Seeds are generated in chunks across a process pool (see Sweep). Each chunk comes back as two small arrays, one row
+#   per seed and one column per location: the item index placed there, and the sphere it's reached in (both -1 for
+#   nothing). Those get folded into the running totals with array operations and thrown away, so memory stays flat
+#   no matter how many seeds there are. Spheres come from the Simulator (a whole chunk in one simulate_batch per start inventory), not the spoiler.
+#
+#   python -m worlds.residentevil1remake.tools.Stats --seeds 100000 --character jill --allow-progression-in-lab --output jill_lab.npz
+#
+# Needs NumPy (pip install numpy), on top of Archipelago for the generation.
+###
+
+worker_state = {}
+
+def build_index(character, difficulty) -> dict:
+    # everything the arrays are indexed by. locations and items are in id order, so index = position in these lists.
+    #   items are one per name, since a generated item is only known by its name (the world's item ids are shared
+    #   between characters, and Chris has two Power Room Key entries). whether an item is progression is the world's
+    #   call, not the character's items.json, since the world classifies names shared between characters last-wins.
+    #   the Laboratory is the world's too, see Records.is_closed_to_progression.
+    records = Data.get_scenario_records(character, 'a', difficulty)
+    items_by_name = {}
+
+    for item in sorted((item for item in Data.item_table if item['character'] == character), key=lambda item: item['id']):
+        items_by_name.setdefault(item['name'], item)
+
+    items = list(items_by_name.values())
+    zones = sorted(Compiler.load_data_file(character, 'zones.json'), key=lambda zone: zone['id'])
+    # only locations in the scenario's regions, since those are the only ones the world creates
+    locations = sorted((location for location in records.locations if location.region in records.regions_by_name), key=lambda location: location.id)
+
+    zone_index = { zone['id']: index for index, zone in enumerate(zones) }
+    location_regions = [records.regions_by_name[location.region] for location in locations]
+
+    return {
+        'location_names': [location.full_name for location in locations],
+        'location_index_by_id': { location.id: index for index, location in enumerate(locations) },
+        'location_index_by_name': { location.full_name: index for index, location in enumerate(locations) },
+        'item_names': [item['name'] for item in items],
+        'item_index_by_name': { item['name']: index for index, item in enumerate(items) },
+        'victory': next(index for index, location in enumerate(locations) if location.full_name == 'Victory'),
+        'progression': np.array([item['name'] in ResidentEvil1Remake.progression_item_names for item in items]),
+        'keys': np.array([item['name'] in lock_values or item.get('type') == 'Key' for item in items]),
+        'zone_names': [zone['name'] for zone in zones],
+        'location_zones': np.array([zone_index[region.zone_id] for region in location_regions]),
+        'lab_locations': np.array([is_closed_to_progression(region, False) for region in location_regions])
+    }
+
+###
+# Generating chunks (in the worker processes)
+###
+
+def init_worker(character, difficulty):
+    # the workers' generation logging would drown out the progress lines
+    logging.disable(logging.WARNING)
+
+    worker_state['index'] = build_index(character, difficulty)
+    worker_state['simulator'] = build_simulator(character, 'a', difficulty)
+
+def generate_chunk(task) -> tuple:
+    from .Harness import generate
+    from .SimulatorCheck import get_starting_items
+
+    options, seeds = task
+    index = worker_state['index']
+    simulator = worker_state['simulator']
+
+    placed_items = np.full((len(seeds), len(index['location_names'])), -1, dtype=np.int16)
+    spheres = np.full(placed_items.shape, -1, dtype=np.int8)
+    failed = 0
+    placements = {} # start inventory: [(row, placement)], each simulated together once the chunk is generated
+
+    for row, seed in enumerate(seeds):
+        try:
+            multiworld = generate([options], seed)
+        except Exception:
+            failed += 1
+            continue
+
+        placement = {}
+
+        for location in multiworld.get_locations(1):
+            column = index['location_index_by_id'].get(location.address)
+            placement[location.name] = location.item.name if location.item else None
+
+            if column is not None and location.item and location.item.name in index['item_index_by_name']:
+                placed_items[row, column] = index['item_index_by_name'][location.item.name]
+
+        # simulate_batch takes one start inventory for the whole batch, so seeds are batched by theirs (bonus_start,
+        #   start_inventory, ...). with the same options, that's almost always one batch.
+        starting_items = tuple(sorted(get_starting_items(multiworld, 1)))
+        placements.setdefault(starting_items, []).append((row, placement))
+
+    for starting_items, batch in placements.items():
+        results = simulator.simulate_batch([placement for _, placement in batch], starting_items)
+
+        for (row, _), result in zip(batch, results):
+            for sphere_number, sphere in enumerate(result['spheres']):
+                for location_name in sphere:
+                    column = index['location_index_by_name'].get(location_name)
+
+                    if column is not None:
+                        spheres[row, column] = sphere_number
+
+    # rows for failed seeds are all -1, and get dropped when they're folded in
+    return placed_items, spheres, failed
+
+###
+# Folding chunks into the totals (vectorized)
+###
+
+def new_totals(index) -> dict:
+    location_count = len(index['location_names'])
+    item_count = len(index['item_names'])
+
+    return {
+        'seeds': 0,
+        'failed': 0,
+        'heatmap': np.zeros((location_count, item_count), dtype=np.int64), # location x item
+        'sphere_depth': np.zeros(1, dtype=np.int64), # seeds by the sphere Victory is reached in, counting from 1 (0 is never)
+        'progression_spheres': np.zeros(1, dtype=np.int64), # progression placements by the sphere they're reached in
+        'lab_progression': np.zeros(1, dtype=np.int64), # seeds by how many progression items landed in the Laboratory
+        'unreachable': np.zeros(location_count, dtype=np.int64) # seeds where each location couldn't be reached
+    }
+
+def add_counts(total, counts):
+    # adds bincount results, growing the total if the new counts go further
+    if len(counts) > len(total):
+        total = np.concatenate([total, np.zeros(len(counts) - len(total), dtype=total.dtype)])
+
+    total[:len(counts)] += counts
+
+    return total
+
+def fold_chunk(totals, index, placed_items, spheres, failed):
+    generated = (placed_items >= 0).any(axis=1)
+    placed_items = placed_items[generated]
+    spheres = spheres[generated]
+
+    totals['seeds'] += len(placed_items)
+    totals['failed'] += failed
+
+    if len(placed_items) == 0:
+        return
+
+    location_count, item_count = totals['heatmap'].shape
+    placed = placed_items >= 0
+    columns = np.broadcast_to(np.arange(location_count), placed_items.shape)
+
+    # location x item in one bincount over the flattened (location, item) pairs
+    flat = columns[placed].astype(np.int64) * item_count + placed_items[placed]
+    totals['heatmap'] += np.bincount(flat, minlength=location_count * item_count).reshape(location_count, item_count)
+
+    totals['sphere_depth'] = add_counts(totals['sphere_depth'], np.bincount(spheres[:, index['victory']].astype(np.int64) + 1))
+
+    progression_placed = placed & index['progression'][np.where(placed, placed_items, 0)]
+    reached_progression = progression_placed & (spheres >= 0)
+    totals['progression_spheres'] = add_counts(totals['progression_spheres'], np.bincount(spheres[reached_progression].astype(np.int64)))
+
+    lab_counts = (progression_placed & index['lab_locations']).sum(axis=1)
+    totals['lab_progression'] = add_counts(totals['lab_progression'], np.bincount(lab_counts))
+
+    totals['unreachable'] += (spheres < 0).sum(axis=0)
+
+###
+# Report
+###
+
+def get_zone_density(totals, index) -> list:
+    # (zone name, locations, progression per location per seed)
+    zone_count = len(index['zone_names'])
+    progression_by_location = totals['heatmap'][:, index['progression']].sum(axis=1)
+    locations_per_zone = np.bincount(index['location_zones'], minlength=zone_count)
+    progression_per_zone = np.bincount(index['location_zones'], weights=progression_by_location, minlength=zone_count)
+    density = progression_per_zone / np.maximum(locations_per_zone * max(totals['seeds'], 1), 1)
+
+    return [
+        (zone_name, int(locations_per_zone[zone]), float(density[zone]))
+            for zone, zone_name in enumerate(index['zone_names']) if locations_per_zone[zone] > 0
+    ]
+
+def print_report(totals, index, top = 15):
+    seeds = max(totals['seeds'], 1)
+
+    print(f"\n{totals['seeds']} seeds ({totals['failed']} failed to generate)")
+
+    print("\nSphere depth (the sphere Victory is reached in):")
+    depth = totals['sphere_depth']
+
+    for spheres in np.nonzero(depth)[0]:
+        print(f"  {spheres if spheres > 0 else 'never':>5}  {depth[spheres]:>9}  {depth[spheres] / seeds * 100:6.2f}%")
+
+    print("\nProgression by the sphere it's reached in:")
+    progression_spheres = totals['progression_spheres']
+
+    for sphere in np.nonzero(progression_spheres)[0]:
+        print(f"  {sphere:>3}  {progression_spheres[sphere] / seeds:8.2f} per seed")
+
+    lab = totals['lab_progression']
+    lab_mean = (np.arange(len(lab)) * lab).sum() / seeds
+    print(f"\nProgression in the Laboratory: {lab_mean:.2f} per seed, in {(lab[1:].sum()) / seeds * 100:.2f}% of seeds")
+
+    print("\nProgression density by zone (progression items per location per seed):")
+
+    for zone_name, location_count, density in get_zone_density(totals, index):
+        print(f"  {zone_name:<40}{location_count:>5} locations  {density:.3f}")
+
+    print("\nLocations holding a key most often:")
+    key_counts = totals['heatmap'][:, index['keys']].sum(axis=1)
+
+    for location in np.argsort(-key_counts, kind='stable')[:top]:
+        if key_counts[location] > 0:
+            print(f"  {key_counts[location] / seeds * 100:6.2f}%  {index['location_names'][location]}")
+
+    unreachable = np.nonzero(totals['unreachable'])[0]
+
+    if len(unreachable) > 0:
+        print(f"\n{len(unreachable)} locations were unreachable in some seeds, e.g. {index['location_names'][unreachable[0]]}")
+
+def save(path, totals, index):
+    np.savez_compressed(
+        path,
+        location_names=np.array(index['location_names']),
+        item_names=np.array(index['item_names']),
+        zone_names=np.array(index['zone_names']),
+        location_zones=index['location_zones'],
+        seeds=totals['seeds'],
+        failed=totals['failed'],
+        heatmap=totals['heatmap'],
+        sphere_depth=totals['sphere_depth'],
+        progression_spheres=totals['progression_spheres'],
+        lab_progression=totals['lab_progression'],
+        unreachable=totals['unreachable']
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Placement statistics over a large batch of solo RE1R seeds.")
+    parser.add_argument("--seeds", type=int, default=1000)
+    parser.add_argument("--start-seed", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=250, help="seeds per worker task, and per fold into the totals")
+    parser.add_argument("--processes", type=int, help="worker processes, defaults to one per core")
+    parser.add_argument("--character", choices=["chris", "jill"], default="jill")
+    parser.add_argument("--difficulty", choices=["normal", "hard"], default="normal")
+    parser.add_argument("--allow-progression-in-lab", action="store_true")
+    parser.add_argument("--output", help="save the totals to this .npz file")
+    args = parser.parse_args()
+
+    if np is None:
+        raise SystemExit("Stats needs NumPy: pip install numpy")
+
+    options = {
+        'character': args.character,
+        'difficulty': args.difficulty,
+        'allow_progression_in_lab': 'true' if args.allow_progression_in_lab else 'false'
+    }
+    seeds = list(range(args.start_seed, args.start_seed + args.seeds))
+    tasks = [(options, seeds[start:start + args.chunk_size]) for start in range(0, len(seeds), args.chunk_size)]
+
+    index = build_index(args.character, args.difficulty)
+    totals = new_totals(index)
+    start = time.perf_counter()
+
+    with multiprocessing.Pool(args.processes, initializer=init_worker, initargs=(args.character, args.difficulty)) as pool:
+        for placed_items, spheres, failed in pool.imap_unordered(generate_chunk, tasks):
+            fold_chunk(totals, index, placed_items, spheres, failed)
+            print(f"{totals['seeds'] + totals['failed']}/{len(seeds)} seeds, {time.perf_counter() - start:.1f} s")
+
+    print_report(totals, index)
+
+    if args.output:
+        save(args.output, totals, index)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import time
+import traceback
+
+from Fill import FillError
+
+from .Harness import get_option_combinations, format_options, generate, is_beatable
+
+###
+# Beatability sweep: generates lots of solo seeds across a process pool (one seed per task) and checks each one.
+# Every seed ends up as one of:
+#   - ok: generated, beatable, and every location reachable
+#   - unbeatable: generated, but Victory can't be reached
+#   - inaccessible: beatable, but some locations can't be reached
+#   - fill_failure: the fill raised a FillError
+#   - error: anything else went wrong during generation
+#
+# Failure rates are printed per option combination, and every seed that isn't ok is saved with its options, so it
+#   can be reproduced with Harness.generate([options], seed).
+#
+#   python -m worlds.residentevil1remake.tools.Sweep --seeds 1000 --character chris --output chris_sweep.json
+###
+
+outcomes = ["ok", "unbeatable", "inaccessible", "fill_failure", "error"]
+
+def init_worker():
+    # the workers' generation logging would drown out the progress lines
+    logging.disable(logging.WARNING)
+
+def check_seed(task) -> dict:
+    options, seed = task
+    result = { "options": options, "seed": seed }
+
+    try:
+        multiworld = generate([options], seed)
+    except FillError as e:
+        return { **result, "outcome": "fill_failure", "message": str(e) }
+    except Exception as e:
+        return { **result, "outcome": "error", "message": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc() }
+
+    if not is_beatable(multiworld):
+        return { **result, "outcome": "unbeatable" }
+
+    if not multiworld.fulfills_accessibility():
+        return { **result, "outcome": "inaccessible" }
+
+    return { **result, "outcome": "ok" }
+
+def run_sweep(combinations, seeds, processes = None, progress_every = 100) -> list:
+    tasks = [(options, seed) for options in combinations for seed in seeds]
+    results = []
+    start = time.perf_counter()
+
+    with multiprocessing.Pool(processes, initializer=init_worker) as pool:
+        # chunksize 1 keeps it one seed per task, so a slow seed doesn't hold up a whole chunk
+        for result in pool.imap_unordered(check_seed, tasks, chunksize=1):
+            results.append(result)
+
+            if len(results) % progress_every == 0 or len(results) == len(tasks):
+                failed = sum(1 for r in results if r["outcome"] != "ok")
+                print(f"{len(results)}/{len(tasks)} seeds, {failed} failed, {time.perf_counter() - start:.1f} s")
+
+    return results
+
+def summarize(results) -> list:
+    summary = {}
+
+    for result in results:
+        key = format_options(result["options"])
+
+        if key not in summary:
+            summary[key] = { "options": result["options"], "seeds": 0, **{ outcome: 0 for outcome in outcomes } }
+
+        summary[key]["seeds"] += 1
+        summary[key][result["outcome"]] += 1
+
+    for combination in summary.values():
+        combination["failure_rate"] = 1 - combination["ok"] / combination["seeds"]
+
+    return list(summary.values())
+
+def print_summary(summary):
+    print()
+
+    for combination in summary:
+        counts = ", ".join(f"{outcome}={combination[outcome]}" for outcome in outcomes[1:] if combination[outcome] > 0)
+        print(f"{format_options(combination['options'])}: {combination['failure_rate'] * 100:.2f}% failed of {combination['seeds']}"
+            + (f" ({counts})" if counts else ""))
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate many solo RE1R seeds in parallel and check that each is beatable.")
+    parser.add_argument("--seeds", type=int, default=100, help="seeds to generate per option combination")
+    parser.add_argument("--start-seed", type=int, default=1)
+    parser.add_argument("--processes", type=int, help="worker processes, defaults to one per core")
+    parser.add_argument("--character", choices=["chris", "jill"], help="only run combinations with this character")
+    parser.add_argument("--difficulty", choices=["normal", "hard"], help="only run combinations with this difficulty")
+    parser.add_argument("--output", help="save the summary and every failing seed to this JSON file")
+    args = parser.parse_args()
+
+    combinations = get_option_combinations(character=args.character, difficulty=args.difficulty)
+    seeds = range(args.start_seed, args.start_seed + args.seeds)
+
+    results = run_sweep(combinations, seeds, args.processes)
+    summary = summarize(results)
+    print_summary(summary)
+
+    if args.output:
+        failures = sorted(
+            (result for result in results if result["outcome"] != "ok"),
+            key=lambda result: (format_options(result["options"]), result["seed"])
+        )
+
+        with open(args.output, "w") as f:
+            json.dump({ "summary": summary, "failures": failures }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
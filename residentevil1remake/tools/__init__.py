@@ -0,0 +1,2 @@
+# developer tools for the RE1R world. these are run from the Archipelago folder, e.g.:
+#   python -m worlds.residentevil1remake.tools.RuleBenchmark